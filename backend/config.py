@@ -26,8 +26,93 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 SUPABASE_STORAGE_BUCKET = os.getenv("SUPABASE_STORAGE_BUCKET", "insight-ai")
 
+# Object storage backend: "supabase", "local" (sharded files under STORAGE_LOCAL_ROOT) or "memory" (tests, benchmarks)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+STORAGE_LOCAL_ROOT = os.getenv("STORAGE_LOCAL_ROOT", "./storage")
+STORAGE_LOCAL_SHARD_DEPTH = int(os.getenv("STORAGE_LOCAL_SHARD_DEPTH", "2"))
+
+# Storage HTTP client: pooled keep-alive connections and per-operation timeouts
+STORAGE_MAX_CONNECTIONS = int(os.getenv("STORAGE_MAX_CONNECTIONS", "20"))
+STORAGE_KEEPALIVE_SECONDS = float(os.getenv("STORAGE_KEEPALIVE_SECONDS", "30"))
+STORAGE_CONNECT_TIMEOUT_SECONDS = float(os.getenv("STORAGE_CONNECT_TIMEOUT_SECONDS", "5"))
+STORAGE_UPLOAD_TIMEOUT_SECONDS = float(os.getenv("STORAGE_UPLOAD_TIMEOUT_SECONDS", "60"))
+STORAGE_DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("STORAGE_DOWNLOAD_TIMEOUT_SECONDS", "30"))
+STORAGE_DELETE_TIMEOUT_SECONDS = float(os.getenv("STORAGE_DELETE_TIMEOUT_SECONDS", "10"))
+
+# Compression of stored transcript files: "zstd" (gzip when zstandard isn't installed), "gzip" or "identity"; level 0 uses the codec default
+STORAGE_COMPRESSION = os.getenv("STORAGE_COMPRESSION", "zstd")
+STORAGE_COMPRESSION_LEVEL = int(os.getenv("STORAGE_COMPRESSION_LEVEL", "0"))
+
+# Postgres TOAST compression of the transcript text columns, "lz4" or "pglz" (Postgres 14+), applied and backfilled by python -m scripts.compress_content_column
+DB_CONTENT_COMPRESSION = os.getenv("DB_CONTENT_COMPRESSION", "")
+
+# Transcript uploads are read and forwarded to storage in chunks of UPLOAD_CHUNK_SIZE bytes
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+# Local cache of storage objects: memory byte budget, optional mmap spill directory ("" disables spilling)
+STORAGE_CACHE_MEMORY_BYTES = int(os.getenv("STORAGE_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+STORAGE_CACHE_DISK_DIR = os.getenv("STORAGE_CACHE_DISK_DIR", "")
+STORAGE_CACHE_DISK_BYTES = int(os.getenv("STORAGE_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+STORAGE_CACHE_MAX_OBJECT_BYTES = int(os.getenv("STORAGE_CACHE_MAX_OBJECT_BYTES", str(10 * 1024 * 1024)))
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# LLM backend: "gemini", or "stub" for a deterministic offline model (local development, load tests)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+LLM_STUB_LATENCY_MS = int(os.getenv("LLM_STUB_LATENCY_MS", "500"))
+LLM_STUB_TASK_COUNT = int(os.getenv("LLM_STUB_TASK_COUNT", "3"))
+LLM_STUB_DESCRIPTION_CHARS = int(os.getenv("LLM_STUB_DESCRIPTION_CHARS", "200"))
+LLM_STUB_STREAM_CHUNK_CHARS = int(os.getenv("LLM_STUB_STREAM_CHUNK_CHARS", "64"))
+
+# Max concurrent in-flight LLM calls per process, the SDK calls run on their own thread pool
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_EXECUTOR_WORKERS = int(os.getenv("LLM_EXECUTOR_WORKERS", "4"))
+
+# Provider quota for the LLM scheduler (0 disables a bucket) and retry policy for 429/5xx responses
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+LLM_OUTPUT_TOKENS_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKENS_ESTIMATE", "1024"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+
+# Cache of extraction results keyed by content hash: "memory", "postgres", "tiered" (memory in front of postgres) or "none"
+EXTRACTION_CACHE_BACKEND = os.getenv("EXTRACTION_CACHE_BACKEND", "tiered")
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "512"))
+EXTRACTION_CACHE_DB_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_DB_MAX_ENTRIES", "50000"))
+
+# Transcripts longer than this are split into overlapping chunks and extracted in parallel
+EXTRACTION_CHUNK_CHARS = int(os.getenv("EXTRACTION_CHUNK_CHARS", "12000"))
+EXTRACTION_CHUNK_OVERLAP_CHARS = int(os.getenv("EXTRACTION_CHUNK_OVERLAP_CHARS", "800"))
+
+# Task deduplication: "minhash" (LSH candidate pairs) or "compat" (exact legacy pairwise results)
+DEDUP_MODE = os.getenv("DEDUP_MODE", "minhash")
+# Matching against existing tasks skips words more tasks than this share, so lookups stay bounded on large tables
+DEDUP_MAX_KEY_TASKS = int(os.getenv("DEDUP_MAX_KEY_TASKS", "1000"))
+
+# Batch regeneration: transcripts extracted at once across all batch requests, results written per transaction
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+BATCH_WRITE_SIZE = int(os.getenv("BATCH_WRITE_SIZE", "25"))
+BATCH_MAX_TRANSCRIPTS = int(os.getenv("BATCH_MAX_TRANSCRIPTS", "5000"))
+
+# Transcript list: characters of the summary preview, the full summary is only sent when asked for with fields=
+TRANSCRIPT_PREVIEW_CHARS = int(os.getenv("TRANSCRIPT_PREVIEW_CHARS", "200"))
+
+# Transcript search: snippets are cut from the first TRANSCRIPT_SNIPPET_SCAN_CHARS characters of each hit's content
+TRANSCRIPT_SNIPPET_SCAN_CHARS = int(os.getenv("TRANSCRIPT_SNIPPET_SCAN_CHARS", "200000"))
+
+# Background processing of transcripts (AI extraction runs outside the request)
+JOB_WORKER_ENABLED = os.getenv("JOB_WORKER_ENABLED", "true").lower() == "true"
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_STALE_AFTER_SECONDS = int(os.getenv("JOB_STALE_AFTER_SECONDS", "600"))
+# Start extraction while create/upload is still writing, the in-process worker joins it instead of calling the LLM again
+EXTRACTION_PREFETCH = os.getenv("EXTRACTION_PREFETCH", "true").lower() == "true"
+
 _supabase_storage_client = None
 
 def get_supabase_storage_client() -> Client:
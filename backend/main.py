@@ -9,6 +9,9 @@ import logging
 from routers.auth.auth import router as auth_router
 from routers.transcripts.transcripts import router as transcripts_router
 from routers.tasks.tasks import router as tasks_router
+from routers.transcripts.jobs import job_worker
+from routers.transcripts.storage_backends import storage_backend
+from config import JOB_WORKER_ENABLED
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,12 +36,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Range"],
 )
 
 app.include_router(auth_router)
 app.include_router(transcripts_router)
 app.include_router(tasks_router)
 
+#in-process worker for queued AI extraction jobs (set JOB_WORKER_ENABLED=false and run worker.py separately on Lambda)
+@app.on_event("startup")
+async def start_job_worker():
+    if JOB_WORKER_ENABLED:
+        job_worker.start()
+
+@app.on_event("shutdown")
+async def stop_job_worker():
+    await job_worker.stop()
+
+@app.on_event("shutdown")
+async def close_storage_backend():
+    await storage_backend.close()
+
 #changed the usual /docs route to show spotlightUI insetad of swagger
 @app.get("/docs", include_in_schema=False)
 async def api_documentation(request: Request):
@@ -0,0 +1,62 @@
+"""added processing jobs
+
+Revision ID: 3a7c91e4d2b8
+Revises: 9f507810a849
+Create Date: 2025-08-04 11:42:17.305114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c91e4d2b8'
+down_revision: Union[str, None] = '9f507810a849'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    processing_status = sa.Enum('QUEUED', 'PROCESSING', 'COMPLETED', 'FAILED', name='processingstatus')
+    processing_status.create(op.get_bind(), checkfirst=True)
+
+    # existing transcripts were processed inline before the job queue existed
+    op.add_column('transcripts', sa.Column('processing_status', processing_status, server_default='COMPLETED', nullable=False))
+    op.add_column('transcripts', sa.Column('processing_progress', sa.Integer(), server_default='100', nullable=False))
+    op.add_column('transcripts', sa.Column('processing_error', sa.Text(), nullable=True))
+
+    op.create_table('processing_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transcript_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('progress', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['transcript_id'], ['transcripts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_processing_jobs_id'), 'processing_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_processing_jobs_transcript_id'), 'processing_jobs', ['transcript_id'], unique=False)
+    # the worker polls for the oldest runnable job, keep that lookup on an index
+    op.create_index('ix_processing_jobs_status_run_after', 'processing_jobs', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_processing_jobs_status_run_after', table_name='processing_jobs')
+    op.drop_index(op.f('ix_processing_jobs_transcript_id'), table_name='processing_jobs')
+    op.drop_index(op.f('ix_processing_jobs_id'), table_name='processing_jobs')
+    op.drop_table('processing_jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
+    op.drop_column('transcripts', 'processing_error')
+    op.drop_column('transcripts', 'processing_progress')
+    op.drop_column('transcripts', 'processing_status')
+    sa.Enum(name='processingstatus').drop(op.get_bind(), checkfirst=True)
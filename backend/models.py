@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, Enum as SQLEnum, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 import enum
@@ -21,6 +22,18 @@ class TaskPriority(enum.Enum):
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
 
+class ProcessingStatus(enum.Enum):
+    QUEUED = "QUEUED"
+    PROCESSING = "PROCESSING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class JobStatus(enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
 class Team(enum.Enum):
     SALES = "Sales"
     DEVS = "Devs"
@@ -50,6 +63,11 @@ class User(Base):
 
 class Transcript(Base):
     __tablename__ = "transcripts"
+    __table_args__ = (
+        Index("ix_transcripts_created_at_id", "created_at", "id"),
+        Index("ix_transcripts_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_transcripts_created_by_id", "created_by_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -59,16 +77,45 @@ class Transcript(Base):
     original_filename = Column(String(255), nullable=True)  
     storage_file_path = Column(String(500), nullable=True)  
     file_size = Column(Integer, nullable=True) 
+    file_sha256 = Column(String(64), nullable=True)
+    storage_encoding = Column(String(16), default="identity", server_default="identity", nullable=False)
+    processing_status = Column(SQLEnum(ProcessingStatus), default=ProcessingStatus.QUEUED, nullable=False)
+    processing_progress = Column(Integer, default=0, nullable=False)
+    processing_error = Column(Text, nullable=True)
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # title, summary and content as a weighted tsvector, kept up to date by the transcripts_search_vector_update
+    # trigger (only when those columns change, unlike a generated column); never loaded
+    search_vector = deferred(Column(TSVECTOR, nullable=True), raiseload=True)
     
     # Relationships
     created_by = relationship("User", back_populates="created_transcripts")
     tasks = relationship("Task", back_populates="transcript")
+    processing_jobs = relationship("ProcessingJob", back_populates="transcript")
+
+# full-text document of a task: title weighs most, then tags, then description
+TASK_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        # one per query shape in tasks.py / transcripts.py, see migration f8c2d4a6b913
+        Index("ix_tasks_transcript_id_created_at", "transcript_id", "created_at"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tasks_priority_created_at_id", "priority", "created_at", "id"),
+        Index("ix_tasks_team_created_at_id", "assigned_team", "created_at", "id"),
+        Index("ix_tasks_team_status", "assigned_team", "status"),
+        Index("ix_tasks_updated_at", "updated_at"),
+        Index("ix_tasks_team_updated_at", "assigned_team", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -81,6 +128,71 @@ class Task(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # maintained by Postgres, only used in WHERE / ORDER BY so it's never loaded
+    search_vector = deferred(Column(TSVECTOR, Computed(TASK_SEARCH_DOCUMENT, persisted=True)), raiseload=True)
+    
+    # Relationships
+    transcript = relationship("Transcript", back_populates="tasks")
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        Index("ix_processing_jobs_status_run_after", "status", "run_after"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=False, index=True)
+    kind = Column(String(50), default="extract_tasks", nullable=False)
+    status = Column(SQLEnum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    progress = Column(Integer, default=0, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    error = Column(Text, nullable=True)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    transcript = relationship("Transcript", back_populates="tasks")
\ No newline at end of file
+    transcript = relationship("Transcript", back_populates="processing_jobs")
+
+class ExtractionCacheEntry(Base):
+    __tablename__ = "extraction_cache"
+    
+    cache_key = Column(String(64), primary_key=True)
+    payload = Column(Text, nullable=False)
+    model_name = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+# one MinHash LSH bucket key per band of a task, used to find near-duplicate tasks without scanning tasks
+class TaskSignatureBand(Base):
+    __tablename__ = "task_signature_bands"
+    __table_args__ = (
+        Index("ix_task_signature_bands_band_key", "band_key", "in_prefix"),
+        Index("ix_task_signature_bands_transcript_band", "transcript_id", "band_key", "in_prefix"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id", ondelete="CASCADE"), nullable=False)
+    band_key = Column(BigInteger, nullable=False)
+    # one of the task's rarest words when it was indexed, looked up with every word of a new task (prefix filtering)
+    in_prefix = Column(Boolean, default=False, nullable=False)
+
+# one stored file per distinct content, shared by every transcript whose file has this sha256;
+# at ref_count 0 the row waits for content_store.collect_object to remove it and its file
+class StoredObject(Base):
+    __tablename__ = "stored_objects"
+    
+    sha256 = Column(String(64), primary_key=True)
+    storage_path = Column(String(500), nullable=False)
+    storage_encoding = Column(String(16), default="identity", server_default="identity", nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, default=1, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,52 @@
+import base64
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, tuple_
+
+
+class InvalidCursor(Exception):
+    """The cursor wasn't produced by encode_cursor"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the position just after this row in (created_at, id) descending order"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+def newest_first(query: Select, model: Any) -> Select:
+    """(created_at, id) descending: id breaks ties so the order, and with it every page, is stable"""
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+def keyset_page(query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """
+    Page of `limit` rows after the cursor (the first page for an empty cursor), plus one row to tell whether
+    there is a next page. The row-value comparison walks the (created_at, id) index from the cursor, so a deep
+    page costs the same as the first, and rows inserted meanwhile don't shift later pages.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return newest_first(query, model).limit(limit + 1)
+
+def split_page(
+    rows: Sequence[Any],
+    limit: int,
+    entity: Callable[[Any], Any] = lambda row: row
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Drop the lookahead row and return the page with the cursor for the next one (None on the last page).
+    `entity` picks the object carrying created_at and id out of a result row.
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = entity(page[-1])
+    return page, encode_cursor(last.created_at, last.id)
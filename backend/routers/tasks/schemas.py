@@ -26,6 +26,10 @@ class TaskResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
 class TaskStatsResponse(BaseModel):
     total_tasks: int
     completed_tasks: int
@@ -0,0 +1,51 @@
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Select, func, literal, false, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from models import Task
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """
+    to_tsquery() input for what the user typed: every word has to match and the last one may be
+    incomplete (search-as-you-type). Only word characters are kept, so user input can't inject tsquery syntax.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"])
+
+def full_text(query: Select, text: str) -> Tuple[Select, ColumnElement]:
+    """Filter to tasks whose search_vector matches (GIN index) and return the relevance rank to order by"""
+    tsquery_text = prefix_tsquery(text)
+    if tsquery_text is None:
+        return query.where(false()), literal(0)
+    tsquery = func.to_tsquery("english", tsquery_text)
+    return query.where(Task.search_vector.bool_op("@@")(tsquery)), func.ts_rank_cd(Task.search_vector, tsquery)
+
+def fuzzy(query: Select, text: str) -> Tuple[Select, ColumnElement]:
+    """Trigram word similarity on the title (gin_trgm_ops index), for typos full-text search can't match"""
+    return query.where(literal(text).op("<%")(Task.title)), func.word_similarity(text, Task.title)
+
+async def search_tasks(db: AsyncSession, query: Select, text: str, skip: int, limit: int) -> List[Task]:
+    """
+    Tasks matching the search text, most relevant first. When full-text search finds nothing at all the results
+    come from trigram similarity instead, paged the same way, so "depolyment" still finds "Deployment checklist".
+    """
+    matched, rank = full_text(query, text)
+    result = await db.execute(
+        matched.order_by(rank.desc(), Task.created_at.desc(), Task.id.desc()).offset(skip).limit(limit)
+    )
+    tasks = result.scalars().all()
+    if tasks:
+        return tasks
+    # an empty later page only means full-text ran out of matches, unless it never had any
+    if skip > 0 and await db.scalar(select(matched.exists())):
+        return tasks
+
+    similar, score = fuzzy(query, text)
+    result = await db.execute(similar.order_by(score.desc(), Task.id.desc()).offset(skip).limit(limit))
+    return result.scalars().all()
@@ -1,29 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, desc
-from typing import List, Optional
+from typing import List, Optional, Union
 from config import get_db
 from models import User, Task, TaskStatus, TaskPriority, Team
 from routers.auth.helpers import get_current_active_user
-from .schemas import TaskUpdate, TaskResponse, TaskAnalyticsResponse, TaskStatsResponse, TeamStatsResponse
+from routers.transcripts.task_index import reindex_task
+from routers.pagination import InvalidCursor, keyset_page, newest_first, split_page
+from .search import full_text, search_tasks
+from .schemas import TaskUpdate, TaskResponse, TaskPage, TaskAnalyticsResponse, TaskStatsResponse, TeamStatsResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-@router.get("/", response_model=List[TaskResponse])
+@router.get("/", response_model=Union[TaskPage, List[TaskResponse]])
 async def get_tasks(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: next_cursor of the previous page, empty for the first page"),
     my_team_only: bool = Query(False, description="Filter tasks for user's team only"),
     status_filter: Optional[TaskStatus] = Query(None, description="Filter by task status"),
     priority_filter: Optional[TaskPriority] = Query(None, description="Filter by priority"),
-    search: Optional[str] = Query(None, description="Search in title and description"),
+    search: Optional[str] = Query(None, description="Full-text search in title, tags and description; the last word matches as a prefix"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get tasks with filtering options"""
+    """
+    Get tasks with filtering options, newest first. With `cursor` the response is a page with next_cursor
+    (keyset pagination); without it the legacy skip/limit list is returned, with X-Next-Cursor set.
+    A search without a cursor is ordered by relevance instead, falling back to fuzzy title matches.
+    """
     
     query = select(Task)
 
@@ -36,18 +45,31 @@ async def get_tasks(
     if priority_filter:
         query = query.where(Task.priority == priority_filter)
     
+    if search and cursor is None:
+        return await search_tasks(db, query, search, skip, limit)
+
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            Task.title.ilike(search_term) | 
-            Task.description.ilike(search_term) |
-            Task.tags.ilike(search_term)
-        )
-    
-    query = query.order_by(desc(Task.created_at)).offset(skip).limit(limit)
+        # keyset pages are newest first, relevance order needs the skip/limit mode
+        query, _ = full_text(query, search)
+    
+    if cursor is not None:
+        try:
+            query = keyset_page(query, Task, cursor, limit)
+        except InvalidCursor as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        result = await db.execute(query)
+        tasks, next_cursor = split_page(result.scalars().all(), limit)
+        return {"items": tasks, "next_cursor": next_cursor}
+
+    query = newest_first(query, Task).offset(skip).limit(limit + 1)
     
     result = await db.execute(query)
-    tasks = result.scalars().all()
+    tasks, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return tasks
 
@@ -100,6 +122,8 @@ async def update_task(
         task.assigned_team = task_update.assigned_team
     if task_update.tags is not None:
         task.tags = task_update.tags
+    if task_update.title is not None or task_update.description is not None:
+        await reindex_task(db, task)
     
     await db.commit()
     await db.refresh(task)
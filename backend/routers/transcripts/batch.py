@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import config
+from config import BATCH_MAX_CONCURRENCY, BATCH_WRITE_SIZE, BATCH_MAX_TRANSCRIPTS
+from models import Transcript
+from .schemas import AIGeneratedTask, BatchGenerateTasksRequest
+from .helpers import extract_tasks_and_summary_from_transcript
+from .persistence import persist_extraction_result
+from .scheduler import llm_priority, PRIORITY_BATCH
+
+logger = logging.getLogger(__name__)
+
+_BATCH_CONCURRENCY = max(BATCH_MAX_CONCURRENCY, 1)
+
+# shared by every batch in this process, so concurrent batches don't multiply the load
+_batch_slots = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+# keep references to running batches, they continue when the client that started them disconnects
+_running_batches: Set[asyncio.Task] = set()
+
+_Extracted = Tuple[int, List[AIGeneratedTask], str, str]
+
+
+async def resolve_batch_ids(db: AsyncSession, request: BatchGenerateTasksRequest) -> List[int]:
+    """Transcript ids selected by the explicit id list and/or the filter, oldest first"""
+    query = select(Transcript.id)
+    if request.transcript_ids:
+        query = query.where(Transcript.id.in_(request.transcript_ids))
+
+    criteria = request.filter
+    if criteria is not None:
+        if criteria.created_by_id is not None:
+            query = query.where(Transcript.created_by_id == criteria.created_by_id)
+        if criteria.created_after is not None:
+            query = query.where(Transcript.created_at >= criteria.created_after)
+        if criteria.created_before is not None:
+            query = query.where(Transcript.created_at < criteria.created_before)
+        if criteria.processing_status is not None:
+            query = query.where(Transcript.processing_status == criteria.processing_status)
+        if criteria.title_contains:
+            query = query.where(Transcript.title.ilike(f"%{criteria.title_contains}%"))
+        if criteria.missing_summary:
+            query = query.where(Transcript.summary.is_(None))
+
+    query = query.order_by(Transcript.id).limit(min(request.limit, BATCH_MAX_TRANSCRIPTS))
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+class BatchRun:
+    """
+    Regenerates tasks for many transcripts. Extraction fans out under the process-wide batch cap
+    in the LLM scheduler's batch lane; a single writer persists finished extractions in groups of up
+    to BATCH_WRITE_SIZE transcripts per transaction. Progress is published as (event, data) pairs.
+    """
+
+    def __init__(self, transcript_ids: Sequence[int], scope: str, use_cache: bool, missing_ids: Sequence[int] = ()):
+        self.transcript_ids = list(transcript_ids)
+        self.missing_ids = list(missing_ids)
+        self.scope = scope
+        self.use_cache = use_cache
+        self.succeeded = 0
+        self.failed = 0
+        self.tasks_created = 0
+        self.tasks_merged = 0
+        self._events: asyncio.Queue = asyncio.Queue()
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        self._events.put_nowait((event, data))
+
+    def _fail(self, transcript_id: int, error: Exception) -> None:
+        self.failed += 1
+        logger.warning(f"Batch generation failed for transcript {transcript_id}: {error}")
+        self._emit("progress", {"transcript_id": transcript_id, "status": "failed", "error": str(error)})
+
+    async def _extract_one(self, transcript_id: int, results: asyncio.Queue) -> None:
+        async with _batch_slots:
+            try:
+                async with config.AsyncSessionLocal() as db:
+                    row = (await db.execute(
+                        select(Transcript.title, Transcript.content).where(Transcript.id == transcript_id)
+                    )).first()
+                if row is None:
+                    raise LookupError("Transcript not found")
+                ai_tasks, summary, sentiment = await extract_tasks_and_summary_from_transcript(
+                    row.content,
+                    row.title,
+                    use_cache=self.use_cache
+                )
+            except Exception as e:
+                self._fail(transcript_id, e)
+                return
+
+        self._emit("progress", {"transcript_id": transcript_id, "status": "extracted", "task_count": len(ai_tasks)})
+        await results.put((transcript_id, ai_tasks, summary, sentiment))
+
+    async def _write_group(self, group: List[_Extracted]) -> None:
+        written = []
+        async with config.AsyncSessionLocal() as db:
+            for transcript_id, ai_tasks, summary, sentiment in group:
+                try:
+                    # a savepoint per transcript, one bad item doesn't roll back the rest of the group
+                    async with db.begin_nested():
+                        transcript = await db.get(Transcript, transcript_id)
+                        if transcript is None:
+                            raise LookupError("Transcript was deleted during the batch")
+                        persisted = await persist_extraction_result(db, transcript, ai_tasks, summary, sentiment, self.scope)
+                    written.append((transcript_id, persisted))
+                except Exception as e:
+                    self._fail(transcript_id, e)
+
+            try:
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                for transcript_id, _ in written:
+                    self._fail(transcript_id, e)
+                return
+
+        for transcript_id, persisted in written:
+            self.succeeded += 1
+            self.tasks_created += persisted.created
+            self.tasks_merged += persisted.merged
+            self._emit("progress", {
+                "transcript_id": transcript_id,
+                "status": "completed",
+                "created": persisted.created,
+                "merged": persisted.merged,
+                "skipped": persisted.skipped,
+            })
+
+    async def _write(self, results: asyncio.Queue) -> None:
+        """Write whatever has finished since the last commit, so groups grow when writes fall behind"""
+        finished = False
+        while not finished:
+            item: Optional[_Extracted] = await results.get()
+            if item is None:
+                break
+            group = [item]
+            while len(group) < BATCH_WRITE_SIZE and not results.empty():
+                item = results.get_nowait()
+                if item is None:
+                    finished = True
+                    break
+                group.append(item)
+            await self._write_group(group)
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        self._emit("start", {"total": len(self.transcript_ids) + len(self.missing_ids), "concurrency": _BATCH_CONCURRENCY})
+        for transcript_id in self.missing_ids:
+            self._fail(transcript_id, LookupError("Transcript not found"))
+
+        results: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write(results))
+        try:
+            with llm_priority(PRIORITY_BATCH):
+                await asyncio.gather(*[self._extract_one(transcript_id, results) for transcript_id in self.transcript_ids])
+            await results.put(None)
+            await writer
+        except Exception as e:
+            writer.cancel()
+            logger.error(f"Batch generation aborted: {e}")
+            self._emit("error", {"detail": f"Batch aborted: {str(e)}"})
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Batch generation finished: {self.succeeded} succeeded, {self.failed} failed in {elapsed_ms} ms")
+        self._emit("done", {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "tasks_created": self.tasks_created,
+            "tasks_merged": self.tasks_merged,
+            "elapsed_ms": elapsed_ms,
+        })
+        self._events.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        while True:
+            item = await self._events.get()
+            if item is None:
+                return
+            yield item
+
+
+def start_batch(transcript_ids: Sequence[int], scope: str, use_cache: bool, missing_ids: Sequence[int] = ()) -> BatchRun:
+    batch = BatchRun(transcript_ids, scope, use_cache, missing_ids)
+    task = asyncio.create_task(batch.run())
+    _running_batches.add(task)
+    task.add_done_callback(_running_batches.discard)
+    return batch
@@ -0,0 +1,85 @@
+import re
+from typing import List
+from config import EXTRACTION_CHUNK_CHARS, EXTRACTION_CHUNK_OVERLAP_CHARS
+
+# "Alice:", "[10:02] Bob:", "SPEAKER 1 -" style turn markers at the start of a line
+_speaker_turn_re = re.compile(r"^\s*(\[[^\]]{1,20}\]\s*)?[A-Z][\w .'-]{0,40}\s*[:\-]\s", re.MULTILINE)
+_paragraph_break_re = re.compile(r"\n\s*\n")
+_sentence_end_re = re.compile(r"(?<=[.!?])\s+")
+
+def _split_units(content: str) -> List[str]:
+    """Split into speaker turns when the transcript has them, otherwise into paragraphs"""
+    starts = [match.start() for match in _speaker_turn_re.finditer(content)]
+    if len(starts) >= 2:
+        if starts[0] != 0:
+            starts.insert(0, 0)
+        starts.append(len(content))
+        units = [content[begin:end] for begin, end in zip(starts, starts[1:])]
+    else:
+        units = [paragraph + "\n\n" for paragraph in _paragraph_break_re.split(content)]
+    return [unit for unit in units if unit.strip()]
+
+def _split_oversized(unit: str, max_chars: int) -> List[str]:
+    """Break a single turn/paragraph longer than max_chars on sentence ends, hard-splitting as a last resort"""
+    pieces: List[str] = []
+    current = ""
+    for sentence in _sentence_end_re.split(unit):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+def split_transcript(
+    content: str,
+    max_chars: int = EXTRACTION_CHUNK_CHARS,
+    overlap_chars: int = EXTRACTION_CHUNK_OVERLAP_CHARS
+) -> List[str]:
+    """
+    Split a transcript into chunks of at most ~max_chars on speaker/paragraph boundaries.
+    The trailing turns of each chunk (up to overlap_chars) are repeated at the start of the next one,
+    so an action item discussed across a boundary is seen whole by at least one chunk.
+    """
+    if len(content) <= max_chars:
+        return [content]
+
+    units: List[str] = []
+    for unit in _split_units(content):
+        units.extend(_split_oversized(unit, max_chars) if len(unit) > max_chars else [unit])
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for unit in units:
+        if current and current_len + len(unit) > max_chars:
+            chunks.append("".join(current))
+
+            overlap: List[str] = []
+            overlap_len = 0
+            for previous in reversed(current):
+                if overlap_len + len(previous) > overlap_chars:
+                    break
+                overlap.insert(0, previous)
+                overlap_len += len(previous)
+
+            # never let the overlap push the next chunk over the limit
+            while overlap and overlap_len + len(unit) > max_chars:
+                overlap_len -= len(overlap.pop(0))
+
+            current, current_len = overlap, overlap_len
+
+        current.append(unit)
+        current_len += len(unit)
+
+    if current:
+        chunks.append("".join(current))
+
+    return chunks
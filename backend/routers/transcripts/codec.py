@@ -0,0 +1,147 @@
+import asyncio
+import gzip
+import logging
+import zlib
+from typing import AsyncIterable, AsyncIterator, Dict
+from config import STORAGE_COMPRESSION, STORAGE_COMPRESSION_LEVEL
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+class _PassThrough:
+    """compressobj/decompressobj stand-in for uncompressed objects"""
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class Codec:
+    """Compression of stored transcript files. `name` is what transcripts.storage_encoding records."""
+
+    name = IDENTITY
+    content_type = "text/plain"
+
+    def __init__(self, level: int = 0):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def compressor(self):
+        return _PassThrough()
+
+    def decompressor(self):
+        return _PassThrough()
+
+
+class GzipCodec(Codec):
+    name = GZIP
+    content_type = "application/gzip"
+
+    def __init__(self, level: int = 6):
+        super().__init__(min(max(level, 1), 9))
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+    def compressor(self):
+        # wbits 31: zlib stream with a gzip header and trailer
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def decompressor(self):
+        return zlib.decompressobj(31)
+
+
+class ZstdCodec(Codec):
+    name = ZSTD
+    content_type = "application/zstd"
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise Exception("zstandard is not installed")
+        super().__init__(level)
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        # streamed uploads don't record the content size in the frame header, so decompress as a stream
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    def compressor(self):
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    def decompressor(self):
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+_DEFAULT_LEVELS: Dict[str, int] = {GZIP: 6, ZSTD: 3}
+
+def get_codec(name: str, level: int = 0) -> Codec:
+    """Codec for a storage_encoding value; level 0 means the codec's default"""
+    name = (name or IDENTITY).lower()
+    level = level or _DEFAULT_LEVELS.get(name, 0)
+    if name == IDENTITY:
+        return Codec()
+    if name == GZIP:
+        return GzipCodec(level)
+    if name == ZSTD:
+        return ZstdCodec(level)
+    raise Exception(f"Unknown storage encoding: {name}")
+
+def resolve_write_codec(name: str = STORAGE_COMPRESSION, level: int = STORAGE_COMPRESSION_LEVEL) -> Codec:
+    """Codec new uploads are written with, zstd falls back to gzip when zstandard isn't installed"""
+    if (name or "").lower() == ZSTD and zstandard is None:
+        logger.warning("STORAGE_COMPRESSION=zstd but zstandard is not installed, using gzip")
+        return get_codec(GZIP)
+    return get_codec(name, level)
+
+async def compress_bytes(data: bytes, codec: Codec) -> bytes:
+    """Compress off the event loop, a large transcript takes milliseconds of CPU"""
+    if codec.name == IDENTITY:
+        return data
+    return await asyncio.to_thread(codec.compress, data)
+
+async def compress_stream(chunks: AsyncIterable[bytes], codec: Codec) -> AsyncIterator[bytes]:
+    compressor = codec.compressor()
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    tail = compressor.flush()
+    if tail:
+        yield tail
+
+async def decompress_stream(chunks: AsyncIterable[bytes], codec: Codec) -> AsyncIterator[bytes]:
+    """Decompress a stored object chunk by chunk as it is read, never holding the whole file"""
+    decompressor = codec.decompressor()
+    async for chunk in chunks:
+        out = decompressor.decompress(chunk)
+        if out:
+            yield out
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+storage_codec = resolve_write_codec()
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+import config
+from models import StoredObject
+from .codec import storage_codec
+from .file_storage import FileStorageHelper
+from .storage_backends import storage_backend
+from .storage_client import StorageError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ObjectRef:
+    path: str
+    encoding: str
+    # no other reference: the row is new or was unreferenced, so the object may still have to be written
+    created: bool
+
+
+def content_path(sha256: str) -> str:
+    """Storage path of the object holding content with this sha256"""
+    return f"objects/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+def is_content_addressed(storage_file_path: Optional[str], file_sha256: Optional[str]) -> bool:
+    """Files stored before content addressing live under per-upload paths and are not reference counted"""
+    return bool(storage_file_path and file_sha256 and storage_file_path == content_path(file_sha256))
+
+async def find_object(db: AsyncSession, sha256: str) -> Optional[StoredObject]:
+    result = await db.execute(select(StoredObject).where(StoredObject.sha256 == sha256))
+    return result.scalar_one_or_none()
+
+async def acquire_object(db: AsyncSession, sha256: str, size: int) -> ObjectRef:
+    """
+    Add a reference to the object for this content, creating its row on first use. Runs in the caller's
+    transaction: a concurrent acquire or release of the same object waits for it to commit.
+    """
+    stmt = insert(StoredObject).values(
+        sha256=sha256,
+        storage_path=content_path(sha256),
+        storage_encoding=storage_codec.name,
+        size=size,
+        ref_count=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StoredObject.sha256],
+        set_={"ref_count": StoredObject.ref_count + 1, "updated_at": func.now()}
+    ).returning(StoredObject.storage_path, StoredObject.storage_encoding, StoredObject.ref_count)
+    row = (await db.execute(stmt)).first()
+    return ObjectRef(path=row.storage_path, encoding=row.storage_encoding, created=row.ref_count == 1)
+
+async def store_content(db: AsyncSession, content: bytes, sha256: str, uploaded: bool) -> ObjectRef:
+    """
+    Reference the object for content that is already known. `uploaded` says whether the caller wrote it
+    to content_path() already; it is written here when this turns out to be its first reference.
+    """
+    ref = await acquire_object(db, sha256, len(content))
+    if ref.created and not uploaded:
+        # the object existed when the caller looked but was released and removed since
+        await FileStorageHelper.upload_file(content, ref.path, upsert=True)
+    return ref
+
+async def adopt_staged_object(db: AsyncSession, staging_path: str, sha256: str, size: int) -> ObjectRef:
+    """
+    Reference the object for a file that was streamed to a staging path before its hash was known.
+    The first copy of the content is moved into place, a duplicate is dropped.
+    """
+    ref = await acquire_object(db, sha256, size)
+    if ref.created:
+        try:
+            await storage_backend.move(staging_path, ref.path)
+            return ref
+        except StorageError:
+            # fine when an earlier upload of this content, whose transcript insert failed, left the object behind
+            if not await storage_backend.exists(ref.path):
+                raise
+    await FileStorageHelper.delete_file(staging_path)
+    return ref
+
+async def release_object(db: AsyncSession, sha256: str) -> bool:
+    """
+    Drop one reference in the caller's transaction. Returns whether it was the last one: the file is left
+    in place, the caller calls collect_object once the release is committed, so a rollback can't leave a
+    referenced row without its file.
+    """
+    result = await db.execute(
+        update(StoredObject)
+        .where(StoredObject.sha256 == sha256, StoredObject.ref_count > 0)
+        .values(ref_count=StoredObject.ref_count - 1, updated_at=func.now())
+        .returning(StoredObject.ref_count)
+    )
+    return result.scalar_one_or_none() == 0
+
+async def collect_object(db: AsyncSession, sha256: str) -> bool:
+    """
+    Remove the object if nothing references it, in a transaction of its own. The row stays locked until the
+    file is gone, so a concurrent upload of the same content waits for this and then writes the file again;
+    an object that upload is already referencing again is skipped. Returns whether the object was removed.
+    """
+    result = await db.execute(
+        select(StoredObject)
+        .where(StoredObject.sha256 == sha256, StoredObject.ref_count == 0)
+        .with_for_update(skip_locked=True)
+    )
+    stored = result.scalar_one_or_none()
+    if stored is None:
+        await db.rollback()
+        return False
+    if not await FileStorageHelper.delete_file(stored.storage_path):
+        await db.rollback()
+        logger.warning(f"Stored object {sha256} is unreferenced but could not be deleted, left for the next collection")
+        return False
+
+    await db.delete(stored)
+    await db.commit()
+    return True
+
+async def collect_unreferenced_objects(batch_size: int = 100) -> int:
+    """Remove every unreferenced object, e.g. those whose collection failed after the last release"""
+    if config.AsyncSessionLocal is None:
+        raise Exception("Database not configured")
+
+    removed = 0
+    last_sha256 = ""
+    async with config.AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(StoredObject.sha256)
+                .where(StoredObject.ref_count == 0, StoredObject.sha256 > last_sha256)
+                .order_by(StoredObject.sha256)
+                .limit(batch_size)
+            )
+            hashes = list(result.scalars().all())
+            await db.rollback()
+            if not hashes:
+                break
+            for sha256 in hashes:
+                if await collect_object(db, sha256):
+                    removed += 1
+            last_sha256 = hashes[-1]
+            logger.info(f"Removed {removed} unreferenced stored objects")
+    return removed
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(collect_unreferenced_objects())
@@ -0,0 +1,240 @@
+import hashlib
+import logging
+import math
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Generic, List, Optional, Set, Tuple, TypeVar
+from config import DEDUP_MODE
+
+logger = logging.getLogger(__name__)
+
+TITLE_THRESHOLD = 0.6
+DESCRIPTION_THRESHOLD = 0.5
+
+# The legacy rules compare the overlap against the smaller word set, so duplicates can have a low Jaccard
+# ("Order new hardware" vs "Order new hardware for design team" is 0.5, a 2 word description sharing one
+# word with a 20 word one 0.05) and banded MinHash would miss them. Instead the title and the description
+# are keyed separately by their words: every word of a field with up to MINHASH_PERMUTATIONS words, and for
+# longer fields only the words that are the minimum under one of the permutations, so a long description
+# costs at most that many keys. A pair with a longer field and Jaccard J still shares a key with probability
+# at least 1 - (1 - J)^32.
+#
+# Looking up every key would make common words ("the", "for") candidates for nearly every pair, so lookups
+# use prefix filtering: a field that overlaps another one by threshold * the smaller size shares a word with
+# any |x| - ceil(threshold * |x|) + 1 words of the smaller field x. The index marks those "prefix" words, the
+# rarest ones, of every field it keeps; a lookup probes all keys with the prefix of the new field (the new
+# field is the smaller one) and the marked prefixes of kept fields with all its words (the kept field is).
+# That holds for any choice of words, so it stays exact while the frequencies used to pick them change.
+MINHASH_PERMUTATIONS = 32
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(1337)
+_PERMUTATIONS: List[Tuple[int, int]] = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+_token_hash_cache: Dict[str, int] = {}
+
+def _token_hash(token: str) -> int:
+    value = _token_hash_cache.get(token)
+    if value is None:
+        value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+        if len(_token_hash_cache) < 100_000:
+            _token_hash_cache[token] = value
+    return value
+
+def tokenize(text: Optional[str]) -> FrozenSet[str]:
+    """Same word split are_tasks_similar uses, computed once per task"""
+    return frozenset((text or "").lower().split())
+
+def _sampled_tokens(tokens: FrozenSet[str]) -> FrozenSet[str]:
+    """The tokens that have the minimum hash under at least one permutation"""
+    if len(tokens) <= MINHASH_PERMUTATIONS:
+        return tokens
+    hashes = [(_token_hash(token), token) for token in tokens]
+    return frozenset(
+        min(hashes, key=lambda pair: ((a * pair[0] + b) % _MERSENNE_PRIME) & _MAX_HASH)[1]
+        for a, b in _PERMUTATIONS
+    )
+
+def _band_keys(field_tag: str, tokens: FrozenSet[str]) -> Tuple[int, ...]:
+    """Signed 64-bit bucket keys of one field (fit a Postgres BIGINT)"""
+    return tuple(
+        int.from_bytes(
+            hashlib.blake2b(f"{field_tag}:{token}".encode("utf-8"), digest_size=8).digest(), "little", signed=True
+        )
+        for token in sorted(_sampled_tokens(tokens))
+    )
+
+
+_TITLE_FIELD = "t"
+_DESCRIPTION_FIELD = "d"
+
+@dataclass(frozen=True)
+class TaskSignature:
+    title_tokens: FrozenSet[str]
+    description_tokens: FrozenSet[str]
+    title_keys: Tuple[int, ...] = field(default=tuple())
+    description_keys: Tuple[int, ...] = field(default=tuple())
+
+    @property
+    def band_keys(self) -> Tuple[int, ...]:
+        return self.title_keys + self.description_keys
+
+def compute_signature(title: Optional[str], description: Optional[str]) -> TaskSignature:
+    """
+    Tokenize a task once and derive its LSH band keys: the title and the description are banded
+    separately, since either one matching on its own makes two tasks duplicates
+    """
+    title_tokens = tokenize(title)
+    description_tokens = tokenize(description)
+    return TaskSignature(
+        title_tokens,
+        description_tokens,
+        _band_keys(_TITLE_FIELD, title_tokens),
+        _band_keys(_DESCRIPTION_FIELD, description_tokens),
+    )
+
+def _prefix_size(size: int, threshold: float) -> int:
+    """Words of a field of this size that any field overlapping it (as the smaller one) shares one of"""
+    return size - math.ceil(threshold * size) + 1
+
+def prefix_keys(signature: TaskSignature, frequency: Callable[[int], int]) -> Set[int]:
+    """
+    The band keys of the rarest words of each field, as many as prefix filtering needs.
+    Sampled long fields keep all their keys, their words don't have to overlap the other field.
+    """
+    keys: Set[int] = set()
+    for tokens, field_keys, threshold in (
+        (signature.title_tokens, signature.title_keys, TITLE_THRESHOLD),
+        (signature.description_tokens, signature.description_keys, DESCRIPTION_THRESHOLD),
+    ):
+        if len(tokens) > MINHASH_PERMUTATIONS:
+            keys.update(field_keys)
+        else:
+            rarest_first = sorted(field_keys, key=lambda key: (frequency(key), key))
+            keys.update(rarest_first[:_prefix_size(len(field_keys), threshold)])
+    return keys
+
+def _overlaps(a: FrozenSet[str], b: FrozenSet[str], threshold: float) -> bool:
+    return len(a & b) >= threshold * min(len(a), len(b))
+
+def signatures_similar(a: TaskSignature, b: TaskSignature, compat: bool = True) -> bool:
+    """
+    The 60% title / 50% description overlap rules of are_tasks_similar on precomputed token sets.
+    In compat mode an empty title or description matches anything, exactly like are_tasks_similar;
+    otherwise empty fields are ignored instead of counting as a match.
+    """
+    if compat or (a.title_tokens and b.title_tokens):
+        if _overlaps(a.title_tokens, b.title_tokens, TITLE_THRESHOLD):
+            return True
+    if compat or (a.description_tokens and b.description_tokens):
+        if _overlaps(a.description_tokens, b.description_tokens, DESCRIPTION_THRESHOLD):
+            return True
+    return False
+
+
+T = TypeVar("T")
+
+class DedupIndex(Generic[T]):
+    """
+    Incremental duplicate index over kept items. Candidates are verified with the are_tasks_similar rules,
+    and an item with an empty title or description is a candidate for everything, as it overlaps with
+    everything under those rules.
+
+    mode="minhash": candidates come from prefix filtering over the band keys, with words ranked by how many
+    kept items have them, so each lookup only verifies items sharing a rare word instead of every kept item.
+    mode="compat": candidates come from an inverted word index, which returns exactly what the
+    pairwise are_tasks_similar loop would.
+    """
+
+    def __init__(self, mode: str = DEDUP_MODE):
+        if mode not in ("minhash", "compat"):
+            raise ValueError(f"Unknown dedup mode: {mode}")
+        self.mode = mode
+        self._items: List[Tuple[TaskSignature, T]] = []
+        self._buckets: Dict[int, List[int]] = defaultdict(list)
+        self._prefix_buckets: Dict[int, List[int]] = defaultdict(list)
+        self._wildcards: List[int] = []
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _words(signature: TaskSignature) -> List[int]:
+        return [hash(("t", token)) for token in signature.title_tokens] + \
+               [hash(("d", token)) for token in signature.description_tokens]
+
+    def _frequency(self, key: int) -> int:
+        return len(self._buckets.get(key, ()))
+
+    @staticmethod
+    def _has_empty_field(signature: TaskSignature) -> bool:
+        return not signature.title_tokens or not signature.description_tokens
+
+    def _candidates(self, signature: TaskSignature) -> List[int]:
+        if self._has_empty_field(signature):
+            # an empty field overlaps with everything under the legacy rules
+            return list(range(len(self._items)))
+
+        candidates = set(self._wildcards)
+        if self.mode == "compat":
+            for key in self._words(signature):
+                candidates.update(self._buckets.get(key, ()))
+            return sorted(candidates)
+
+        for key in prefix_keys(signature, self._frequency):
+            candidates.update(self._buckets.get(key, ()))
+        for key in signature.band_keys:
+            candidates.update(self._prefix_buckets.get(key, ()))
+        return sorted(candidates)
+
+    def find_duplicate(self, signature: TaskSignature) -> Optional[T]:
+        for position in self._candidates(signature):
+            self.comparisons += 1
+            kept_signature, item = self._items[position]
+            if signatures_similar(signature, kept_signature):
+                return item
+        return None
+
+    def add(self, signature: TaskSignature, item: T) -> None:
+        position = len(self._items)
+        self._items.append((signature, item))
+        if self._has_empty_field(signature):
+            self._wildcards.append(position)
+            return
+        if self.mode == "compat":
+            for key in self._words(signature):
+                self._buckets[key].append(position)
+            return
+
+        # picked before the item's own words are counted
+        for key in prefix_keys(signature, self._frequency):
+            self._prefix_buckets[key].append(position)
+        for key in signature.band_keys:
+            self._buckets[key].append(position)
+
+
+def deduplicate_tasks(tasks: List[T], mode: str = DEDUP_MODE) -> List[T]:
+    """Keep the first of every group of similar tasks, preserving order"""
+    if len(tasks) <= 1:
+        return tasks
+
+    index: DedupIndex[T] = DedupIndex(mode)
+    unique_tasks: List[T] = []
+    for task in tasks:
+        signature = compute_signature(task.title, task.description)
+        existing_task = index.find_duplicate(signature)
+        if existing_task is not None:
+            logger.info(f"Removing duplicate task: '{task.title}' (similar to existing: '{existing_task.title}')")
+            continue
+        index.add(signature, task)
+        unique_tasks.append(task)
+
+    logger.debug(f"Deduplicated {len(tasks)} tasks with {index.comparisons} comparisons ({mode})")
+    return unique_tasks
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file"""
+
+
+def make_etag(transcript_id: int, file_sha256: Optional[str], file_size: Optional[int], modified: Optional[datetime]) -> str:
+    """Strong ETag from the content hash; weak one from size and timestamp for files stored before hashing"""
+    if file_sha256:
+        return f'"{file_sha256}"'
+    stamp = int(modified.timestamp()) if modified else 0
+    return f'W/"{transcript_id}-{file_size or 0}-{stamp}"'
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/"x" matches "x" """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _strip_weak(etag)
+    return any(_strip_weak(tag) == wanted for tag in header.split(","))
+
+def etag_matches_strong(header: Optional[str], etag: str) -> bool:
+    """If-Range uses strong comparison (RFC 9110 13.1.5): both tags strong and identical, W/ never matches"""
+    if not header:
+        return False
+    tag = header.strip()
+    return not tag.startswith("W/") and not etag.startswith("W/") and tag == etag
+
+def not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime]
+) -> bool:
+    """RFC 9110 precedence: If-Modified-Since is only looked at when If-None-Match is absent"""
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+    return False
+
+def parse_range(header: Optional[str], size: Optional[int]) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end). Returns None when the whole file should be
+    sent: no header, a syntax we don't support (multiple ranges, other units) or an unknown file size.
+    """
+    if not header or size is None:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            # suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+async def iter_buffer(data: Any, byte_range: Optional[Tuple[int, int]], chunk_size: int) -> AsyncIterator[bytes]:
+    """Serve a cached object (bytes or mmap) in chunks, limited to the inclusive byte range if given"""
+    start, end = byte_range if byte_range else (0, len(data) - 1)
+    for offset in range(start, end + 1, chunk_size):
+        yield bytes(data[offset:min(offset + chunk_size, end + 1)])
+
+async def slice_stream(chunks: AsyncIterator[bytes], start: int, end: int) -> AsyncIterator[bytes]:
+    """Cut [start, end] out of a full-body stream, for storage that ignored the Range header"""
+    position = 0
+    async for chunk in chunks:
+        chunk_end = position + len(chunk)
+        if chunk_end > start:
+            yield chunk[max(start - position, 0):end + 1 - position]
+        position = chunk_end
+        if position > end:
+            break
+
+async def close_after(chunks: AsyncIterator[bytes], close: Callable[[], Awaitable[None]]) -> AsyncIterator[bytes]:
+    """Release the upstream connection as soon as the body is done or the client goes away"""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await close()
@@ -0,0 +1,321 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert
+import config
+from config import (
+    EXTRACTION_CACHE_BACKEND,
+    EXTRACTION_CACHE_TTL_SECONDS,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_DB_MAX_ENTRIES,
+)
+from models import ExtractionCacheEntry
+from .schemas import AIGeneratedTask
+
+logger = logging.getLogger(__name__)
+
+_whitespace_re = re.compile(r"[ \t]+")
+
+def normalize_content(content: str) -> str:
+    """Normalize line endings and whitespace so cosmetic differences hit the same cache entry"""
+    lines = content.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(_whitespace_re.sub(" ", line).strip() for line in lines).strip()
+
+def make_cache_key(content: str, title: str, prompt_version: str, model_name: str) -> str:
+    """sha256 over everything that influences the extraction result"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, title.strip(), normalize_content(content)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedExtraction:
+    tasks: List[AIGeneratedTask]
+    summary: str
+    sentiment: str
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "tasks": [task.model_dump(mode="json") for task in self.tasks],
+            "summary": self.summary,
+            "sentiment": self.sentiment,
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> "CachedExtraction":
+        data = json.loads(payload)
+        return cls(
+            tasks=[AIGeneratedTask(**task) for task in data.get("tasks", [])],
+            summary=data.get("summary", ""),
+            sentiment=data.get("sentiment", ""),
+        )
+
+
+@dataclass
+class CacheCounters:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups > 0 else 0.0,
+        }
+
+
+class ExtractionCacheBackend:
+    """Interface for extraction result cache backends"""
+
+    name = "base"
+
+    def __init__(self):
+        self.counters = CacheCounters()
+
+    async def get(self, key: str) -> Optional[CachedExtraction]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: CachedExtraction, model_name: str, prompt_version: str) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, **self.counters.as_dict()}
+
+
+class InMemoryLRUCache(ExtractionCacheBackend):
+    """Per-process LRU with TTL, bounded by entry count"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES, ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max(max_entries, 1)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, CachedExtraction]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CachedExtraction]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters.misses += 1
+            return None
+
+        stored_at, value = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.counters.evictions += 1
+            self.counters.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.counters.hits += 1
+        return value
+
+    async def set(self, key: str, value: CachedExtraction, model_name: str, prompt_version: str) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        self.counters.sets += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class PostgresExtractionCache(ExtractionCacheBackend):
+    """
+    Shared cache in the extraction_cache table, survives restarts and is shared by all workers.
+    Uses its own session so cache writes never interfere with the caller's transaction.
+    """
+
+    name = "postgres"
+
+    def __init__(self, max_entries: int = EXTRACTION_CACHE_DB_MAX_ENTRIES, ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max(max_entries, 1)
+        self.ttl_seconds = ttl_seconds
+        self._sets_since_prune = 0
+
+    async def get(self, key: str) -> Optional[CachedExtraction]:
+        if config.AsyncSessionLocal is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+        try:
+            async with config.AsyncSessionLocal() as db:
+                result = await db.execute(select(ExtractionCacheEntry).where(ExtractionCacheEntry.cache_key == key))
+                entry = result.scalar_one_or_none()
+
+                if entry is None:
+                    self.counters.misses += 1
+                    return None
+
+                if entry.expires_at is not None and entry.expires_at <= now:
+                    await db.delete(entry)
+                    await db.commit()
+                    self.counters.evictions += 1
+                    self.counters.misses += 1
+                    return None
+
+                await db.execute(
+                    update(ExtractionCacheEntry)
+                    .where(ExtractionCacheEntry.cache_key == key)
+                    .values(hit_count=ExtractionCacheEntry.hit_count + 1, last_accessed_at=now)
+                )
+                await db.commit()
+                self.counters.hits += 1
+                return CachedExtraction.from_json(entry.payload)
+        except Exception as e:
+            self.counters.errors += 1
+            logger.warning(f"Extraction cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, value: CachedExtraction, model_name: str, prompt_version: str) -> None:
+        if config.AsyncSessionLocal is None:
+            return
+
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds else None
+        payload = value.to_json()
+        try:
+            async with config.AsyncSessionLocal() as db:
+                stmt = insert(ExtractionCacheEntry).values(
+                    cache_key=key,
+                    payload=payload,
+                    model_name=model_name,
+                    prompt_version=prompt_version,
+                    hit_count=0,
+                    expires_at=expires_at,
+                    last_accessed_at=now,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ExtractionCacheEntry.cache_key],
+                    set_=dict(payload=payload, expires_at=expires_at, last_accessed_at=now)
+                )
+                await db.execute(stmt)
+                await db.commit()
+                self.counters.sets += 1
+
+                # prune in batches instead of counting the table on every write
+                self._sets_since_prune += 1
+                if self._sets_since_prune >= 50:
+                    self._sets_since_prune = 0
+                    await self._prune(db, now)
+        except Exception as e:
+            self.counters.errors += 1
+            logger.warning(f"Extraction cache write failed: {e}")
+
+    async def _prune(self, db, now: datetime) -> None:
+        """Drop expired entries and the least recently used ones beyond max_entries"""
+        expired = await db.execute(
+            delete(ExtractionCacheEntry).where(ExtractionCacheEntry.expires_at <= now)
+        )
+        keep = (
+            select(ExtractionCacheEntry.cache_key)
+            .order_by(ExtractionCacheEntry.last_accessed_at.desc())
+            .limit(self.max_entries)
+        )
+        overflow = await db.execute(
+            delete(ExtractionCacheEntry).where(ExtractionCacheEntry.cache_key.not_in(keep))
+        )
+        await db.commit()
+        self.counters.evictions += (expired.rowcount or 0) + (overflow.rowcount or 0)
+
+    async def delete(self, key: str) -> None:
+        if config.AsyncSessionLocal is None:
+            return
+        async with config.AsyncSessionLocal() as db:
+            await db.execute(delete(ExtractionCacheEntry).where(ExtractionCacheEntry.cache_key == key))
+            await db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "max_entries": self.max_entries}
+
+
+class TieredExtractionCache(ExtractionCacheBackend):
+    """In-process LRU in front of the shared Postgres cache"""
+
+    name = "tiered"
+
+    def __init__(self, local: InMemoryLRUCache, shared: PostgresExtractionCache):
+        super().__init__()
+        self.local = local
+        self.shared = shared
+
+    async def get(self, key: str) -> Optional[CachedExtraction]:
+        value = await self.local.get(key)
+        if value is None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value, "", "")
+
+        if value is None:
+            self.counters.misses += 1
+        else:
+            self.counters.hits += 1
+        return value
+
+    async def set(self, key: str, value: CachedExtraction, model_name: str, prompt_version: str) -> None:
+        await self.local.set(key, value, model_name, prompt_version)
+        await self.shared.set(key, value, model_name, prompt_version)
+        self.counters.sets += 1
+
+    async def delete(self, key: str) -> None:
+        await self.local.delete(key)
+        await self.shared.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "tiers": [self.local.stats(), self.shared.stats()]}
+
+
+class NullExtractionCache(ExtractionCacheBackend):
+    """Caching disabled"""
+
+    name = "none"
+
+    async def get(self, key: str) -> Optional[CachedExtraction]:
+        self.counters.misses += 1
+        return None
+
+    async def set(self, key: str, value: CachedExtraction, model_name: str, prompt_version: str) -> None:
+        return None
+
+    async def delete(self, key: str) -> None:
+        return None
+
+
+def create_extraction_cache(backend: str = EXTRACTION_CACHE_BACKEND) -> ExtractionCacheBackend:
+    backend = backend.lower()
+    if backend == "memory":
+        return InMemoryLRUCache()
+    if backend == "postgres":
+        return PostgresExtractionCache()
+    if backend == "tiered":
+        return TieredExtractionCache(InMemoryLRUCache(), PostgresExtractionCache())
+    if backend == "none":
+        return NullExtractionCache()
+    raise ValueError(f"Unknown EXTRACTION_CACHE_BACKEND: {backend}")
+
+extraction_cache = create_extraction_cache()
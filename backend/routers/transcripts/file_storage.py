@@ -1,14 +1,22 @@
+import asyncio
 import uuid
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
 from fastapi import UploadFile
-from config import get_supabase_storage, SUPABASE_STORAGE_BUCKET
+from sqlalchemy import select, update, exists
+import config
+from config import DOWNLOAD_CHUNK_SIZE
+from models import Transcript, StoredObject
+from .codec import IDENTITY, Codec, get_codec, storage_codec, compress_bytes, compress_stream, decompress_stream
+from .object_cache import object_cache, release_cached
+from .downloads import iter_buffer, slice_stream, close_after
+from .storage_backends import StorageDownload, storage_backend
 
 logger = logging.getLogger(__name__)
 
 class FileStorageHelper:
-    """Helper class for managing file storage in Supabase"""
+    """Helper class for managing file storage through the configured storage backend"""
     
     @staticmethod
     def generate_file_path(user_id: int, original_filename: str, transcript_id: Optional[int] = None) -> str:
@@ -23,20 +31,12 @@ class FileStorageHelper:
             return f"transcripts/user_{user_id}/{timestamp}_{unique_id}_{clean_filename}"
     
     @staticmethod
-    async def upload_file(file_content: bytes, file_path: str) -> str:
-        """Upload file to Supabase Storage and return the storage path"""
+    async def upload_file(file_content: bytes, file_path: str, codec: Codec = storage_codec, upsert: bool = False) -> str:
+        """Upload file to storage, compressed with the codec, and return the storage path"""
         try:
-            storage = get_supabase_storage()
-
-            result = storage.from_(SUPABASE_STORAGE_BUCKET).upload(
-                path=file_path,
-                file=file_content,
-                file_options={"content-type": "text/plain"}
-            )
-            
-            if hasattr(result, 'error') and result.error:
-                raise Exception(f"Upload failed: {result.error}")
-            
+            data = await compress_bytes(file_content, codec)
+            await storage_backend.upload(file_path, data, content_type=codec.content_type, upsert=upsert)
+            object_cache.invalidate(file_path)
             logger.info(f"File uploaded successfully to: {file_path}")
             return file_path
             
@@ -44,9 +44,22 @@ class FileStorageHelper:
             logger.error(f"Error uploading file: {e}")
             raise Exception(f"Failed to upload file: {str(e)}")
     
+    @staticmethod
+    async def upload_stream(chunks: AsyncIterable[bytes], file_path: str, codec: Codec = storage_codec) -> str:
+        """Upload a file from an async stream of chunks (chunked transfer), compressed on the way, never holding the whole file"""
+        try:
+            await storage_backend.upload(file_path, compress_stream(chunks, codec), content_type=codec.content_type)
+            object_cache.invalidate(file_path)
+            logger.info(f"File streamed successfully to: {file_path}")
+            return file_path
+
+        except Exception as e:
+            logger.error(f"Error streaming file upload: {e}")
+            raise Exception(f"Failed to upload file: {str(e)}")
+
     @staticmethod
     async def upload_text_as_file(content: str, file_path: str) -> str:
-        """Upload text content as a .txt file to Supabase Storage incase the user copy pastes the transcript"""
+        """Upload text content as a .txt file to storage incase the user copy pastes the transcript"""
         try:
             file_content = content.encode('utf-8')
             return await FileStorageHelper.upload_file(file_content, file_path)
@@ -55,34 +68,82 @@ class FileStorageHelper:
             raise Exception(f"Failed to upload text as file: {str(e)}")
     
     @staticmethod
-    async def download_file(file_path: str) -> bytes:
-        """Download file"""
+    async def download_file(file_path: str, encoding: str = IDENTITY) -> bytes:
+        """Download and decompress file, served from the local object cache when possible"""
         try:
-            storage = get_supabase_storage()
-            
-            result = storage.from_(SUPABASE_STORAGE_BUCKET).download(file_path)
-            
-            if hasattr(result, 'error') and result.error:
-                raise Exception(f"Download failed: {result.error}")
-            
+            cached = await object_cache.get(file_path)
+            if cached is not None:
+                try:
+                    return bytes(cached)
+                finally:
+                    release_cached(cached)
+
+            result = await storage_backend.download(file_path)
+            codec = get_codec(encoding)
+            if codec.name != IDENTITY:
+                result = await asyncio.to_thread(codec.decompress, result)
+            await object_cache.put(file_path, result)
             return result
             
         except Exception as e:
             logger.error(f"Error downloading file: {e}")
             raise Exception(f"Failed to download file: {str(e)}")
     
+    @staticmethod
+    async def open_download_stream(
+        file_path: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> StorageDownload:
+        """
+        Start a streamed download, optionally of an inclusive byte range. The caller iterates
+        download.chunks and must await download.close(). `partial` is set when the backend honoured the range.
+        """
+        try:
+            return await storage_backend.open_download(file_path, byte_range, chunk_size)
+        except Exception as e:
+            logger.error(f"Error downloading file {file_path}: {e}")
+            raise Exception(f"Failed to download file: {str(e)}")
+
+    @staticmethod
+    async def open_file_stream(
+        file_path: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        size: Optional[int] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        encoding: str = IDENTITY
+    ) -> AsyncIterator[bytes]:
+        """
+        Body of a download, exactly the requested range of the decompressed file. Hot files come from the
+        local object cache (which holds them decompressed); otherwise the file is streamed from storage,
+        decompressed as it arrives, and full reads fill the cache on the way through.
+        Storage errors are raised here, before the first byte is sent.
+        """
+        cached = await object_cache.get(file_path)
+        if cached is not None:
+            async def release() -> None:
+                release_cached(cached)
+            return close_after(iter_buffer(cached, byte_range, chunk_size), release)
+
+        codec = get_codec(encoding)
+        # byte offsets of the file don't map onto a compressed object, read it from the start and cut the range out
+        stored_range = byte_range if codec.name == IDENTITY else None
+        download = await FileStorageHelper.open_download_stream(file_path, stored_range, chunk_size)
+        chunks = download.chunks
+        if codec.name != IDENTITY:
+            chunks = decompress_stream(chunks, codec)
+        if byte_range and not (stored_range and download.partial):
+            chunks = slice_stream(chunks, byte_range[0], byte_range[1])
+        elif byte_range is None and object_cache.accepts(size):
+            chunks = object_cache.fill(file_path, chunks, size)
+        return close_after(chunks, download.close)
+
     @staticmethod
     async def delete_file(file_path: str) -> bool:
-        """Delete file from Supabase Bucket"""
+        """Delete file from storage"""
+        object_cache.invalidate(file_path)
         try:
-            storage = get_supabase_storage()
-            
-            result = storage.from_(SUPABASE_STORAGE_BUCKET).remove([file_path])
-            
-            if hasattr(result, 'error') and result.error:
-                logger.warning(f"Delete warning: {result.error}")
-                return False
-            
+            await storage_backend.delete([file_path])
             logger.info(f"File deleted successfully: {file_path}")
             return True
             
@@ -94,9 +155,65 @@ class FileStorageHelper:
     def get_public_url(file_path: str) -> str:
         """Get public URL for the file"""
         try:
-            storage = get_supabase_storage()
-            result = storage.from_(SUPABASE_STORAGE_BUCKET).get_public_url(file_path)
-            return result
+            return storage_backend.public_url(file_path)
         except Exception as e:
             logger.error(f"Error getting public URL: {e}")
             return ""
+
+
+async def backfill_storage_compression(batch_size: int = 100) -> int:
+    """
+    Recompress files stored before compression with the configured codec. Each file is written to a new
+    path and the transcript row is switched over before the old object is deleted, so a crash never leaves
+    a row pointing at bytes in a different encoding.
+    """
+    if config.AsyncSessionLocal is None:
+        raise Exception("Database not configured")
+    if storage_codec.name == IDENTITY:
+        return 0
+
+    converted = 0
+    last_id = 0
+    async with config.AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(Transcript.id, Transcript.storage_file_path)
+                .where(Transcript.id > last_id)
+                .where(Transcript.storage_file_path.isnot(None))
+                .where(Transcript.storage_encoding == IDENTITY)
+                # shared content-addressed objects are left where they are
+                .where(~exists().where(StoredObject.storage_path == Transcript.storage_file_path))
+                .order_by(Transcript.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            for row in rows:
+                new_path = f"{row.storage_file_path}.{storage_codec.name}"
+                try:
+                    data = await storage_backend.download(row.storage_file_path)
+                    compressed = await compress_bytes(data, storage_codec)
+                    # upsert, a crashed earlier run may have left the new object behind
+                    await storage_backend.upload(new_path, compressed, content_type=storage_codec.content_type, upsert=True)
+                except Exception as e:
+                    logger.warning(f"Skipping transcript {row.id}: {e}")
+                    continue
+                await db.execute(
+                    update(Transcript)
+                    .where(Transcript.id == row.id)
+                    .values(storage_file_path=new_path, storage_encoding=storage_codec.name)
+                )
+                await db.commit()
+                await FileStorageHelper.delete_file(row.storage_file_path)
+                converted += 1
+
+            last_id = rows[-1].id
+            logger.info(f"Recompressed {converted} stored files")
+    return converted
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(backfill_storage_compression())
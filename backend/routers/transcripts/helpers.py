@@ -1,13 +1,22 @@
-import google.generativeai as genai
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import json
 import logging
-from config import GEMINI_API_KEY
 from models import TaskPriority, Team
 from .schemas import AIGeneratedTask
+from .llm_client import llm_client
+from .extraction_cache import extraction_cache, make_cache_key, CachedExtraction
+from .chunking import split_transcript
+from . import dedup
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# bump whenever the extraction prompt changes so cached results from the old prompt are not reused
+PROMPT_VERSION = "v2"
+
+extraction_flight = SingleFlight("extraction")
+
 def are_tasks_similar(task1_title: str, task2_title: str, task1_desc: str, task2_desc: str) -> bool:
     """
     Check if two tasks are similar enough to be considered duplicates
@@ -39,39 +48,39 @@ def are_tasks_similar(task1_title: str, task2_title: str, task1_desc: str, task2
 def deduplicate_tasks(tasks: List[AIGeneratedTask]) -> List[AIGeneratedTask]:
     """
     Remove duplicate or very similar tasks from the list
+    Each task is tokenized once and only candidate pairs are compared (see dedup.py)
     """
-    if len(tasks) <= 1:
-        return tasks
-    
-    unique_tasks = []
-    
-    for task in tasks:
-        is_duplicate = False
-        for existing_task in unique_tasks:
-            if are_tasks_similar(task.title, existing_task.title, task.description, existing_task.description):
-                logger.info(f"Removing duplicate task: '{task.title}' (similar to existing: '{existing_task.title}')")
-                is_duplicate = True
-                break
-        
-        if not is_duplicate:
-            unique_tasks.append(task)
-    
-    return unique_tasks
+    return dedup.deduplicate_tasks(tasks)
+
+_SUMMARY_FORMAT = (
+    '  "summary": "Your detailed meeting summary here...",\n'
+    '  "sentiment": "Your sentiment analysis summary here with classification: positive/neutral/negative"'
+)
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-flash')
-else:
-    model = None
-    logger.warning("GEMINI_API_KEY not found. AI features will not work.")
+_TASKS_FORMAT = """  "tasks": [
+    {
+      "title": "Task title here",
+      "description": "Detailed description of the task",
+      "priority": "HIGH|MEDIUM|LOW",
+      "assigned_team": "Sales|Devs|Marketing|Design|Operations|Finance|HR|General",
+      "tags": "optional, comma, separated, tags"
+    }
+  ]"""
 
-async def extract_tasks_and_summary_from_transcript(transcript_content: str, transcript_title: str) -> tuple[List[AIGeneratedTask], str, str]:
+def build_extraction_prompt(transcript_content: str, transcript_title: str, part: Optional[Tuple[int, int]] = None, tasks_first: bool = False) -> str:
     """
-    Use Gemini AI to extract actionable tasks, generate summary, and analyze sentiment from meeting transcript
-    Returns: (tasks_list, summary, sentiment)
+    Build the extraction prompt, part=(index, total) marks a chunk of a longer transcript
+    tasks_first asks for the tasks array before summary/sentiment so a streamed response yields tasks early
     """
-    if not model:
-        raise Exception("Gemini AI not configured. Please set GEMINI_API_KEY.")
+    if tasks_first:
+        response_format = "{\n" + _TASKS_FORMAT + ",\n" + _SUMMARY_FORMAT + "\n}"
+    else:
+        response_format = "{\n" + _SUMMARY_FORMAT + ",\n" + _TASKS_FORMAT + "\n}"
+    
+    part_note = ""
+    if part:
+        part_note = f"""TRANSCRIPT PART: {part[0]} of {part[1]} (an excerpt of a longer meeting that may overlap neighbouring parts; only use what appears in this part)
+"""
     
     available_teams = [team.value for team in Team]
     teams_str = ", ".join(available_teams)
@@ -81,7 +90,7 @@ async def extract_tasks_and_summary_from_transcript(transcript_content: str, tra
 You are an AI assistant that analyzes meeting transcripts to extract actionable tasks, create summaries, and analyze sentiment.
 
 MEETING TITLE: {transcript_title}
-
+{part_note}
 MEETING TRANSCRIPT:
 {transcript_content}
 
@@ -150,19 +159,7 @@ Provide a brief sentiment summary (2-3 sentences) with an overall sentiment clas
 - Descriptions are comprehensive but not repetitive
 
 Return your response in this EXACT JSON format:
-{{
-  "summary": "Your detailed meeting summary here...",
-  "sentiment": "Your sentiment analysis summary here with classification: positive/neutral/negative",
-  "tasks": [
-    {{
-      "title": "Task title here",
-      "description": "Detailed description of the task",
-      "priority": "HIGH|MEDIUM|LOW",
-      "assigned_team": "Sales|Devs|Marketing|Design|Operations|Finance|HR|General",
-      "tags": "optional, comma, separated, tags"
-    }}
-  ]
-}}
+{response_format}
 
 Make sure to:
 - Create a comprehensive but concise summary
@@ -175,51 +172,145 @@ Make sure to:
 - FINAL CHECK: Review each task and eliminate any that are similar or redundant
 - Each task must have a clearly distinct purpose and deliverable
 """
+    return prompt
+
+def fallback_review_task(transcript_title: str) -> AIGeneratedTask:
+    """Placeholder task used when the AI finds no actionable items"""
+    return AIGeneratedTask(
+        title="Review meeting transcript",
+        description=f"Review and follow up on items discussed in: {transcript_title}",
+        priority=TaskPriority.MEDIUM,
+        assigned_team=Team.GENERAL,
+        tags="review, follow-up"
+    )
+
+def _parse_json_object(response_text: str) -> Dict[str, Any]:
+    response_text = response_text.strip()
+    json_start = response_text.find('{')
+    json_end = response_text.rfind('}') + 1
+    
+    if json_start == -1 or json_end == 0:
+        raise Exception("No JSON object found in AI response")
+    
+    return json.loads(response_text[json_start:json_end])
+
+def parse_ai_task(task_data: Dict[str, Any]) -> AIGeneratedTask:
+    """Validate a single task object from the AI response, falling back to safe team/priority values"""
+    team_value = task_data.get('assigned_team', 'General')
+    if team_value not in [team.value for team in Team]:
+        team_value = 'General'
+    
+    priority_value = task_data.get('priority', 'medium').lower()
+    if priority_value not in ['high', 'medium', 'low']:
+        priority_value = 'medium'
+    
+    priority_value = priority_value.upper()
+    
+    return AIGeneratedTask(
+        title=task_data.get('title', 'Untitled Task')[:255],  # Truncate if too long
+        description=task_data.get('description', ''),
+        priority=TaskPriority(priority_value),
+        assigned_team=Team(team_value),
+        tags=task_data.get('tags', '')
+    )
 
+def parse_extraction_response(response_text: str) -> Tuple[List[AIGeneratedTask], str, str]:
+    """Parse the AI JSON response into (tasks, summary, sentiment)"""
+    result_data = _parse_json_object(response_text)
+    summary = result_data.get('summary', 'No summary generated')
+    sentiment = result_data.get('sentiment', 'No sentiment analysis available')
+    tasks_data = result_data.get('tasks', [])
+    tasks = []
+    
+    for task_data in tasks_data:
+        try:
+            tasks.append(parse_ai_task(task_data))
+        except Exception as e:
+            logger.error(f"Error processing task data: {task_data}, Error: {e}")
+            continue
+    
+    return tasks, summary, sentiment
+
+async def _run_extraction(prompt: str) -> Tuple[List[AIGeneratedTask], str, str]:
+    response_text = ""
     try:
-        response = model.generate_content(prompt)
+        response_text = await llm_client.generate(prompt)
         
-        if not response.text:
+        if not response_text:
             raise Exception("Empty response from Gemini AI")
         
-        response_text = response.text.strip()
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        
-        if json_start == -1 or json_end == 0:
-            raise Exception("No JSON object found in AI response")
+        return parse_extraction_response(response_text)
         
-        json_text = response_text[json_start:json_end]
-        result_data = json.loads(json_text)
-        summary = result_data.get('summary', 'No summary generated')
-        sentiment = result_data.get('sentiment', 'No sentiment analysis available')
-        tasks_data = result_data.get('tasks', [])
-        tasks = []
-        
-        for task_data in tasks_data:
-            try:
-                team_value = task_data.get('assigned_team', 'General')
-                if team_value not in [team.value for team in Team]:
-                    team_value = 'General'
-                
-                priority_value = task_data.get('priority', 'medium').lower()
-                if priority_value not in ['high', 'medium', 'low']:
-                    priority_value = 'medium'
-                
-                priority_value = priority_value.upper()
-                
-                task = AIGeneratedTask(
-                    title=task_data.get('title', 'Untitled Task')[:255],  # Truncate if too long
-                    description=task_data.get('description', ''),
-                    priority=TaskPriority(priority_value),
-                    assigned_team=Team(team_value),
-                    tags=task_data.get('tags', '')
-                )
-                tasks.append(task)
-                
-            except Exception as e:
-                logger.error(f"Error processing task data: {task_data}, Error: {e}")
-                continue
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error: {e}")
+        logger.error(f"AI Response: {response_text}")
+        raise Exception("Invalid JSON response from AI")
+
+async def reduce_chunk_summaries(transcript_title: str, summaries: List[str], sentiments: List[str]) -> Tuple[str, str]:
+    """Merge per-chunk summaries and sentiments into one, falling back to concatenation if the AI call fails"""
+    parts = "\n\n".join(
+        f"PART {i} SUMMARY:\n{summary}\nPART {i} SENTIMENT:\n{sentiment}"
+        for i, (summary, sentiment) in enumerate(zip(summaries, sentiments), start=1)
+    )
+    prompt = f"""
+You are an AI assistant combining partial analyses of one long meeting into a single result.
+
+MEETING TITLE: {transcript_title}
+
+{parts}
+
+Merge these into ONE concise, well-structured meeting summary (key discussion points, decisions, next steps, deadlines) without repeating points,
+and ONE brief sentiment summary (2-3 sentences) with an overall classification: "positive", "neutral", or "negative".
+
+Return your response in this EXACT JSON format:
+{{
+  "summary": "Merged meeting summary here...",
+  "sentiment": "Merged sentiment analysis here with classification: positive/neutral/negative"
+}}
+"""
+    try:
+        result_data = _parse_json_object(await llm_client.generate(prompt))
+        return result_data.get('summary', 'No summary generated'), result_data.get('sentiment', 'No sentiment analysis available')
+    except Exception as e:
+        logger.warning(f"Summary reduce step failed, concatenating chunk summaries: {e}")
+        return "\n\n".join(summaries), "\n\n".join(sentiments)
+
+async def _extract_chunked(chunks: List[str], transcript_title: str) -> Tuple[List[AIGeneratedTask], str, str]:
+    """Map: extract every chunk concurrently. Reduce: merge summaries and concatenate tasks (deduplicated by the caller)"""
+    total = len(chunks)
+    results = await asyncio.gather(
+        *[_run_extraction(build_extraction_prompt(chunk, transcript_title, part=(i, total))) for i, chunk in enumerate(chunks, start=1)],
+        return_exceptions=True
+    )
+
+    succeeded = [r for r in results if not isinstance(r, BaseException)]
+    failed = [r for r in results if isinstance(r, BaseException)]
+    if not succeeded:
+        raise failed[0]
+    if failed:
+        logger.warning(f"{len(failed)} of {total} transcript chunks failed extraction: {failed[0]}")
+
+    tasks = [task for chunk_tasks, _, _ in succeeded for task in chunk_tasks]
+    summaries = [summary for _, summary, _ in succeeded]
+    sentiments = [sentiment for _, _, sentiment in succeeded]
+
+    if len(succeeded) == 1:
+        return tasks, summaries[0], sentiments[0]
+
+    summary, sentiment = await reduce_chunk_summaries(transcript_title, summaries, sentiments)
+    return tasks, summary, sentiment
+
+async def _extract_uncached(transcript_content: str, transcript_title: str, cache_key: str) -> Tuple[List[AIGeneratedTask], str, str]:
+    if not llm_client.configured:
+        raise Exception(llm_client.provider.not_configured_message)
+
+    try:
+        chunks = split_transcript(transcript_content)
+        if len(chunks) > 1:
+            logger.info(f"Transcript '{transcript_title}' split into {len(chunks)} chunks for extraction")
+            tasks, summary, sentiment = await _extract_chunked(chunks, transcript_title)
+        else:
+            tasks, summary, sentiment = await _run_extraction(build_extraction_prompt(transcript_content, transcript_title))
         
         original_count = len(tasks)
         tasks = deduplicate_tasks(tasks)
@@ -227,27 +318,40 @@ Make sure to:
             logger.info(f"Deduplication removed {original_count - len(tasks)} duplicate tasks")
         
         if not tasks:
-            tasks.append(AIGeneratedTask(
-                title="Review meeting transcript",
-                description=f"Review and follow up on items discussed in: {transcript_title}",
-                priority=TaskPriority.MEDIUM,
-                assigned_team=Team.GENERAL,
-                tags="review, follow-up"
-            ))
+            tasks.append(fallback_review_task(transcript_title))
+        
+        await extraction_cache.set(
+            cache_key,
+            CachedExtraction(tasks=tasks, summary=summary, sentiment=sentiment),
+            model_name=llm_client.model_name,
+            prompt_version=PROMPT_VERSION
+        )
         
         logger.info(f"Successfully extracted {len(tasks)} tasks, summary, and sentiment from transcript")
         return tasks, summary, sentiment
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error: {e}")
-        logger.error(f"AI Response: {response.text}")
-        raise Exception("Invalid JSON response from AI")
     
     except Exception as e:
         logger.error(f"Error extracting tasks and summary: {e}")
         raise Exception(f"Failed to extract tasks, summary, and sentiment: {str(e)}")
 
+async def extract_tasks_and_summary_from_transcript(transcript_content: str, transcript_title: str, use_cache: bool = True) -> tuple[List[AIGeneratedTask], str, str]:
+    """
+    Use Gemini AI to extract actionable tasks, generate summary, and analyze sentiment from meeting transcript
+    Results are cached by content hash, so unchanged transcripts never hit the LLM twice,
+    and concurrent calls for the same content share one in-flight extraction
+    Long transcripts are split into overlapping chunks that are extracted in parallel and merged
+    Returns: (tasks_list, summary, sentiment)
+    """
+    cache_key = make_cache_key(transcript_content, transcript_title, PROMPT_VERSION, llm_client.model_name)
+    if use_cache:
+        cached = await extraction_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Extraction cache hit for '{transcript_title}' ({len(cached.tasks)} tasks)")
+            return list(cached.tasks), cached.summary, cached.sentiment
 
-
-
-
+    tasks, summary, sentiment = await extraction_flight.do(
+        cache_key,
+        lambda: _extract_uncached(transcript_content, transcript_title, cache_key)
+    )
+    # callers sharing one flight must not share the list object
+    return list(tasks), summary, sentiment
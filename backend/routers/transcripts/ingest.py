@@ -0,0 +1,84 @@
+import asyncio
+import codecs
+import hashlib
+from typing import AsyncIterator, List, Optional
+from fastapi import UploadFile
+from config import UPLOAD_CHUNK_SIZE, MAX_UPLOAD_BYTES
+
+
+class UploadTooLarge(Exception):
+    """The upload went over the size limit while it was being read"""
+
+
+class StreamingIngest:
+    """
+    Reads an uploaded file chunk by chunk. The size limit is enforced as bytes arrive, UTF-8 is decoded
+    incrementally (a character split across chunks is fine) and the sha256 is computed on the fly,
+    so the raw body is never held in memory as a whole.
+    """
+
+    def __init__(self, max_bytes: int = MAX_UPLOAD_BYTES, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._parts: List[str] = []
+
+    async def read(self, file: UploadFile) -> AsyncIterator[bytes]:
+        """Yield raw chunks; raises UploadTooLarge or UnicodeDecodeError as soon as a chunk is bad"""
+        while True:
+            chunk = await file.read(self.chunk_size)
+            if not chunk:
+                break
+            self.size += len(chunk)
+            if self.size > self.max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+            self._hash.update(chunk)
+            self._parts.append(self._decoder.decode(chunk))
+            yield chunk
+        self._parts.append(self._decoder.decode(b"", final=True))
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+class ChunkPipe:
+    """
+    Bounded hand-off of chunks from the request reader to a storage upload running as its own task.
+    At most `maxsize` chunks are buffered. If the consumer gives up (failed upload), put() turns into
+    a no-op so the reader can still finish the request.
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._abandoned = False
+
+    async def put(self, chunk: bytes) -> None:
+        if not self._abandoned:
+            await self._queue.put(chunk)
+
+    async def close(self) -> None:
+        if not self._abandoned:
+            await self._queue.put(None)
+
+    def abandon(self) -> None:
+        self._abandoned = True
+        # free the space a blocked put() is waiting for
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk: Optional[bytes] = await self._queue.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.abandon()
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+from sqlalchemy import select, and_, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import config
+from config import (
+    JOB_WORKER_CONCURRENCY,
+    JOB_POLL_INTERVAL_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_STALE_AFTER_SECONDS,
+    JOB_WORKER_ENABLED,
+    EXTRACTION_PREFETCH,
+)
+from models import Transcript, ProcessingJob, JobStatus, ProcessingStatus
+from .helpers import extract_tasks_and_summary_from_transcript
+from .persistence import persist_extraction_result
+from .llm_client import llm_client
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_TASKS_JOB = "extract_tasks"
+
+# references to running prefetches so they are not garbage collected mid-flight
+_prefetches: Set[asyncio.Task] = set()
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff between attempts of the same job (10s, 20s, 40s ... capped at 5 min)"""
+    return timedelta(seconds=min(10 * 2 ** max(attempts - 1, 0), 300))
+
+async def enqueue_extraction_job(db: AsyncSession, transcript: Transcript) -> ProcessingJob:
+    """
+    Queue AI extraction for a transcript. The caller owns the transaction, so the job
+    becomes visible to workers in the same commit as the transcript row.
+    """
+    transcript.processing_status = ProcessingStatus.QUEUED
+    transcript.processing_progress = 0
+    transcript.processing_error = None
+
+    job = ProcessingJob(
+        transcript_id=transcript.id,
+        kind=EXTRACT_TASKS_JOB,
+        status=JobStatus.QUEUED,
+        max_attempts=JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+async def _prefetch(transcript_content: str, transcript_title: str) -> None:
+    try:
+        await extract_tasks_and_summary_from_transcript(transcript_content, transcript_title)
+    except Exception as e:
+        # the job runs its own extraction and retries, nothing to report here
+        logger.warning(f"Extraction prefetch failed: {e}")
+
+def prefetch_extraction(transcript_content: str, transcript_title: str) -> None:
+    """
+    Start extraction for a transcript that is about to be queued, overlapping the LLM call with the
+    insert and storage upload. The in-process worker joins the in-flight extraction (single-flight)
+    or reads the cached result, so the LLM is still called once. Skipped when jobs run elsewhere.
+    """
+    if not (EXTRACTION_PREFETCH and JOB_WORKER_ENABLED and llm_client.configured):
+        return
+    task = asyncio.create_task(_prefetch(transcript_content, transcript_title))
+    _prefetches.add(task)
+    task.add_done_callback(_prefetches.discard)
+
+async def get_latest_job(db: AsyncSession, transcript_id: int) -> Optional[ProcessingJob]:
+    """Most recent processing job for a transcript"""
+    result = await db.execute(
+        select(ProcessingJob)
+        .where(ProcessingJob.transcript_id == transcript_id)
+        .order_by(ProcessingJob.created_at.desc(), ProcessingJob.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+async def _fail_abandoned_jobs(db: AsyncSession, now: datetime, stale_before: datetime) -> None:
+    """
+    Stale RUNNING jobs without attempts left are never claimed again: their worker died (or crashed while
+    failing them) on the last attempt, so mark them and their transcripts FAILED instead of retrying forever.
+    """
+    result = await db.execute(
+        update(ProcessingJob)
+        .where(
+            ProcessingJob.status == JobStatus.RUNNING,
+            ProcessingJob.locked_at < stale_before,
+            ProcessingJob.attempts >= ProcessingJob.max_attempts,
+        )
+        .values(status=JobStatus.FAILED, locked_at=None, finished_at=now, error="Worker stopped responding on the last attempt")
+        .returning(ProcessingJob.id, ProcessingJob.transcript_id)
+        .execution_options(synchronize_session=False)
+    )
+    abandoned = result.all()
+    if not abandoned:
+        return
+
+    await db.execute(
+        update(Transcript)
+        .where(Transcript.id.in_([transcript_id for _, transcript_id in abandoned]))
+        .values(processing_status=ProcessingStatus.FAILED, processing_error="Worker stopped responding on the last attempt")
+    )
+    await db.commit()
+    for job_id, transcript_id in abandoned:
+        logger.error(f"Job {job_id} failed permanently for transcript {transcript_id}: worker stopped responding")
+
+async def claim_next_job(db: AsyncSession) -> Optional[ProcessingJob]:
+    """
+    Lock and mark the oldest runnable job as RUNNING.
+    SKIP LOCKED lets several workers (or Lambda invocations) poll the same table safely.
+    Jobs stuck in RUNNING longer than JOB_STALE_AFTER_SECONDS are picked up again while they have attempts left.
+    """
+    now = _utcnow()
+    stale_before = now - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+    await _fail_abandoned_jobs(db, now, stale_before)
+
+    result = await db.execute(
+        select(ProcessingJob)
+        .where(
+            or_(
+                and_(ProcessingJob.status == JobStatus.QUEUED, ProcessingJob.run_after <= now),
+                and_(
+                    ProcessingJob.status == JobStatus.RUNNING,
+                    ProcessingJob.locked_at < stale_before,
+                    ProcessingJob.attempts < ProcessingJob.max_attempts,
+                ),
+            )
+        )
+        .order_by(ProcessingJob.run_after, ProcessingJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        return None
+
+    job.status = JobStatus.RUNNING
+    job.locked_at = now
+    job.attempts += 1
+    job.progress = 0
+    await db.execute(
+        update(Transcript)
+        .where(Transcript.id == job.transcript_id)
+        .values(processing_status=ProcessingStatus.PROCESSING, processing_progress=0, processing_error=None)
+    )
+    await db.commit()
+    return job
+
+async def _set_progress(db: AsyncSession, job: ProcessingJob, progress: int) -> None:
+    job.progress = progress
+    await db.execute(
+        update(Transcript)
+        .where(Transcript.id == job.transcript_id)
+        .values(processing_progress=progress)
+    )
+    await db.commit()
+
+async def run_extraction_job(db: AsyncSession, job: ProcessingJob) -> None:
+    """Run AI extraction for a claimed job and store tasks, summary and sentiment"""
+    result = await db.execute(select(Transcript).where(Transcript.id == job.transcript_id))
+    transcript = result.scalar_one_or_none()
+    if not transcript:
+        raise Exception(f"Transcript {job.transcript_id} no longer exists")
+
+    await _set_progress(db, job, 10)
+
+    ai_tasks, summary, sentiment = await extract_tasks_and_summary_from_transcript(
+        transcript.content,
+        transcript.title
+    )
+
+    await _set_progress(db, job, 80)
+
+    # reprocessing a transcript merges into its existing tasks instead of duplicating them
+    persisted = await persist_extraction_result(db, transcript, ai_tasks, summary, sentiment)
+
+    transcript.processing_status = ProcessingStatus.COMPLETED
+    transcript.processing_progress = 100
+    job.status = JobStatus.SUCCEEDED
+    job.progress = 100
+    job.error = None
+    job.finished_at = _utcnow()
+    await db.commit()
+
+    logger.info(f"Job {job.id}: processed transcript {transcript.id}, {persisted.created} tasks created, {persisted.merged} merged in {persisted.elapsed_ms} ms")
+
+async def _fail_job(db: AsyncSession, job: ProcessingJob, error: Exception) -> None:
+    """Requeue with backoff, or mark the job and its transcript as FAILED once attempts run out"""
+    # rollback expires the job, and reloading an expired attribute would need IO outside the async session
+    job_id = job.id
+    await db.rollback()
+    job = await db.get(ProcessingJob, job_id)
+    if not job:
+        return
+
+    job.error = str(error)
+    job.locked_at = None
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED
+        job.run_after = _utcnow() + _retry_delay(job.attempts)
+        transcript_values = dict(processing_status=ProcessingStatus.QUEUED, processing_error=str(error))
+        logger.warning(f"Job {job.id} attempt {job.attempts}/{job.max_attempts} failed, retrying: {error}")
+    else:
+        job.status = JobStatus.FAILED
+        job.finished_at = _utcnow()
+        transcript_values = dict(processing_status=ProcessingStatus.FAILED, processing_error=str(error))
+        logger.error(f"Job {job.id} failed permanently for transcript {job.transcript_id}: {error}")
+
+    await db.execute(
+        update(Transcript)
+        .where(Transcript.id == job.transcript_id)
+        .values(**transcript_values)
+    )
+    await db.commit()
+
+async def process_next_job() -> bool:
+    """Claim and run a single job. Returns False when the queue is empty."""
+    async with config.AsyncSessionLocal() as db:
+        job = await claim_next_job(db)
+        if not job:
+            return False
+
+        try:
+            if job.kind == EXTRACT_TASKS_JOB:
+                await run_extraction_job(db, job)
+            else:
+                raise Exception(f"Unknown job kind: {job.kind}")
+        except Exception as e:
+            await _fail_job(db, job, e)
+        return True
+
+
+class JobWorker:
+    """
+    Polls the processing_jobs table and runs jobs with bounded concurrency.
+    wake() lets the API skip the poll interval right after it enqueues a job.
+    """
+
+    def __init__(self, concurrency: int = JOB_WORKER_CONCURRENCY, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self._wake_event = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        self._loops: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._loops)
+
+    def wake(self) -> None:
+        self._wake_event.set()
+
+    async def _loop(self, loop_id: int) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if await process_next_job():
+                    continue
+            except Exception as e:
+                logger.error(f"Job worker loop {loop_id} error: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if config.AsyncSessionLocal is None:
+            logger.warning("Database not configured, job worker not started")
+            return
+        self._stop_event.clear()
+        for loop_id in range(self.concurrency):
+            self._loops.add(asyncio.create_task(self._loop(loop_id)))
+        logger.info(f"Job worker started with concurrency {self.concurrency}")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._loops:
+            await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops.clear()
+        logger.info("Job worker stopped")
+
+    async def run_forever(self) -> None:
+        """Run as a standalone worker process (see worker.py)"""
+        self.start()
+        if self._loops:
+            await asyncio.gather(*self._loops)
+
+
+job_worker = JobWorker()
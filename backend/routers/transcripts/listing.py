@@ -0,0 +1,117 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from models import Transcript, Task, TaskStatus
+from routers.pagination import keyset_page, newest_first, split_page
+from config import TRANSCRIPT_PREVIEW_CHARS
+from .schemas import TranscriptListItem
+
+# columns every list row loads; content is never one of them
+LIST_COLUMNS = (
+    Transcript.id,
+    Transcript.title,
+    Transcript.sentiment,
+    Transcript.file_size,
+    Transcript.processing_status,
+    Transcript.created_by_id,
+    Transcript.created_at,
+    Transcript.updated_at,
+)
+
+# what callers can add to list rows with fields=
+EXTRA_FIELDS = {
+    "content": Transcript.content,
+    "summary": Transcript.summary,
+    "sentiment": Transcript.sentiment,
+    "original_filename": Transcript.original_filename,
+    "storage_file_path": Transcript.storage_file_path,
+    "file_sha256": Transcript.file_sha256,
+    "processing_progress": Transcript.processing_progress,
+}
+
+_SENTIMENT_LABEL = re.compile(r"\b(positive|neutral|negative|mixed)\b", re.IGNORECASE)
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Parse a comma-separated fields= value, raising ValueError for unknown names"""
+    if not fields:
+        return []
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXTRA_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(EXTRA_FIELDS)}")
+    return list(dict.fromkeys(names))
+
+def sentiment_label(sentiment: Optional[str]) -> Optional[str]:
+    """The classification the model ends its sentiment analysis with: positive, neutral, negative or mixed"""
+    if not sentiment:
+        return None
+    labels = _SENTIMENT_LABEL.findall(sentiment)
+    return labels[-1].lower() if labels else None
+
+async def task_counts(db: AsyncSession, transcript_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """(total, completed) tasks per transcript, one grouped query for the whole page"""
+    if not transcript_ids:
+        return {}
+    result = await db.execute(
+        select(
+            Task.transcript_id,
+            func.count(Task.id),
+            func.count(Task.id).filter(Task.status == TaskStatus.COMPLETED),
+        )
+        .where(Task.transcript_id.in_(transcript_ids))
+        .group_by(Task.transcript_id)
+    )
+    return {transcript_id: (total, completed) for transcript_id, total, completed in result.all()}
+
+async def list_transcripts(
+    db: AsyncSession,
+    limit: int,
+    fields: List[str],
+    skip: int = 0,
+    cursor: Optional[str] = None
+) -> Tuple[List[TranscriptListItem], Optional[str]]:
+    """
+    Newest transcripts as list rows, with the cursor of the next page. A cursor (empty for the first page)
+    selects keyset pagination, otherwise skip is used. Only the list columns (plus requested fields) are
+    selected: the summary preview is a substr() and the size an octet_length(), neither of which reads the
+    whole TOASTed value, so latency and payload don't grow with transcript length.
+    Raises InvalidCursor for a malformed cursor.
+    """
+    summary_preview = func.substr(Transcript.summary, 1, TRANSCRIPT_PREVIEW_CHARS).label("summary_preview")
+    content_bytes = func.octet_length(Transcript.content).label("content_bytes")
+    query = (
+        select(Transcript, summary_preview, content_bytes)
+        .options(load_only(*LIST_COLUMNS, *(EXTRA_FIELDS[name] for name in fields), raiseload=True))
+    )
+    if cursor is not None:
+        query = keyset_page(query, Transcript, cursor, limit)
+    else:
+        query = newest_first(query, Transcript).offset(skip).limit(limit + 1)
+    result = await db.execute(query)
+    rows, next_cursor = split_page(result.all(), limit, lambda row: row.Transcript)
+    counts = await task_counts(db, [transcript.id for transcript, _, _ in rows])
+
+    items = []
+    for transcript, preview, size in rows:
+        total, completed = counts.get(transcript.id, (0, 0))
+        data = {
+            "id": transcript.id,
+            "title": transcript.title,
+            "summary_preview": preview,
+            "sentiment_label": sentiment_label(transcript.sentiment),
+            "task_count": total,
+            "completed_task_count": completed,
+            "file_size": transcript.file_size,
+            "content_bytes": size or 0,
+            "processing_status": transcript.processing_status,
+            "created_by_id": transcript.created_by_id,
+            "created_at": transcript.created_at,
+            "updated_at": transcript.updated_at,
+        }
+        for name in fields:
+            data[name] = getattr(transcript, name)
+        items.append(TranscriptListItem(**data))
+    return items, next_cursor
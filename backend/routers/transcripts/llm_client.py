@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional
+from config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_EXECUTOR_WORKERS,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_OUTPUT_TOKENS_ESTIMATE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+)
+from .llm_providers import LLMProvider, create_llm_provider
+from .scheduler import LLMScheduler, backoff_delay, estimate_tokens, is_rate_limited, is_retryable
+
+logger = logging.getLogger(__name__)
+
+class AsyncLLMClient:
+    """
+    Runs the blocking provider calls on a dedicated thread pool so the event loop
+    keeps serving other requests. Every call is admitted by the LLMScheduler (concurrency cap,
+    RPM/TPM budgets, priority lanes) and retried with jittered backoff on 429 and 5xx.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        executor_workers: int = LLM_EXECUTOR_WORKERS,
+        scheduler: Optional[LLMScheduler] = None
+    ):
+        self.provider = provider
+        self.scheduler = scheduler or LLMScheduler(max_concurrency, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+        self.max_concurrency = self.scheduler.max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(executor_workers, self.max_concurrency),
+            thread_name_prefix="llm"
+        )
+        self._total_requests = 0
+        self._total_failures = 0
+        self._total_retries = 0
+        self._total_latency = 0.0
+        self._completed = 0
+
+    @property
+    def configured(self) -> bool:
+        return self.provider.configured
+
+    @property
+    def model_name(self) -> str:
+        """Part of extraction cache keys, so results of different backends never mix"""
+        return self.provider.model_name
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting to be admitted by the scheduler"""
+        return self.scheduler.queue_depth
+
+    async def _acquire_slot(self, estimated_tokens: int) -> None:
+        if not self.provider.configured:
+            raise Exception(self.provider.not_configured_message)
+        await self.scheduler.acquire(estimated_tokens)
+
+    async def _backoff(self, attempt: int, error: Exception) -> None:
+        self._total_retries += 1
+        if is_rate_limited(error):
+            self.scheduler.rate_limit_hit()
+        delay = backoff_delay(attempt, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS)
+        logger.warning(f"LLM call failed ({error}), retry {attempt + 1}/{LLM_MAX_RETRIES} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    async def generate(self, prompt: str) -> str:
+        """Generate a completion for the prompt without blocking the event loop"""
+        estimated = estimate_tokens(prompt) + LLM_OUTPUT_TOKENS_ESTIMATE
+        self._total_requests += 1
+        attempt = 0
+        while True:
+            await self._acquire_slot(estimated)
+            started = time.perf_counter()
+            text = None
+            try:
+                loop = asyncio.get_running_loop()
+                text = await loop.run_in_executor(self._executor, self.provider.generate, prompt)
+                return text
+            except Exception as e:
+                if attempt >= LLM_MAX_RETRIES or not is_retryable(e):
+                    self._total_failures += 1
+                    raise
+                error = e
+            finally:
+                self._total_latency += time.perf_counter() - started
+                self._completed += 1
+                actual = estimate_tokens(prompt) + estimate_tokens(text) if text is not None else None
+                self.scheduler.release(actual, estimated)
+            # the slot is released while backing off so other calls keep flowing
+            await self._backoff(attempt, error)
+            attempt += 1
+
+    def _stream_sync(self, prompt: str, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, cancelled: threading.Event) -> None:
+        """Iterate the provider's streamed response on the executor thread, handing text pieces to the event loop"""
+        try:
+            for text in self.provider.stream(prompt):
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, text)
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream completion text as the model produces it, under the same scheduler as generate().
+        Failures are retried only until the first piece of text has been yielded.
+        """
+        estimated = estimate_tokens(prompt) + LLM_OUTPUT_TOKENS_ESTIMATE
+        self._total_requests += 1
+        attempt = 0
+        while True:
+            await self._acquire_slot(estimated)
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue()
+            cancelled = threading.Event()
+            future = loop.run_in_executor(self._executor, self._stream_sync, prompt, loop, queue, cancelled)
+            produced = 0
+            error = None
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        if produced or attempt >= LLM_MAX_RETRIES or not is_retryable(item):
+                            self._total_failures += 1
+                            raise item
+                        error = item
+                        break
+                    produced += len(item)
+                    yield item
+            finally:
+                # stop the producer thread if the consumer went away (e.g. client disconnected)
+                cancelled.set()
+                self._total_latency += time.perf_counter() - started
+                self._completed += 1
+                actual = estimate_tokens(prompt) + produced // 4 if error is None else None
+                self.scheduler.release(actual, estimated)
+                future.add_done_callback(lambda f: f.exception())
+            if error is None:
+                return
+            await self._backoff(attempt, error)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider.name,
+            "model": self.model_name,
+            "configured": self.configured,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.scheduler.in_flight,
+            "queue_depth": self.scheduler.queue_depth,
+            "total_requests": self._total_requests,
+            "total_failures": self._total_failures,
+            "total_retries": self._total_retries,
+            "avg_latency_ms": round(self._total_latency / self._completed * 1000, 2) if self._completed > 0 else 0.0,
+            "scheduler": self.scheduler.stats(),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+llm_client = AsyncLLMClient(create_llm_provider())
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import random
+import time
+from typing import Iterator, List
+from config import (
+    GEMINI_API_KEY,
+    LLM_PROVIDER,
+    LLM_STUB_LATENCY_MS,
+    LLM_STUB_TASK_COUNT,
+    LLM_STUB_DESCRIPTION_CHARS,
+    LLM_STUB_STREAM_CHUNK_CHARS,
+)
+
+logger = logging.getLogger(__name__)
+
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+
+class LLMProvider:
+    """
+    Interface for LLM backends. Calls are blocking, AsyncLLMClient runs them on its thread pool
+    and handles scheduling and retries.
+    """
+
+    name = "base"
+    model_name = "base"
+
+    @property
+    def configured(self) -> bool:
+        return True
+
+    @property
+    def not_configured_message(self) -> str:
+        return f"LLM provider {self.name} is not configured"
+
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through the google-generativeai SDK"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str = GEMINI_API_KEY, model_name: str = GEMINI_MODEL_NAME):
+        self.model_name = model_name
+        if api_key:
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            self._model = genai.GenerativeModel(model_name)
+        else:
+            self._model = None
+            logger.warning("GEMINI_API_KEY not found. AI features will not work.")
+
+    @property
+    def configured(self) -> bool:
+        return self._model is not None
+
+    @property
+    def not_configured_message(self) -> str:
+        return "Gemini AI not configured. Please set GEMINI_API_KEY."
+
+    def generate(self, prompt: str) -> str:
+        response = self._model.generate_content(prompt)
+        return response.text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self._model.generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                # chunks without text parts (e.g. safety metadata only)
+                continue
+            if text:
+                yield text
+
+
+_STUB_VERBS = ["Follow up on", "Prepare", "Review", "Draft", "Schedule", "Update", "Fix", "Share", "Estimate", "Finalize"]
+_STUB_SUBJECTS = [
+    "pricing proposal", "release checklist", "onboarding flow", "Q3 budget", "customer feedback report",
+    "landing page copy", "API rate limits", "hiring plan", "design mockups", "vendor contract",
+    "analytics dashboard", "support backlog", "security review", "campaign brief", "invoice process",
+]
+_STUB_TEAMS = ["Sales", "Devs", "Marketing", "Design", "Operations", "Finance", "HR", "General"]
+_STUB_PRIORITIES = ["HIGH", "MEDIUM", "LOW"]
+_STUB_SENTIMENTS = ["positive", "neutral", "negative"]
+_STUB_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ba", "de", "fi", "go", "hu", "ja", "pe", "zo"]
+
+# words of one task are never reused by another task of the same response, so stub tasks don't collapse
+# into one when they are deduplicated
+_STUB_WORDS_PER_TASK = 4096
+
+def _stub_word(number: int) -> str:
+    syllables = []
+    for _ in range(3):
+        number, digit = divmod(number, len(_STUB_SYLLABLES))
+        syllables.append(_STUB_SYLLABLES[digit])
+    while number:
+        number, digit = divmod(number, len(_STUB_SYLLABLES))
+        syllables.append(_STUB_SYLLABLES[digit])
+    return "".join(syllables)
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic offline backend for local development and load tests. The response is derived from
+    a hash of the prompt, so the same prompt always gives the same tasks, summary and sentiment.
+    Latency, number of tasks and description length are configurable; no network or quota is used.
+    Every task has words of its own, so all task_count tasks survive deduplication.
+    """
+
+    name = "stub"
+    model_name = "stub"
+
+    def __init__(
+        self,
+        latency_ms: int = LLM_STUB_LATENCY_MS,
+        task_count: int = LLM_STUB_TASK_COUNT,
+        description_chars: int = LLM_STUB_DESCRIPTION_CHARS,
+        stream_chunk_chars: int = LLM_STUB_STREAM_CHUNK_CHARS
+    ):
+        self.latency = max(latency_ms, 0) / 1000
+        self.task_count = max(task_count, 0)
+        self.description_chars = max(description_chars, 1)
+        self.stream_chunk_chars = max(stream_chunk_chars, 1)
+
+    def _description(self, first_word: int) -> str:
+        """Whole words only, a word cut in half could be the same fragment in every task"""
+        words = []
+        length = -1
+        while True:
+            word = _stub_word(first_word + len(words) % _STUB_WORDS_PER_TASK)
+            if len(words) % 8 == 0:
+                word = word.capitalize()
+            if len(words) % 8 == 7:
+                word += "."
+            if words and length + 1 + len(word) > self.description_chars:
+                return " ".join(words)
+            words.append(word)
+            length += 1 + len(word)
+
+    def respond(self, prompt: str) -> str:
+        """The response text for a prompt, without any simulated latency"""
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        sentiment = rng.choice(_STUB_SENTIMENTS)
+        summary = (
+            f"Stub summary of a {len(prompt)} character prompt. "
+            f"The meeting covered {rng.choice(_STUB_SUBJECTS)} and {rng.choice(_STUB_SUBJECTS)}."
+        )
+        fields = {
+            "summary": summary,
+            "sentiment": f"Overall the meeting was {sentiment}. Classification: {sentiment}",
+        }
+
+        # extraction prompts ask for a tasks array, the chunk reduce prompt only for summary and sentiment
+        tasks_at = prompt.find('"tasks"')
+        if tasks_at == -1:
+            return json.dumps(fields, indent=2)
+
+        tasks: List[dict] = []
+        first_task = rng.randrange(1 << 12)
+        # verb and subject rotate, no two of the first 150 titles share both
+        for index in range(self.task_count):
+            verb = _STUB_VERBS[(first_task + index) % len(_STUB_VERBS)]
+            subject = _STUB_SUBJECTS[(first_task + index // len(_STUB_VERBS)) % len(_STUB_SUBJECTS)]
+            first_word = (first_task + index) * _STUB_WORDS_PER_TASK
+            account = " ".join(_stub_word(first_word + offset).capitalize() for offset in range(3))
+            tasks.append({
+                "title": f"{verb} {subject} for {account}",
+                "description": self._description(first_word),
+                "priority": rng.choice(_STUB_PRIORITIES),
+                "assigned_team": rng.choice(_STUB_TEAMS),
+                "tags": f"{subject.split()[0].lower()}, stub",
+            })
+
+        # keep the key order the prompt asked for, streaming clients rely on tasks coming first
+        if tasks_at < prompt.find('"summary"'):
+            return json.dumps({"tasks": tasks, **fields}, indent=2)
+        return json.dumps({**fields, "tasks": tasks}, indent=2)
+
+    def generate(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        return self.respond(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        text = self.respond(prompt)
+        pieces = [text[i:i + self.stream_chunk_chars] for i in range(0, len(text), self.stream_chunk_chars)]
+        # spread the configured latency over the pieces, like a model producing output gradually
+        delay = self.latency / max(len(pieces), 1)
+        for piece in pieces:
+            time.sleep(delay)
+            yield piece
+
+
+def create_llm_provider(provider: str = LLM_PROVIDER) -> LLMProvider:
+    provider = provider.lower()
+    if provider == "gemini":
+        return GeminiProvider()
+    if provider == "stub":
+        logger.warning("Using the stub LLM provider, AI results are synthetic")
+        return StubProvider()
+    raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
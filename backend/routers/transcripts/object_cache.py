@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from config import (
+    STORAGE_CACHE_MEMORY_BYTES,
+    STORAGE_CACHE_DISK_DIR,
+    STORAGE_CACHE_DISK_BYTES,
+    STORAGE_CACHE_MAX_OBJECT_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# what get() returns: bytes from memory or a read-only mmap of the spilled file, both sliceable
+CachedObject = Union[bytes, mmap.mmap]
+
+
+def release_cached(cached: CachedObject) -> None:
+    """Close the mapping of a disk hit once it has been served, memory hits need nothing"""
+    if isinstance(cached, mmap.mmap):
+        cached.close()
+
+
+class ObjectCacheCounters:
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups > 0 else 0.0,
+            "evictions": self.evictions,
+            "spills": self.spills,
+            "invalidations": self.invalidations,
+        }
+
+
+class StorageObjectCache:
+    """
+    Read-through LRU cache of storage objects keyed by storage_file_path, bounded by bytes rather than entries.
+    Objects evicted from memory spill to a local directory (when configured) and are read back through mmap,
+    so hot files are served from memory or the page cache instead of object storage. Per process.
+    """
+
+    def __init__(
+        self,
+        memory_budget: int = STORAGE_CACHE_MEMORY_BYTES,
+        disk_dir: str = STORAGE_CACHE_DISK_DIR,
+        disk_budget: int = STORAGE_CACHE_DISK_BYTES,
+        max_object_bytes: int = STORAGE_CACHE_MAX_OBJECT_BYTES
+    ):
+        self.memory_budget = max(memory_budget, 0)
+        self.disk_budget = max(disk_budget, 0) if disk_dir else 0
+        self.max_object_bytes = max_object_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self.counters = ObjectCacheCounters()
+
+        self._disk_dir: Optional[str] = None
+        if self.disk_budget > 0:
+            # one directory per process, the index of what's in it lives in this process only
+            self._disk_dir = os.path.join(disk_dir, f"objects-{os.getpid()}")
+            shutil.rmtree(self._disk_dir, ignore_errors=True)
+            os.makedirs(self._disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_budget > 0 or self.disk_budget > 0
+
+    def accepts(self, size: Optional[int]) -> bool:
+        """Whether an object of this size would be cached, callers skip buffering otherwise"""
+        return self.enabled and size is not None and 0 < size <= min(self.max_object_bytes, max(self.memory_budget, self.disk_budget))
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self._disk_dir, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _read_disk(self, key: str) -> Optional[mmap.mmap]:
+        path, _ = self._disk[key]
+        try:
+            with open(path, "rb") as f:
+                # the mapping stays valid after the file is closed, or even unlinked by a later eviction;
+                # the caller closes it with release_cached
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache file for {key}: {e}")
+            self._drop_disk(key)
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        path = self._disk_file(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self._disk_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _drop_disk(self, key: str) -> None:
+        entry = self._disk.pop(key, None)
+        if entry is None:
+            return
+        path, size = entry
+        self._disk_bytes -= size
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    async def _spill(self, key: str, data: bytes) -> None:
+        if self._disk_dir is None or len(data) > self.disk_budget:
+            self.counters.evictions += 1
+            return
+        while self._disk and self._disk_bytes + len(data) > self.disk_budget:
+            oldest, _ = next(iter(self._disk.items()))
+            self._drop_disk(oldest)
+            self.counters.evictions += 1
+        try:
+            await asyncio.to_thread(self._write_disk, key, data)
+        except OSError as e:
+            logger.warning(f"Failed to spill {key} to the disk cache: {e}")
+            self.counters.evictions += 1
+            return
+        self._disk[key] = (self._disk_file(key), len(data))
+        self._disk_bytes += len(data)
+        self.counters.spills += 1
+
+    async def get(self, key: str) -> Optional[CachedObject]:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.counters.memory_hits += 1
+            return data
+        if key in self._disk:
+            mapped = self._read_disk(key)
+            if mapped is not None:
+                self._disk.move_to_end(key)
+                self.counters.disk_hits += 1
+                return mapped
+        self.counters.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes) -> None:
+        if not self.accepts(len(data)):
+            return
+        self._drop_memory(key)
+        self._drop_disk(key)
+
+        if len(data) > self.memory_budget:
+            await self._spill(key, data)
+            return
+
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_budget:
+            oldest, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            await self._spill(oldest, evicted)
+
+    def _drop_memory(self, key: str) -> None:
+        data = self._memory.pop(key, None)
+        if data is not None:
+            self._memory_bytes -= len(data)
+
+    async def fill(self, key: str, chunks: AsyncIterator[bytes], expected_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Pass a storage stream through, caching the object once it has been read completely"""
+        parts: Optional[List[bytes]] = []
+        received = 0
+        async for chunk in chunks:
+            received += len(chunk)
+            # don't keep buffering an object that turned out to be too big to cache
+            if parts is not None:
+                parts.append(chunk)
+                if received > self.max_object_bytes:
+                    parts = None
+            yield chunk
+        if parts is not None and (expected_size is None or received == expected_size):
+            await self.put(key, b"".join(parts))
+
+    def invalidate(self, key: str) -> None:
+        """Forget an object that was deleted or overwritten in storage"""
+        if key in self._memory or key in self._disk:
+            self.counters.invalidations += 1
+        self._drop_memory(key)
+        self._drop_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_budget": self.memory_budget,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "disk_budget": self.disk_budget,
+            **self.counters.as_dict(),
+        }
+
+
+object_cache = StorageObjectCache()
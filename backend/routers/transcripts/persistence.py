@@ -0,0 +1,164 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import config
+from models import Task, TaskStatus, Transcript
+from .dedup import compute_signature
+from .helpers import extract_tasks_and_summary_from_transcript
+from .singleflight import SingleFlight
+from .schemas import AIGeneratedTask
+from .task_index import (
+    SCOPE_TRANSCRIPT,
+    find_existing_matches,
+    index_signatures,
+    merge_into_existing,
+    reindex_task,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTION_CREATED = "created"
+ACTION_MERGED = "merged"
+ACTION_SKIPPED = "skipped"
+
+generation_flight = SingleFlight("generate-tasks")
+
+
+@dataclass
+class TaskMatch:
+    ai_task: AIGeneratedTask
+    action: str
+    task_id: Optional[int] = None
+    transcript_id: Optional[int] = None
+
+
+@dataclass
+class PersistResult:
+    matches: List[TaskMatch] = field(default_factory=list)
+    rows_inserted: int = 0
+    rows_updated: int = 0
+    elapsed_ms: float = 0.0
+
+    def count(self, action: str) -> int:
+        return sum(1 for match in self.matches if match.action == action)
+
+    @property
+    def created(self) -> int:
+        return self.count(ACTION_CREATED)
+
+    @property
+    def merged(self) -> int:
+        return self.count(ACTION_MERGED)
+
+    @property
+    def skipped(self) -> int:
+        return self.count(ACTION_SKIPPED)
+
+
+async def persist_extraction_result(
+    db: AsyncSession,
+    transcript: Transcript,
+    ai_tasks: Sequence[AIGeneratedTask],
+    summary: str,
+    sentiment: str,
+    scope: str = SCOPE_TRANSCRIPT
+) -> PersistResult:
+    """
+    Write an extraction result for a transcript: summary and sentiment, new tasks through one
+    multi-row INSERT ... RETURNING, their signature bands through one more INSERT, and merges
+    into matching existing tasks. Everything stays in the caller's transaction; the caller commits.
+    """
+    started = time.perf_counter()
+    result = PersistResult()
+
+    # written by the final flush together with any other pending transcript changes
+    transcript.summary = summary
+    transcript.sentiment = sentiment
+    result.rows_updated += 1
+
+    signatures = [compute_signature(task.title, task.description) for task in ai_tasks]
+    existing_matches = await find_existing_matches(db, transcript.id, signatures, scope)
+
+    new_rows = []
+    new_positions = []
+    for position, (ai_task, existing) in enumerate(zip(ai_tasks, existing_matches)):
+        if existing is None:
+            new_rows.append({
+                "title": ai_task.title,
+                "description": ai_task.description,
+                "status": TaskStatus.PENDING,
+                "priority": ai_task.priority,
+                "assigned_team": ai_task.assigned_team,
+                "tags": ai_task.tags,
+                "transcript_id": transcript.id,
+            })
+            new_positions.append(position)
+            result.matches.append(TaskMatch(ai_task, ACTION_CREATED, transcript_id=transcript.id))
+        elif merge_into_existing(existing, ai_task):
+            await reindex_task(db, existing)
+            result.rows_updated += 1
+            result.matches.append(TaskMatch(ai_task, ACTION_MERGED, existing.id, existing.transcript_id))
+        else:
+            result.matches.append(TaskMatch(ai_task, ACTION_SKIPPED, existing.id, existing.transcript_id))
+
+    indexed = []
+    if new_rows:
+        # executemany through insertmanyvalues: one INSERT ... VALUES (...), (...) RETURNING per 1000 rows,
+        # with ids guaranteed to come back in parameter order
+        inserted = await db.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            new_rows
+        )
+        for position, task_id in zip(new_positions, inserted.scalars().all()):
+            result.matches[position].task_id = task_id
+            indexed.append((task_id, transcript.id, signatures[position]))
+    result.rows_inserted = len(new_rows)
+
+    await index_signatures(db, indexed)
+    # transcript fields and merged tasks were changed through the ORM, flush them in the same transaction
+    await db.flush()
+
+    result.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(
+        f"Persisted extraction for transcript {transcript.id}: {result.created} created, {result.merged} merged, "
+        f"{result.skipped} skipped, {result.rows_inserted} rows inserted in {result.elapsed_ms} ms"
+    )
+    return result
+
+
+async def _regenerate(transcript_id: int, scope: str, use_cache: bool) -> Tuple[List[AIGeneratedTask], PersistResult]:
+    # own session: the work outlives whichever request started it
+    async with config.AsyncSessionLocal() as db:
+        result = await db.execute(select(Transcript).where(Transcript.id == transcript_id))
+        transcript = result.scalar_one_or_none()
+        if not transcript:
+            raise LookupError(f"Transcript {transcript_id} not found")
+
+        try:
+            ai_tasks, summary, sentiment = await extract_tasks_and_summary_from_transcript(
+                transcript.content,
+                transcript.title,
+                use_cache=use_cache
+            )
+            persisted = await persist_extraction_result(db, transcript, ai_tasks, summary, sentiment, scope)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return ai_tasks, persisted
+
+async def regenerate_transcript_tasks(
+    transcript_id: int,
+    content_hash: str,
+    scope: str = SCOPE_TRANSCRIPT,
+    use_cache: bool = True
+) -> Tuple[List[AIGeneratedTask], PersistResult]:
+    """
+    Extract and persist tasks for a transcript. Identical concurrent requests (double clicks,
+    frontend retries) for the same transcript and content share one extraction and one write.
+    """
+    key = (transcript_id, content_hash, scope, use_cache)
+    return await generation_flight.do(key, lambda: _regenerate(transcript_id, scope, use_cache))
@@ -0,0 +1,214 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+_LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+# lane for LLM calls made from the current task, batch work opts in with llm_priority(PRIORITY_BATCH)
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """Run LLM calls made inside the block (and tasks started from it) in the given lane"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for the tokens-per-minute budget (~4 characters per token)"""
+    return max(len(text) // 4, 1)
+
+def _status_code(error: Exception) -> Optional[int]:
+    code = getattr(error, "code", None)
+    if code is None:
+        code = getattr(error, "status_code", None)
+    return code if isinstance(code, int) else None
+
+def is_rate_limited(error: Exception) -> bool:
+    return _status_code(error) == 429 or type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+
+def is_retryable(error: Exception) -> bool:
+    """429 and 5xx from the provider, whichever SDK raised them"""
+    code = _status_code(error)
+    if code is not None:
+        return code == 429 or 500 <= code < 600
+    # google.api_core exceptions without an HTTP code still carry the gRPC status name
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError", "DeadlineExceeded")
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Refills continuously up to capacity over one minute. A capacity of 0 disables the limit."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(per_minute, 0))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def clamp(self, amount: float) -> float:
+        # a single request larger than the whole budget still has to be admitted eventually
+        return min(amount, self.capacity)
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until amount tokens are available, 0 if they are available now"""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        missing = self.clamp(amount) - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def consume(self, amount: float) -> None:
+        if self.enabled:
+            self._refill()
+            self.tokens -= self.clamp(amount)
+
+    def adjust(self, delta: float) -> None:
+        """Correct an earlier estimate once the real usage is known. The balance may go negative."""
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+    def drain(self) -> None:
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class LaneStats:
+    def __init__(self):
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float) -> None:
+        self.admitted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def to_dict(self, waiting: int) -> Dict[str, Any]:
+        return {
+            "waiting": waiting,
+            "admitted": self.admitted,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 2) if self.admitted > 0 else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls in priority order under a concurrency cap and requests-per-minute /
+    tokens-per-minute budgets. Interactive calls always go ahead of queued batch calls.
+    A rate-limit response drains the buckets so every caller backs off, not just the one that hit it.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._queue: List[Tuple[int, int, float, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lanes = {priority: LaneStats() for priority in _LANE_NAMES}
+        self.rate_limited = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    async def acquire(self, tokens: int, priority: Optional[int] = None) -> None:
+        """Wait for a slot and budget for a call estimated at `tokens` tokens"""
+        if priority is None:
+            priority = current_priority()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), time.monotonic(), float(tokens), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted just before the caller went away, hand the slot back
+                self.release()
+            raise
+
+    def release(self, actual_tokens: Optional[int] = None, estimated_tokens: Optional[int] = None) -> None:
+        self._in_flight -= 1
+        if actual_tokens is not None and estimated_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+        self._dispatch()
+
+    def rate_limit_hit(self) -> None:
+        self.rate_limited += 1
+        self.requests.drain()
+        self.tokens.drain()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue:
+            priority, _, enqueued, tokens, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                return
+            delay = max(self.requests.time_until(1), self.tokens.time_until(tokens))
+            if delay > 0:
+                # the head of the queue waits for budget, lower lanes must not overtake it
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._queue)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self._in_flight += 1
+            self._lanes[priority].record(time.monotonic() - enqueued)
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        waiting = {priority: 0 for priority in _LANE_NAMES}
+        for priority, _, _, _, future in self._queue:
+            if not future.done():
+                waiting[priority] += 1
+        return {
+            "requests_per_minute": int(self.requests.capacity),
+            "tokens_per_minute": int(self.tokens.capacity),
+            "rate_limited": self.rate_limited,
+            "lanes": {name: self._lanes[priority].to_dict(waiting[priority]) for priority, name in _LANE_NAMES.items()},
+        }
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from models import TaskStatus, TaskPriority, Team
+from models import TaskStatus, TaskPriority, Team, ProcessingStatus, JobStatus
 
 # Transcript Schemas
 class TranscriptCreate(BaseModel):
@@ -17,6 +17,9 @@ class TranscriptResponse(BaseModel):
     original_filename: Optional[str]
     storage_file_path: Optional[str]
     file_size: Optional[int]
+    file_sha256: Optional[str] = None
+    processing_status: ProcessingStatus
+    processing_progress: int
     created_by_id: int
     created_at: datetime
     updated_at: datetime
@@ -24,6 +27,51 @@ class TranscriptResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TranscriptListItem(BaseModel):
+    """A row of the transcript list, never the content. The optional fields are only sent when asked for with fields="""
+    id: int
+    title: str
+    summary_preview: Optional[str]
+    sentiment_label: Optional[str]
+    task_count: int
+    completed_task_count: int
+    file_size: Optional[int]
+    content_bytes: int
+    processing_status: ProcessingStatus
+    created_by_id: int
+    created_at: datetime
+    updated_at: datetime
+    content: Optional[str] = None
+    summary: Optional[str] = None
+    sentiment: Optional[str] = None
+    original_filename: Optional[str] = None
+    storage_file_path: Optional[str] = None
+    file_sha256: Optional[str] = None
+    processing_progress: Optional[int] = None
+
+class TranscriptPage(BaseModel):
+    items: List[TranscriptListItem]
+    next_cursor: Optional[str] = None
+
+class TranscriptSearchHit(BaseModel):
+    id: int
+    title: str
+    # plain transcript text around the matches, with the matches wrapped in <mark>...</mark>
+    snippet: str
+    rank: float
+    created_at: datetime
+
+class TranscriptProcessingResponse(BaseModel):
+    transcript_id: int
+    status: ProcessingStatus
+    progress: int
+    error: Optional[str] = None
+    job_id: Optional[int] = None
+    job_status: Optional[JobStatus] = None
+    attempts: int = 0
+    max_attempts: int = 0
+    updated_at: Optional[datetime] = None
+
 class TranscriptUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     content: Optional[str] = Field(None, min_length=10)
@@ -51,9 +99,35 @@ class AIGeneratedTask(BaseModel):
     assigned_team: Team
     tags: Optional[str] = None  
 
+class TaskMergeResult(BaseModel):
+    title: str
+    action: str
+    task_id: Optional[int] = None
+    matched_transcript_id: Optional[int] = None
+
 class AITasksResponse(BaseModel):
     tasks: List[AIGeneratedTask]
     transcript_id: int
+    created: int = 0
+    merged: int = 0
+    skipped: int = 0
+    results: List[TaskMergeResult] = []
+    persist_ms: float = 0.0
+
+class BatchTranscriptFilter(BaseModel):
+    created_by_id: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    processing_status: Optional[ProcessingStatus] = None
+    title_contains: Optional[str] = Field(None, min_length=1, max_length=255)
+    missing_summary: bool = False
+
+class BatchGenerateTasksRequest(BaseModel):
+    transcript_ids: Optional[List[int]] = None
+    filter: Optional[BatchTranscriptFilter] = None
+    limit: int = Field(500, ge=1)
+    scope: str = Field("transcript", pattern="^(transcript|global)$")
+    refresh: bool = False
 
 class TaskResponse(BaseModel):
     id: int
@@ -71,3 +145,25 @@ class TaskResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class LLMClientStats(BaseModel):
+    provider: str
+    model: str
+    configured: bool
+    max_concurrency: int
+    in_flight: int
+    queue_depth: int
+    total_requests: int
+    total_failures: int
+    total_retries: int
+    avg_latency_ms: float
+    scheduler: Dict[str, Any]
+
+class AIStatsResponse(BaseModel):
+    llm: LLMClientStats
+    extraction_cache: Dict[str, Any]
+    single_flight: Dict[str, Dict[str, Any]]
+
+class StorageStatsResponse(BaseModel):
+    backend: str
+    compression: str
+    object_cache: Dict[str, Any]
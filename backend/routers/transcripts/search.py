@@ -0,0 +1,50 @@
+from typing import List
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Transcript
+from config import TRANSCRIPT_SNIPPET_SCAN_CHARS
+from .schemas import TranscriptSearchHit
+
+# up to two fragments of 10-30 words around the matches, matches wrapped in <mark>
+SNIPPET_OPTIONS = 'MaxFragments=2, MinWords=10, MaxWords=30, FragmentDelimiter=" … ", StartSel=<mark>, StopSel=</mark>'
+
+
+async def search_transcripts(db: AsyncSession, text: str, skip: int, limit: int) -> List[TranscriptSearchHit]:
+    """
+    Transcripts matching a web-search style query (quoted phrases, OR, -word), most relevant first.
+    Matching and ranking only read the GIN-indexed search_vector; content is read for the returned page
+    alone, to cut snippets out of its first TRANSCRIPT_SNIPPET_SCAN_CHARS characters.
+    """
+    tsquery = func.websearch_to_tsquery("english", text)
+    rank = func.ts_rank_cd(Transcript.search_vector, tsquery).label("rank")
+    hits = (
+        select(Transcript.id, rank)
+        .where(Transcript.search_vector.bool_op("@@")(tsquery))
+        .order_by(rank.desc(), Transcript.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+
+    # ts_headline runs in the outer query, so only for the rows of this page
+    snippet = func.ts_headline(
+        "english",
+        func.left(Transcript.content, TRANSCRIPT_SNIPPET_SCAN_CHARS),
+        tsquery,
+        SNIPPET_OPTIONS
+    ).label("snippet")
+    result = await db.execute(
+        select(Transcript.id, Transcript.title, Transcript.created_at, hits.c.rank, snippet)
+        .join(hits, hits.c.id == Transcript.id)
+        .order_by(hits.c.rank.desc(), Transcript.id.desc())
+    )
+    return [
+        TranscriptSearchHit(
+            id=row.id,
+            title=row.title,
+            snippet=row.snippet,
+            rank=row.rank,
+            created_at=row.created_at
+        )
+        for row in result.all()
+    ]
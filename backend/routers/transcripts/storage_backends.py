@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from config import STORAGE_BACKEND, STORAGE_LOCAL_ROOT, STORAGE_LOCAL_SHARD_DEPTH, DOWNLOAD_CHUNK_SIZE
+from .downloads import iter_buffer
+from .storage_client import AsyncStorageClient, StorageError, storage_client
+
+logger = logging.getLogger(__name__)
+
+UploadContent = Union[bytes, AsyncIterable[bytes]]
+
+
+async def _noop() -> None:
+    return None
+
+
+@dataclass
+class StorageDownload:
+    """An open download. `partial` is True when chunks are already limited to the requested range."""
+    chunks: AsyncIterator[bytes]
+    partial: bool
+    close: Callable[[], Awaitable[None]] = _noop
+
+
+class StorageBackend:
+    """Interface for object storage backends, keyed by storage_file_path"""
+
+    name = "base"
+
+    async def upload(self, path: str, content: UploadContent, content_type: str = "text/plain", upsert: bool = False) -> None:
+        raise NotImplementedError
+
+    async def open_download(
+        self,
+        path: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> StorageDownload:
+        raise NotImplementedError
+
+    async def download(self, path: str) -> bytes:
+        raise NotImplementedError
+
+    async def exists(self, path: str) -> bool:
+        raise NotImplementedError
+
+    async def move(self, source: str, destination: str) -> None:
+        """Rename an object, failing with a 409 StorageError when the destination exists"""
+        raise NotImplementedError
+
+    async def delete(self, paths: List[str]) -> None:
+        raise NotImplementedError
+
+    def public_url(self, path: str) -> str:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """Supabase Storage through the pooled async REST client"""
+
+    name = "supabase"
+
+    def __init__(self, client: Optional[AsyncStorageClient] = None):
+        self.client = client or storage_client
+
+    async def upload(self, path: str, content: UploadContent, content_type: str = "text/plain", upsert: bool = False) -> None:
+        await self.client.upload(path, content, content_type=content_type, upsert=upsert)
+
+    async def open_download(
+        self,
+        path: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> StorageDownload:
+        response = await self.client.open_download(path, byte_range)
+        return StorageDownload(
+            chunks=response.aiter_bytes(chunk_size),
+            partial=byte_range is not None and response.status_code == 206,
+            close=response.aclose
+        )
+
+    async def download(self, path: str) -> bytes:
+        return await self.client.download(path)
+
+    async def exists(self, path: str) -> bool:
+        return await self.client.exists(path)
+
+    async def move(self, source: str, destination: str) -> None:
+        await self.client.move(source, destination)
+
+    async def delete(self, paths: List[str]) -> None:
+        await self.client.delete(paths)
+
+    def public_url(self, path: str) -> str:
+        return self.client.public_url(path)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class LocalFilesystemBackend(StorageBackend):
+    """
+    Objects as files under a root directory, sharded by a hash of the path (root/ab/cd/<name>) so no
+    directory grows unbounded. Writes go to a temp file in the target directory and are renamed into
+    place, so readers never see a partial object. Reads are served from an mmap of the file.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str = STORAGE_LOCAL_ROOT, shard_depth: int = STORAGE_LOCAL_SHARD_DEPTH):
+        self.root = os.path.abspath(root)
+        self.shard_depth = max(shard_depth, 0)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _file_path(self, path: str) -> str:
+        digest = hashlib.sha256(path.encode("utf-8")).hexdigest()
+        shards = [digest[i * 2:i * 2 + 2] for i in range(self.shard_depth)]
+        name = path.replace("/", "__")[-150:]
+        return os.path.join(self.root, *shards, f"{digest[:16]}_{name}")
+
+    async def upload(self, path: str, content: UploadContent, content_type: str = "text/plain", upsert: bool = False) -> None:
+        target = self._file_path(path)
+        if not upsert and os.path.exists(target):
+            raise StorageError(f"Upload failed: {path} already exists", 409)
+
+        directory = os.path.dirname(target)
+        await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if isinstance(content, (bytes, bytearray)):
+                    await asyncio.to_thread(f.write, content)
+                else:
+                    async for chunk in content:
+                        await asyncio.to_thread(f.write, chunk)
+                await asyncio.to_thread(f.flush)
+                await asyncio.to_thread(os.fsync, f.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _map(self, path: str) -> Optional[mmap.mmap]:
+        """Read-only mapping of the object, None for an empty file (which can't be mapped)"""
+        target = self._file_path(path)
+        try:
+            with open(target, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise StorageError(f"Download failed: {path} not found", 404)
+
+    async def open_download(
+        self,
+        path: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> StorageDownload:
+        mapped = self._map(path)
+        if mapped is None:
+            return StorageDownload(chunks=iter_buffer(b"", None, chunk_size), partial=byte_range is not None)
+
+        async def close() -> None:
+            mapped.close()
+
+        return StorageDownload(chunks=iter_buffer(mapped, byte_range, chunk_size), partial=byte_range is not None, close=close)
+
+    async def download(self, path: str) -> bytes:
+        mapped = self._map(path)
+        if mapped is None:
+            return b""
+        with mapped:
+            return mapped[:]
+
+    async def exists(self, path: str) -> bool:
+        return os.path.exists(self._file_path(path))
+
+    async def move(self, source: str, destination: str) -> None:
+        target = self._file_path(destination)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(target), exist_ok=True)
+        try:
+            # link fails if the destination exists, so a move never replaces another object
+            os.link(self._file_path(source), target)
+        except FileNotFoundError:
+            raise StorageError(f"Move failed: {source} not found", 404)
+        except FileExistsError:
+            raise StorageError(f"Move failed: {destination} already exists", 409)
+        os.unlink(self._file_path(source))
+
+    async def delete(self, paths: List[str]) -> None:
+        for path in paths:
+            try:
+                os.unlink(self._file_path(path))
+            except FileNotFoundError:
+                pass
+
+    def public_url(self, path: str) -> str:
+        return f"file://{self._file_path(path)}"
+
+
+class InMemoryStorageBackend(StorageBackend):
+    """Objects in a dict, for tests and benchmarks that should not touch disk or network"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._objects: Dict[str, bytes] = {}
+
+    async def upload(self, path: str, content: UploadContent, content_type: str = "text/plain", upsert: bool = False) -> None:
+        if not upsert and path in self._objects:
+            raise StorageError(f"Upload failed: {path} already exists", 409)
+        if isinstance(content, (bytes, bytearray)):
+            data = bytes(content)
+        else:
+            data = b"".join([chunk async for chunk in content])
+        self._objects[path] = data
+
+    async def open_download(
+        self,
+        path: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> StorageDownload:
+        data = await self.download(path)
+        return StorageDownload(chunks=iter_buffer(data, byte_range, chunk_size), partial=byte_range is not None)
+
+    async def download(self, path: str) -> bytes:
+        if path not in self._objects:
+            raise StorageError(f"Download failed: {path} not found", 404)
+        return self._objects[path]
+
+    async def exists(self, path: str) -> bool:
+        return path in self._objects
+
+    async def move(self, source: str, destination: str) -> None:
+        if source not in self._objects:
+            raise StorageError(f"Move failed: {source} not found", 404)
+        if destination in self._objects:
+            raise StorageError(f"Move failed: {destination} already exists", 409)
+        self._objects[destination] = self._objects.pop(source)
+
+    async def delete(self, paths: List[str]) -> None:
+        for path in paths:
+            self._objects.pop(path, None)
+
+    def public_url(self, path: str) -> str:
+        return f"memory://{path}"
+
+
+def create_storage_backend(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    backend = backend.lower()
+    if backend == "supabase":
+        return SupabaseStorageBackend()
+    if backend == "local":
+        return LocalFilesystemBackend()
+    if backend == "memory":
+        return InMemoryStorageBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+storage_backend = create_storage_backend()
@@ -0,0 +1,165 @@
+import logging
+from typing import AsyncIterable, List, Optional, Tuple, Union
+import httpx
+from config import (
+    SUPABASE_URL,
+    SUPABASE_SERVICE_ROLE_KEY,
+    SUPABASE_STORAGE_BUCKET,
+    STORAGE_MAX_CONNECTIONS,
+    STORAGE_KEEPALIVE_SECONDS,
+    STORAGE_CONNECT_TIMEOUT_SECONDS,
+    STORAGE_UPLOAD_TIMEOUT_SECONDS,
+    STORAGE_DOWNLOAD_TIMEOUT_SECONDS,
+    STORAGE_DELETE_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StorageError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AsyncStorageClient:
+    """
+    Supabase Storage REST API over one pooled keep-alive httpx.AsyncClient. Every call is native async,
+    so concurrent transfers on one worker overlap instead of blocking the event loop, and every
+    operation has its own timeout.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = SUPABASE_URL,
+        service_key: Optional[str] = SUPABASE_SERVICE_ROLE_KEY,
+        bucket: str = SUPABASE_STORAGE_BUCKET
+    ):
+        self.url = url.rstrip("/") if url else None
+        self.service_key = service_key
+        self.bucket = bucket
+        self._client: Optional[httpx.AsyncClient] = None
+        self.upload_timeout = httpx.Timeout(STORAGE_UPLOAD_TIMEOUT_SECONDS, connect=STORAGE_CONNECT_TIMEOUT_SECONDS)
+        self.download_timeout = httpx.Timeout(STORAGE_DOWNLOAD_TIMEOUT_SECONDS, connect=STORAGE_CONNECT_TIMEOUT_SECONDS)
+        self.delete_timeout = httpx.Timeout(STORAGE_DELETE_TIMEOUT_SECONDS, connect=STORAGE_CONNECT_TIMEOUT_SECONDS)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            if not self.url or not self.service_key:
+                raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set for file storage")
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.url}/storage/v1",
+                headers={
+                    "Authorization": f"Bearer {self.service_key}",
+                    "apikey": self.service_key,
+                },
+                limits=httpx.Limits(
+                    max_connections=STORAGE_MAX_CONNECTIONS,
+                    max_keepalive_connections=STORAGE_MAX_CONNECTIONS,
+                    keepalive_expiry=STORAGE_KEEPALIVE_SECONDS
+                ),
+                timeout=self.download_timeout
+            )
+        return self._client
+
+    def _object_url(self, path: str) -> str:
+        return f"/object/{self.bucket}/{path}"
+
+    @staticmethod
+    async def _raise_for_status(response: httpx.Response, action: str) -> None:
+        if response.status_code >= 400:
+            await response.aread()
+            raise StorageError(f"{action} failed: {response.status_code} {response.text}", response.status_code)
+
+    async def upload(
+        self,
+        path: str,
+        content: Union[bytes, AsyncIterable[bytes]],
+        content_type: str = "text/plain",
+        upsert: bool = False
+    ) -> None:
+        """Upload bytes, or an async stream of chunks sent with chunked transfer encoding"""
+        try:
+            response = await self.client.post(
+                self._object_url(path),
+                content=content,
+                headers={"Content-Type": content_type, "x-upsert": "true" if upsert else "false"},
+                timeout=self.upload_timeout
+            )
+        except httpx.TimeoutException as e:
+            raise StorageError(f"Upload timed out: {e!r}")
+        await self._raise_for_status(response, "Upload")
+
+    async def open_download(self, path: str, byte_range: Optional[Tuple[int, int]] = None) -> httpx.Response:
+        """
+        Start a streamed download, optionally of an inclusive byte range. The caller iterates
+        response.aiter_bytes() and must close the response. Status is 206 when storage honoured the range.
+        """
+        headers = {"Range": f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range else {}
+        request = self.client.build_request("GET", self._object_url(path), headers=headers, timeout=self.download_timeout)
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.TimeoutException as e:
+            raise StorageError(f"Download timed out: {e!r}")
+        try:
+            await self._raise_for_status(response, "Download")
+        except StorageError:
+            await response.aclose()
+            raise
+        return response
+
+    async def download(self, path: str) -> bytes:
+        try:
+            response = await self.client.get(self._object_url(path), timeout=self.download_timeout)
+        except httpx.TimeoutException as e:
+            raise StorageError(f"Download timed out: {e!r}")
+        await self._raise_for_status(response, "Download")
+        return response.content
+
+    async def exists(self, path: str) -> bool:
+        try:
+            response = await self.client.head(self._object_url(path), timeout=self.download_timeout)
+        except httpx.TimeoutException as e:
+            raise StorageError(f"Exists check timed out: {e!r}")
+        if response.status_code in (400, 404):
+            return False
+        await self._raise_for_status(response, "Exists check")
+        return True
+
+    async def move(self, source: str, destination: str) -> None:
+        """Rename an object within the bucket, no bytes are transferred"""
+        try:
+            response = await self.client.post(
+                "/object/move",
+                json={"bucketId": self.bucket, "sourceKey": source, "destinationKey": destination},
+                timeout=self.delete_timeout
+            )
+        except httpx.TimeoutException as e:
+            raise StorageError(f"Move timed out: {e!r}")
+        await self._raise_for_status(response, "Move")
+
+    async def delete(self, paths: List[str]) -> None:
+        try:
+            response = await self.client.request(
+                "DELETE",
+                f"/object/{self.bucket}",
+                json={"prefixes": paths},
+                timeout=self.delete_timeout
+            )
+        except httpx.TimeoutException as e:
+            raise StorageError(f"Delete timed out: {e!r}")
+        await self._raise_for_status(response, "Delete")
+
+    def public_url(self, path: str) -> str:
+        if not self.url:
+            raise ValueError("SUPABASE_URL must be set for file storage")
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{path}"
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+storage_client = AsyncStorageClient()
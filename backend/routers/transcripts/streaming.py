@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from .schemas import AIGeneratedTask
+from .llm_client import llm_client
+from .extraction_cache import extraction_cache, make_cache_key, CachedExtraction
+from .chunking import split_transcript
+from .dedup import DedupIndex, compute_signature
+from .helpers import (
+    PROMPT_VERSION,
+    build_extraction_prompt,
+    fallback_review_task,
+    parse_ai_task,
+    reduce_chunk_summaries,
+)
+
+logger = logging.getLogger(__name__)
+
+class IncrementalExtractionParser:
+    """
+    Incremental scanner over the streamed JSON response.
+    Emits ("task", dict) as soon as each object in the top-level "tasks" array closes,
+    and (key, value) for every other top-level value once it is complete.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._finished = False
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._element_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self._text += text
+        events: List[Tuple[str, Any]] = []
+
+        while self._pos < len(self._text) and not self._finished:
+            i = self._pos
+            ch = self._text[i]
+            self._pos += 1
+
+            if not self._started:
+                # skip anything the model puts before the object, e.g. a ```json fence
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None:
+                        self._key = json.loads(self._text[self._key_start:i + 1])
+                        self._key_start = None
+                        self._expect_key = False
+                    elif self._depth == 1 and self._value_start is not None:
+                        events.append(self._complete_value(i))
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expect_key:
+                        self._key_start = i
+                    elif self._value_start is None:
+                        self._value_start = i
+            elif ch in '{[':
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                elif self._depth == 2 and ch == '{' and self._key == "tasks":
+                    self._element_start = i
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 2 and ch == '}' and self._element_start is not None:
+                    try:
+                        events.append(("task", json.loads(self._text[self._element_start:i + 1])))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping malformed streamed task: {e}")
+                    self._element_start = None
+                elif self._depth == 1 and self._value_start is not None:
+                    events.append(self._complete_value(i))
+                elif self._depth == 0:
+                    self._finished = True
+            elif ch == ',' and self._depth == 1:
+                self._expect_key = True
+                self._value_start = None
+
+        return events
+
+    def _complete_value(self, end: int) -> Tuple[str, Any]:
+        raw = self._text[self._value_start:end + 1]
+        self._value_start = None
+        if self._key == "tasks":
+            # elements were already emitted one by one
+            return ("tasks_complete", None)
+        try:
+            return (self._key or "", json.loads(raw))
+        except json.JSONDecodeError:
+            return (self._key or "", None)
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Serialize one Server-Sent Event"""
+    if isinstance(data, AIGeneratedTask):
+        data = data.model_dump(mode="json")
+    payload = json.dumps(data)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def _stream_chunk(index: int, total: int, chunk: str, transcript_title: str, queue: asyncio.Queue) -> None:
+    parser = IncrementalExtractionParser()
+    prompt = build_extraction_prompt(
+        chunk,
+        transcript_title,
+        part=(index, total) if total > 1 else None,
+        tasks_first=True
+    )
+    try:
+        async for text in llm_client.generate_stream(prompt):
+            for kind, value in parser.feed(text):
+                await queue.put((index, kind, value))
+    except Exception as e:
+        await queue.put((index, "error", e))
+    finally:
+        await queue.put((index, "end", None))
+
+
+async def stream_extraction_events(
+    transcript_content: str,
+    transcript_title: str,
+    use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Yield ("task", AIGeneratedTask) events while the model is still generating, then
+    ("summary", str), ("sentiment", str) and a final ("done", dict).
+    Long transcripts stream every chunk concurrently. The final result is stored in the
+    extraction cache, so a later generate-tasks call for the same content costs no tokens.
+    """
+    cache_key = make_cache_key(transcript_content, transcript_title, PROMPT_VERSION, llm_client.model_name)
+    if use_cache:
+        cached = await extraction_cache.get(cache_key)
+        if cached is not None:
+            for task in cached.tasks:
+                yield ("task", task)
+            yield ("summary", cached.summary)
+            yield ("sentiment", cached.sentiment)
+            yield ("done", {"task_count": len(cached.tasks), "cached": True})
+            return
+
+    if not llm_client.configured:
+        raise Exception(llm_client.provider.not_configured_message)
+
+    chunks = split_transcript(transcript_content)
+    total = len(chunks)
+    queue: asyncio.Queue = asyncio.Queue()
+    producers = [
+        asyncio.create_task(_stream_chunk(i, total, chunk, transcript_title, queue))
+        for i, chunk in enumerate(chunks, start=1)
+    ]
+
+    tasks: List[AIGeneratedTask] = []
+    seen: DedupIndex[AIGeneratedTask] = DedupIndex()
+    summaries: Dict[int, str] = {}
+    sentiments: Dict[int, str] = {}
+    errors: List[Exception] = []
+    finished = 0
+    try:
+        while finished < total:
+            index, kind, value = await queue.get()
+            if kind == "task":
+                try:
+                    task = parse_ai_task(value)
+                except Exception as e:
+                    logger.error(f"Error processing streamed task data: {value}, Error: {e}")
+                    continue
+                # same greedy pass as deduplicate_tasks, applied as tasks arrive
+                signature = compute_signature(task.title, task.description)
+                if seen.find_duplicate(signature) is not None:
+                    continue
+                seen.add(signature, task)
+                tasks.append(task)
+                yield ("task", task)
+            elif kind == "summary" and value is not None:
+                summaries[index] = value
+            elif kind == "sentiment" and value is not None:
+                sentiments[index] = value
+            elif kind == "error":
+                errors.append(value)
+            elif kind == "end":
+                finished += 1
+    finally:
+        for producer in producers:
+            producer.cancel()
+
+    if errors and len(errors) == total:
+        raise errors[0]
+    if errors:
+        logger.warning(f"{len(errors)} of {total} transcript chunks failed streamed extraction: {errors[0]}")
+
+    ordered = sorted(summaries)
+    if total > 1 and len(ordered) > 1:
+        summary, sentiment = await reduce_chunk_summaries(
+            transcript_title,
+            [summaries[i] for i in ordered],
+            [sentiments.get(i, "") for i in ordered]
+        )
+    else:
+        summary = summaries[ordered[0]] if ordered else 'No summary generated'
+        sentiment = sentiments.get(ordered[0], 'No sentiment analysis available') if ordered else 'No sentiment analysis available'
+
+    if not tasks:
+        task = fallback_review_task(transcript_title)
+        tasks.append(task)
+        yield ("task", task)
+
+    yield ("summary", summary)
+    yield ("sentiment", sentiment)
+
+    if not errors:
+        await extraction_cache.set(
+            cache_key,
+            CachedExtraction(tasks=tasks, summary=summary, sentiment=sentiment),
+            model_name=llm_client.model_name,
+            prompt_version=PROMPT_VERSION
+        )
+
+    yield ("done", {"task_count": len(tasks), "cached": False})
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from sqlalchemy import select, delete, exists, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+import config
+from config import DEDUP_MAX_KEY_TASKS
+from models import Task, TaskPriority, TaskSignatureBand
+from .dedup import TaskSignature, compute_signature, prefix_keys, signatures_similar
+from .schemas import AIGeneratedTask
+
+logger = logging.getLogger(__name__)
+
+SCOPE_TRANSCRIPT = "transcript"
+SCOPE_GLOBAL = "global"
+
+_PRIORITY_RANK = {TaskPriority.LOW: 0, TaskPriority.MEDIUM: 1, TaskPriority.HIGH: 2}
+
+# keep IN (...) lists and multi-row VALUES well below the Postgres bind parameter limit
+_KEY_BATCH_SIZE = 5000
+
+
+class KeyCount(NamedTuple):
+    tasks: int
+    prefix_tasks: int
+
+
+_NO_TASKS = KeyCount(0, 0)
+
+
+def signature_band_rows(task_id: int, transcript_id: int, signature: TaskSignature, counts: Dict[int, KeyCount]) -> List[dict]:
+    """One row per band key, the prefix ones (rarest by the stored counts) marked for prefix filtering"""
+    prefix = prefix_keys(signature, lambda band_key: counts.get(band_key, _NO_TASKS).tasks)
+    return [
+        {"task_id": task_id, "transcript_id": transcript_id, "band_key": band_key, "in_prefix": band_key in prefix}
+        for band_key in signature.band_keys
+    ]
+
+async def insert_signature_bands(db: AsyncSession, rows: List[dict]) -> None:
+    """Bulk insert band rows, one statement per batch"""
+    for start in range(0, len(rows), _KEY_BATCH_SIZE):
+        await db.execute(insert(TaskSignatureBand).values(rows[start:start + _KEY_BATCH_SIZE]))
+
+async def index_signatures(db: AsyncSession, entries: Sequence[Tuple[int, int, TaskSignature]]) -> None:
+    """Store signature bands for (task_id, transcript_id, signature) entries of tasks that already have ids"""
+    if not entries:
+        return
+    counts = await _count_keys(db, {band_key for _, _, signature in entries for band_key in signature.band_keys}, None)
+    rows = []
+    for task_id, transcript_id, signature in entries:
+        rows.extend(signature_band_rows(task_id, transcript_id, signature, counts))
+    await insert_signature_bands(db, rows)
+
+async def index_tasks(db: AsyncSession, tasks: Sequence[Task]) -> None:
+    """Store signature bands for tasks that already have ids"""
+    await index_signatures(db, [
+        (task.id, task.transcript_id, compute_signature(task.title, task.description)) for task in tasks
+    ])
+
+async def reindex_task(db: AsyncSession, task: Task) -> None:
+    """Refresh the bands of a task whose title or description changed"""
+    await db.execute(delete(TaskSignatureBand).where(TaskSignatureBand.task_id == task.id))
+    await index_tasks(db, [task])
+
+async def _index_missing_for_transcript(db: AsyncSession, transcript_id: int) -> None:
+    """Tasks created before the index existed are indexed the first time their transcript is matched against"""
+    result = await db.execute(
+        select(Task)
+        .where(Task.transcript_id == transcript_id)
+        .where(~exists().where(TaskSignatureBand.task_id == Task.id))
+    )
+    missing = result.scalars().all()
+    if missing:
+        await index_tasks(db, missing)
+
+async def _count_keys(db: AsyncSession, band_keys: Iterable[int], transcript_id: Optional[int]) -> Dict[int, KeyCount]:
+    """How many indexed tasks have each band key, in total and as a prefix key"""
+    keys = list(band_keys)
+    counts: Dict[int, KeyCount] = {}
+    for start in range(0, len(keys), _KEY_BATCH_SIZE):
+        query = (
+            select(
+                TaskSignatureBand.band_key,
+                func.count(),
+                func.count().filter(TaskSignatureBand.in_prefix),
+            )
+            .where(TaskSignatureBand.band_key.in_(keys[start:start + _KEY_BATCH_SIZE]))
+            .group_by(TaskSignatureBand.band_key)
+        )
+        if transcript_id is not None:
+            query = query.where(TaskSignatureBand.transcript_id == transcript_id)
+        for band_key, tasks, prefix_tasks in (await db.execute(query)).all():
+            counts[band_key] = KeyCount(tasks, prefix_tasks)
+    return counts
+
+async def _lookup_bands(
+    db: AsyncSession,
+    band_keys: Iterable[int],
+    transcript_id: Optional[int],
+    prefix_only: bool = False
+) -> Dict[int, List[int]]:
+    keys = list(band_keys)
+    tasks_by_band: Dict[int, List[int]] = defaultdict(list)
+    for start in range(0, len(keys), _KEY_BATCH_SIZE):
+        query = select(TaskSignatureBand.band_key, TaskSignatureBand.task_id).where(
+            TaskSignatureBand.band_key.in_(keys[start:start + _KEY_BATCH_SIZE])
+        )
+        if prefix_only:
+            query = query.where(TaskSignatureBand.in_prefix)
+        if transcript_id is not None:
+            query = query.where(TaskSignatureBand.transcript_id == transcript_id)
+        for band_key, task_id in (await db.execute(query)).all():
+            tasks_by_band[band_key].append(task_id)
+    return tasks_by_band
+
+async def _load_tasks(db: AsyncSession, task_ids: Iterable[int]) -> Dict[int, Task]:
+    ids = sorted(task_ids)
+    tasks: Dict[int, Task] = {}
+    for start in range(0, len(ids), _KEY_BATCH_SIZE):
+        result = await db.execute(select(Task).where(Task.id.in_(ids[start:start + _KEY_BATCH_SIZE])))
+        tasks.update((task.id, task) for task in result.scalars().all())
+    return tasks
+
+async def find_existing_matches(
+    db: AsyncSession,
+    transcript_id: int,
+    signatures: Sequence[TaskSignature],
+    scope: str = SCOPE_TRANSCRIPT
+) -> List[Optional[Task]]:
+    """
+    Match signatures of new AI tasks against existing tasks in bulk with prefix filtering (see dedup):
+    one query for the key counts, two for the bands, batched queries for the candidate tasks, then the
+    usual similarity rules on the candidates only. Keys shared by more than DEDUP_MAX_KEY_TASKS tasks
+    are not looked up, so a lookup stays bounded however many tasks share a common word.
+    """
+    if scope == SCOPE_TRANSCRIPT:
+        await _index_missing_for_transcript(db, transcript_id)
+
+    all_keys = {band_key for signature in signatures for band_key in signature.band_keys}
+    if not all_keys:
+        return [None] * len(signatures)
+
+    scope_transcript_id = transcript_id if scope == SCOPE_TRANSCRIPT else None
+    counts = await _count_keys(db, all_keys, scope_transcript_id)
+
+    # the rarest words of each new task against every stored key, all its words against the stored prefixes
+    probes: List[Tuple[Set[int], Set[int]]] = []
+    for signature in signatures:
+        prefix = prefix_keys(signature, lambda band_key: counts.get(band_key, _NO_TASKS).tasks)
+        probes.append((
+            {band_key for band_key in prefix if 0 < counts.get(band_key, _NO_TASKS).tasks <= DEDUP_MAX_KEY_TASKS},
+            {band_key for band_key in signature.band_keys if 0 < counts.get(band_key, _NO_TASKS).prefix_tasks <= DEDUP_MAX_KEY_TASKS},
+        ))
+    skipped = {band_key for band_key in all_keys if counts.get(band_key, _NO_TASKS).tasks > DEDUP_MAX_KEY_TASKS}
+    if skipped:
+        logger.debug(f"Not looking up {len(skipped)} band keys shared by more than {DEDUP_MAX_KEY_TASKS} tasks")
+
+    tasks_by_band = await _lookup_bands(db, set().union(*(keys for keys, _ in probes)), scope_transcript_id)
+    tasks_by_prefix = await _lookup_bands(db, set().union(*(keys for _, keys in probes)), scope_transcript_id, prefix_only=True)
+    candidate_ids = {task_id for task_ids in tasks_by_band.values() for task_id in task_ids}
+    candidate_ids.update(task_id for task_ids in tasks_by_prefix.values() for task_id in task_ids)
+    if not candidate_ids:
+        return [None] * len(signatures)
+
+    candidates = await _load_tasks(db, candidate_ids)
+    candidate_signatures: Dict[int, TaskSignature] = {}
+
+    matches: List[Optional[Task]] = []
+    for signature, (band_probe, prefix_probe) in zip(signatures, probes):
+        match = None
+        ids = {task_id for band_key in band_probe for task_id in tasks_by_band.get(band_key, ())}
+        ids.update(task_id for band_key in prefix_probe for task_id in tasks_by_prefix.get(band_key, ()))
+        for task_id in sorted(ids):
+            existing = candidates.get(task_id)
+            if existing is None:
+                continue
+            if task_id not in candidate_signatures:
+                candidate_signatures[task_id] = compute_signature(existing.title, existing.description)
+            if signatures_similar(signature, candidate_signatures[task_id], compat=False):
+                match = existing
+                break
+        matches.append(match)
+    return matches
+
+def merge_into_existing(existing: Task, ai_task: AIGeneratedTask) -> bool:
+    """Fold new information into an existing task. Returns False when there was nothing new."""
+    changed = False
+
+    if ai_task.description and len(ai_task.description) > len(existing.description or ""):
+        existing.description = ai_task.description
+        changed = True
+
+    if _PRIORITY_RANK[ai_task.priority] > _PRIORITY_RANK[existing.priority]:
+        existing.priority = ai_task.priority
+        changed = True
+
+    existing_tags = [tag.strip() for tag in (existing.tags or "").split(",") if tag.strip()]
+    new_tags = [tag.strip() for tag in (ai_task.tags or "").split(",") if tag.strip()]
+    known = {tag.lower() for tag in existing_tags}
+    added = [tag for tag in new_tags if tag.lower() not in known]
+    if added:
+        existing.tags = ", ".join(existing_tags + added)[:500]
+        changed = True
+
+    return changed
+
+async def backfill_signatures(batch_size: int = 1000) -> int:
+    """Index every task that has no signature bands yet"""
+    if config.AsyncSessionLocal is None:
+        raise Exception("Database not configured")
+
+    indexed = 0
+    last_id = 0
+    async with config.AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(Task)
+                .where(Task.id > last_id)
+                .where(~exists().where(TaskSignatureBand.task_id == Task.id))
+                .order_by(Task.id)
+                .limit(batch_size)
+            )
+            batch = result.scalars().all()
+            if not batch:
+                break
+            await index_tasks(db, batch)
+            await db.commit()
+            last_id = batch[-1].id
+            indexed += len(batch)
+            logger.info(f"Indexed {indexed} tasks")
+    return indexed
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(backfill_signatures())
@@ -1,23 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, Header
+from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, delete
 from sqlalchemy.orm import joinedload
-from typing import List, Optional
-import io
+from typing import List, Optional, Tuple, Union
+import asyncio
+import hashlib
 from config import get_db
-from models import User, Transcript, Task, TaskStatus
+from models import User, Transcript, Task, TaskStatus, ProcessingJob, TaskSignatureBand
 from routers.auth.helpers import get_current_active_user
 from .schemas import (
     TranscriptCreate, 
     TranscriptResponse, 
+    TranscriptListItem,
+    TranscriptPage,
+    TranscriptSearchHit,
     TranscriptUpdate,
     AITasksResponse,
     TaskResponse,
-
+    TranscriptProcessingResponse,
+    AIStatsResponse,
+    TaskMergeResult,
+    BatchGenerateTasksRequest,
+    StorageStatsResponse,
 )
-from .helpers import extract_tasks_and_summary_from_transcript
+from .helpers import PROMPT_VERSION, extraction_flight
+from .jobs import enqueue_extraction_job, get_latest_job, job_worker, prefetch_extraction
+from .llm_client import llm_client
+from .extraction_cache import extraction_cache, make_cache_key
+from .streaming import stream_extraction_events, format_sse
+from .task_index import SCOPE_TRANSCRIPT
+from .persistence import regenerate_transcript_tasks, generation_flight, ACTION_CREATED
+from .batch import resolve_batch_ids, start_batch
+from .listing import EXTRA_FIELDS, parse_fields, list_transcripts
+from .search import search_transcripts
+from routers.pagination import InvalidCursor
 from .file_storage import FileStorageHelper
+from .object_cache import object_cache
+from .codec import storage_codec
+from .content_store import ObjectRef, content_path, is_content_addressed, find_object, store_content, adopt_staged_object, release_object, collect_object
+from .storage_backends import storage_backend
+from .ingest import StreamingIngest, ChunkPipe, UploadTooLarge
+from .downloads import make_etag, http_date, etag_matches_strong, not_modified, parse_range, RangeNotSatisfiable
+from config import BATCH_MAX_TRANSCRIPTS, MAX_UPLOAD_BYTES
 import logging
 from datetime import datetime
 import uuid
@@ -27,13 +52,52 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/transcripts", tags=["Transcripts"])
 
 
-@router.post("/", response_model=TranscriptResponse, status_code=status.HTTP_201_CREATED)
+async def _insert_and_queue(db: AsyncSession, transcript: Transcript) -> ProcessingJob:
+    db.add(transcript)
+    await db.flush()
+    return await enqueue_extraction_job(db, transcript)
+
+async def _noop() -> None:
+    return None
+
+async def _insert_and_store(
+    db: AsyncSession,
+    transcript: Transcript,
+    file_content: bytes,
+    file_sha256: str
+) -> Tuple[ProcessingJob, Optional[ObjectRef]]:
+    """
+    Insert the transcript with its processing job, upload the file to storage and start extraction
+    concurrently. The file is stored once per distinct content: when an object with this hash exists the
+    upload is skipped and the transcript takes another reference to it. A failed upload only leaves the
+    transcript without a stored file. Nothing is committed here, the caller commits once.
+    """
+    existing = await find_object(db, file_sha256)
+    upload = _noop() if existing else FileStorageHelper.upload_file(file_content, content_path(file_sha256), upsert=True)
+
+    prefetch_extraction(transcript.content, transcript.title)
+    inserted, stored = await asyncio.gather(
+        _insert_and_queue(db, transcript),
+        upload,
+        return_exceptions=True
+    )
+
+    # an uploaded object is left in place when the insert fails, a concurrent upload of the same content may share it
+    if isinstance(inserted, BaseException):
+        raise inserted
+
+    if isinstance(stored, BaseException):
+        logger.warning(f"Failed to store file for transcript {transcript.id}: {stored}")
+        return inserted, None
+    return inserted, await store_content(db, file_content, file_sha256, uploaded=existing is None)
+
+@router.post("/", response_model=TranscriptResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_transcript(
     transcript_data: TranscriptCreate,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new transcript with manual entry and automatic AI processing"""
+    """Create a new transcript with manual entry and queue it for AI processing"""
     
     try:
         new_transcript = Transcript(
@@ -41,64 +105,31 @@ async def create_transcript(
             content=transcript_data.content,
             created_by_id=current_user.id
         )
-        
-        db.add(new_transcript)
-        await db.commit()
-        await db.refresh(new_transcript)
 
-        try:
-            file_path = FileStorageHelper.generate_file_path(
-                user_id=current_user.id,
-                original_filename=f"{transcript_data.title}.txt",
-                transcript_id=new_transcript.id
-            )
-
-            file_content = f"""Title: {transcript_data.title}
+        # no timestamp in the file, so the same transcript entered again maps onto the same stored object
+        original_filename = f"{transcript_data.title}.txt"
+        file_content = f"""Title: {transcript_data.title}
 Created by: {current_user.first_name} {current_user.last_name}
-Created at: {new_transcript.created_at}
 Team: {current_user.team.value}
 
 ---TRANSCRIPT CONTENT---
 {transcript_data.content}
-"""
-            
-            storage_path = await FileStorageHelper.upload_text_as_file(file_content, file_path)
-            
-            new_transcript.storage_file_path = storage_path
-            new_transcript.original_filename = f"{transcript_data.title}.txt"
-            new_transcript.file_size = len(file_content.encode('utf-8'))
-            
-        except Exception as e:
-            logger.warning(f"Failed to store file for transcript {new_transcript.id}: {e}")
-        
-        try:
-            ai_tasks, summary, sentiment = await extract_tasks_and_summary_from_transcript(
-                transcript_data.content, 
-                transcript_data.title
-            )
-            
-            new_transcript.summary = summary
-            new_transcript.sentiment = sentiment
-            
-            for ai_task in ai_tasks:
-                task = Task(
-                    title=ai_task.title,
-                    description=ai_task.description,
-                    priority=ai_task.priority,
-                    assigned_team=ai_task.assigned_team,
-                    tags=ai_task.tags,
-                    transcript_id=new_transcript.id
-                )
-                db.add(task)
-            
-            await db.commit()
-            await db.refresh(new_transcript)
-            
-            logger.info(f"Created transcript {new_transcript.id} with {len(ai_tasks)} AI-generated tasks and summary")
-            
-        except Exception as e:
-            logger.error(f"AI processing failed for transcript {new_transcript.id}: {e}")
+""".encode('utf-8')
+
+        file_sha256 = hashlib.sha256(file_content).hexdigest()
+        job, stored = await _insert_and_store(db, new_transcript, file_content, file_sha256)
+        if stored:
+            new_transcript.storage_file_path = stored.path
+            new_transcript.original_filename = original_filename
+            new_transcript.file_size = len(file_content)
+            new_transcript.file_sha256 = file_sha256
+            new_transcript.storage_encoding = stored.encoding
 
+        await db.commit()
+        await db.refresh(new_transcript)
+        job_worker.wake()
+
+        logger.info(f"Created transcript {new_transcript.id}, queued AI processing job {job.id}")
         return new_transcript
         
     except Exception as e:
@@ -109,14 +140,14 @@ Team: {current_user.team.value}
             detail=f"Failed to create transcript: {str(e)}"
         )
 
-@router.post("/upload", response_model=TranscriptResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=TranscriptResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_transcript_file(
     file: UploadFile = File(...),
     title: str = Form(...),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Upload a transcript file (.txt) and automatically process with AI"""
+    """Upload a transcript file (.txt) and queue it for AI processing"""
 
     if not file.filename.endswith('.txt'):
         raise HTTPException(
@@ -124,72 +155,77 @@ async def upload_transcript_file(
             detail="Only .txt files are allowed"
         )
 
-    MAX_FILE_SIZE = 10 * 1024 * 1024 
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
+    # the hash isn't known until the whole body is read, so the file is streamed to a staging path first
+    file_path = FileStorageHelper.generate_file_path(
+        user_id=current_user.id,
+        original_filename=file.filename
+    )
+
+    # read, size-check, decode and hash the body chunk by chunk while the same chunks are streamed to storage
+    ingest = StreamingIngest()
+    pipe = ChunkPipe()
+    upload = asyncio.create_task(FileStorageHelper.upload_stream(pipe, file_path))
+    # an upload that fails before reading the pipe must not leave the reader blocked on it
+    upload.add_done_callback(lambda _: pipe.abandon())
+    try:
+        async for chunk in ingest.read(file):
+            await pipe.put(chunk)
+        await pipe.close()
+    except UploadTooLarge:
+        upload.cancel()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size too large. Maximum 10MB allowed."
+            detail=f"File size too large. Maximum {MAX_UPLOAD_BYTES // (1024 * 1024)}MB allowed."
         )
-    
+    except UnicodeDecodeError:
+        upload.cancel()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be a valid UTF-8 encoded text file"
+        )
+
+    content = ingest.text
+    prefetch_extraction(content, title)
+
+    try:
+        staging_path = await upload
+    except Exception as e:
+        logger.warning(f"Failed to store uploaded file {file.filename}: {e}")
+        staging_path = None
+
+    stored: Optional[ObjectRef] = None
+    committed = False
     try:
-        content = file_content.decode('utf-8')
         new_transcript = Transcript(
             title=title,
             content=content,
             original_filename=file.filename,
-            file_size=len(file_content),
+            file_size=ingest.size,
+            file_sha256=ingest.sha256,
             created_by_id=current_user.id
         )
-        
-        db.add(new_transcript)
+
+        job = await _insert_and_queue(db, new_transcript)
+        if staging_path:
+            stored = await adopt_staged_object(db, staging_path, ingest.sha256, ingest.size)
+            new_transcript.storage_file_path = stored.path
+            new_transcript.storage_encoding = stored.encoding
         await db.commit()
+        committed = True
         await db.refresh(new_transcript)
+        job_worker.wake()
 
-        try:
-            file_path = FileStorageHelper.generate_file_path(
-                user_id=current_user.id,
-                original_filename=file.filename,
-                transcript_id=new_transcript.id
-            )
-            
-            storage_path = await FileStorageHelper.upload_file(file_content, file_path)
-            new_transcript.storage_file_path = storage_path
-            
-        except Exception as e:
-            logger.warning(f"Failed to store uploaded file for transcript {new_transcript.id}: {e}")
-
-        try:
-            ai_tasks, summary, sentiment = await extract_tasks_and_summary_from_transcript(content, title)
-            new_transcript.summary = summary
-            new_transcript.sentiment = sentiment
-            for ai_task in ai_tasks:
-                task = Task(
-                    title=ai_task.title,
-                    description=ai_task.description,
-                    priority=ai_task.priority,
-                    assigned_team=ai_task.assigned_team,
-                    tags=ai_task.tags,
-                    transcript_id=new_transcript.id
-                )
-                db.add(task)
-            
-            await db.commit()
-            await db.refresh(new_transcript)
-            
-            logger.info(f"Uploaded and processed transcript {new_transcript.id} with {len(ai_tasks)} AI-generated tasks")
-            
-        except Exception as e:
-            logger.error(f"AI processing failed for uploaded transcript {new_transcript.id}: {e}")
-        
+        logger.info(f"Uploaded transcript {new_transcript.id}, queued AI processing job {job.id}")
         return new_transcript
         
-    except UnicodeDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be a valid UTF-8 encoded text file"
-        )
     except Exception as e:
+        if stored is None:
+            if staging_path:
+                await FileStorageHelper.delete_file(staging_path)
+        elif stored.created and not committed:
+            # the staged file was moved into place but the row referencing it is rolled back, nothing would
+            # ever collect it; removed while the row is still locked so a concurrent upload waits for this
+            await FileStorageHelper.delete_file(stored.path)
         await db.rollback()
         logger.error(f"Error uploading transcript: {e}")
         raise HTTPException(
@@ -197,13 +233,67 @@ async def upload_transcript_file(
             detail=f"Failed to upload transcript: {str(e)}"
         )
 
+@router.post("/batch/generate-tasks")
+async def batch_generate_tasks(
+    batch_request: BatchGenerateTasksRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Regenerate tasks for many transcripts, selected by ids and/or a filter. Streams per-transcript
+    progress as Server-Sent Events (start, progress, done); failed transcripts are reported and skipped.
+    """
+
+    if not batch_request.transcript_ids and batch_request.filter is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide transcript_ids or a filter"
+        )
+    if batch_request.transcript_ids and len(set(batch_request.transcript_ids)) > BATCH_MAX_TRANSCRIPTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_TRANSCRIPTS} transcripts per batch"
+        )
+    if batch_request.transcript_ids and len(set(batch_request.transcript_ids)) > batch_request.limit:
+        # the limit would silently drop some of the explicitly requested transcripts
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{len(set(batch_request.transcript_ids))} transcript_ids exceed limit {batch_request.limit}"
+        )
+    if not llm_client.configured:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=llm_client.provider.not_configured_message
+        )
+
+    transcript_ids = await resolve_batch_ids(db, batch_request)
+    missing_ids = []
+    if batch_request.transcript_ids and batch_request.filter is None:
+        # the ids fit within the limit, so every requested id that didn't come back doesn't exist
+        missing_ids = sorted(set(batch_request.transcript_ids) - set(transcript_ids))
+
+    batch = start_batch(transcript_ids, batch_request.scope, not batch_request.refresh, missing_ids)
+    logger.info(f"User {current_user.id} started batch generation for {len(transcript_ids)} transcripts")
+
+    async def event_source():
+        async for event, data in batch.events():
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/{transcript_id}/generate-tasks", response_model=AITasksResponse)
 async def generate_tasks_from_transcript(
     transcript_id: int,
+    refresh: bool = Query(False, description="Bypass the extraction cache and call the LLM again"),
+    scope: str = Query(SCOPE_TRANSCRIPT, pattern="^(transcript|global)$", description="Match new tasks against this transcript's tasks or all tasks"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate AI tasks from transcript content"""
+    """Generate AI tasks from transcript content, merging them into existing similar tasks instead of duplicating"""
 
     result = await db.execute(select(Transcript).where(Transcript.id == transcript_id))
     transcript = result.scalar_one_or_none()
@@ -214,27 +304,35 @@ async def generate_tasks_from_transcript(
             detail="Transcript not found"
         )
     
+    content_hash = make_cache_key(transcript.content, transcript.title, PROMPT_VERSION, llm_client.model_name)
     try:
-        ai_tasks, summary, sentiment = await extract_tasks_and_summary_from_transcript(transcript.content, transcript.title)
-        transcript.summary = summary
-        transcript.sentiment = sentiment
-        created_tasks = []
-        for ai_task in ai_tasks:
-            task = Task(
-                title=ai_task.title,
-                description=ai_task.description,
-                priority=ai_task.priority,
-                assigned_team=ai_task.assigned_team,
-                tags=ai_task.tags,
-                transcript_id=transcript_id
+        ai_tasks, persisted = await regenerate_transcript_tasks(
+            transcript_id,
+            content_hash,
+            scope=scope,
+            use_cache=not refresh
+        )
+
+        results = [
+            TaskMergeResult(
+                title=match.ai_task.title,
+                action=match.action,
+                task_id=match.task_id,
+                matched_transcript_id=match.transcript_id if match.action != ACTION_CREATED else None
             )
-            db.add(task)
-            created_tasks.append(ai_task)
+            for match in persisted.matches
+        ]
         
-        await db.commit()
-        
-        logger.info(f"Generated {len(created_tasks)} tasks for transcript {transcript_id}")
-        return AITasksResponse(tasks=created_tasks, transcript_id=transcript_id)
+        logger.info(f"Generated tasks for transcript {transcript_id}: {persisted.created} created, {persisted.merged} merged, {persisted.skipped} skipped")
+        return AITasksResponse(
+            tasks=ai_tasks,
+            transcript_id=transcript_id,
+            created=persisted.created,
+            merged=persisted.merged,
+            skipped=persisted.skipped,
+            results=results,
+            persist_ms=persisted.elapsed_ms
+        )
         
     except Exception as e:
         logger.error(f"Error generating tasks: {e}")
@@ -243,24 +341,106 @@ async def generate_tasks_from_transcript(
             detail=f"Failed to generate tasks: {str(e)}"
         )
 
-@router.get("/", response_model=List[TranscriptResponse])
+@router.get("/{transcript_id}/extract/stream")
+async def stream_transcript_extraction(
+    transcript_id: int,
+    refresh: bool = Query(False, description="Bypass the extraction cache and call the LLM again"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream AI extraction as Server-Sent Events: task events as they are produced, then summary, sentiment and done"""
+
+    result = await db.execute(select(Transcript).where(Transcript.id == transcript_id))
+    transcript = result.scalar_one_or_none()
+    
+    if not transcript:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcript not found"
+        )
+
+    content, title = transcript.content, transcript.title
+
+    async def event_source():
+        try:
+            async for event, data in stream_extraction_events(content, title, use_cache=not refresh):
+                yield format_sse(event, data)
+        except Exception as e:
+            logger.error(f"Streamed extraction failed for transcript {transcript_id}: {e}")
+            yield format_sse("error", {"detail": f"Failed to extract tasks: {str(e)}"})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/ai/stats", response_model=AIStatsResponse)
+async def get_ai_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get LLM client concurrency, queue depth, extraction cache and request coalescing counters for this process"""
+    return AIStatsResponse(
+        llm=llm_client.stats(),
+        extraction_cache=extraction_cache.stats(),
+        single_flight={
+            "extraction": extraction_flight.stats(),
+            "generate_tasks": generation_flight.stats(),
+        }
+    )
+
+@router.get("/storage/stats", response_model=StorageStatsResponse)
+async def get_storage_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the storage backend, codec, and the hit ratio, size and eviction counters of the local object cache for this process"""
+    return StorageStatsResponse(
+        backend=storage_backend.name,
+        compression=storage_codec.name,
+        object_cache=object_cache.stats()
+    )
+
+@router.get("/", response_model=Union[TranscriptPage, List[TranscriptListItem]], response_model_exclude_unset=True)
 async def get_transcripts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: next_cursor of the previous page, empty for the first page"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated extra fields: {', '.join(EXTRA_FIELDS)}"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all transcripts (shared workspace)"""
-    
-    result = await db.execute(
-        select(Transcript)
-        .order_by(Transcript.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    transcripts = result.scalars().all()
-    
-    return transcripts
+    """
+    Get all transcripts (shared workspace) as lightweight rows without content, newest first; GET /{id} returns
+    the full transcript. With `cursor` the response is a page with next_cursor (keyset pagination); without it
+    the legacy skip/limit list is returned, with X-Next-Cursor set.
+    """
+
+    try:
+        requested = parse_fields(fields)
+        items, next_cursor = await list_transcripts(db, limit, requested, skip=skip, cursor=cursor)
+    except (ValueError, InvalidCursor) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if cursor is not None:
+        return TranscriptPage(items=items, next_cursor=next_cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+@router.get("/search", response_model=List[TranscriptSearchHit])
+async def search_transcripts_endpoint(
+    q: str = Query(..., min_length=1, max_length=500, description='Words to find; supports "quoted phrases", OR and -word'),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over transcript titles, summaries and content, ranked, with highlighted snippets instead of content"""
+    return await search_transcripts(db, q, skip, limit)
 
 @router.get("/{transcript_id}", response_model=TranscriptResponse)
 async def get_transcript(
@@ -327,13 +507,59 @@ async def delete_transcript(
             detail="Transcript not found"
         )
     
+    await db.execute(delete(TaskSignatureBand).where(TaskSignatureBand.transcript_id == transcript_id))
     await db.execute(delete(Task).where(Task.transcript_id == transcript_id))
+    await db.execute(delete(ProcessingJob).where(ProcessingJob.transcript_id == transcript_id))
+    file_sha256 = transcript.file_sha256
+    shared = is_content_addressed(transcript.storage_file_path, file_sha256)
+    # the stored file goes when its last transcript does, once that is committed
+    unreferenced = shared and await release_object(db, file_sha256)
     await db.delete(transcript)
     await db.commit()
+
+    if unreferenced:
+        try:
+            await collect_object(db, file_sha256)
+        except Exception as e:
+            logger.warning(f"Failed to remove unreferenced stored object {file_sha256}: {e}")
+
+    if transcript.storage_file_path and not shared:
+        object_cache.invalidate(transcript.storage_file_path)
     
     logger.info(f"Transcript {transcript_id} deleted by user {current_user.email}")
     return {"message": "Transcript deleted successfully"}
 
+@router.get("/{transcript_id}/processing", response_model=TranscriptProcessingResponse)
+async def get_transcript_processing_status(
+    transcript_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the AI processing status and progress of a transcript"""
+
+    result = await db.execute(select(Transcript).where(Transcript.id == transcript_id))
+    transcript = result.scalar_one_or_none()
+    
+    if not transcript:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcript not found"
+        )
+
+    job = await get_latest_job(db, transcript_id)
+
+    return TranscriptProcessingResponse(
+        transcript_id=transcript.id,
+        status=transcript.processing_status,
+        progress=transcript.processing_progress,
+        error=transcript.processing_error,
+        job_id=job.id if job else None,
+        job_status=job.status if job else None,
+        attempts=job.attempts if job else 0,
+        max_attempts=job.max_attempts if job else 0,
+        updated_at=job.updated_at if job else transcript.updated_at
+    )
+
 @router.get("/{transcript_id}/tasks", response_model=List[TaskResponse])
 async def get_transcript_tasks(
     transcript_id: int,
@@ -371,13 +597,27 @@ async def get_transcript_tasks(
 @router.get("/{transcript_id}/download")
 async def download_transcript_file(
     transcript_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    if_modified_since: Optional[str] = Header(None, alias="If-Modified-Since"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Download the original transcript file"""
+    """Download the original transcript file, streamed from storage, with Range and conditional GET support"""
 
-    result = await db.execute(select(Transcript).where(Transcript.id == transcript_id))
-    transcript = result.scalar_one_or_none()
+    # file metadata only, the content column isn't needed to serve the stored file
+    result = await db.execute(
+        select(
+            Transcript.storage_file_path,
+            Transcript.original_filename,
+            Transcript.file_size,
+            Transcript.file_sha256,
+            Transcript.storage_encoding,
+            Transcript.created_at,
+        ).where(Transcript.id == transcript_id)
+    )
+    transcript = result.first()
     
     if not transcript:
         raise HTTPException(
@@ -390,21 +630,61 @@ async def download_transcript_file(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No file associated with this transcript"
         )
-    
+
+    # the stored file is written once when the transcript is created
+    last_modified = transcript.created_at
+    etag = make_etag(transcript_id, transcript.file_sha256, transcript.file_size, last_modified)
+    filename = transcript.original_filename or f"transcript_{transcript_id}.txt"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={filename}",
+    }
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if not_modified(if_none_match, if_modified_since, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={k: v for k, v in headers.items() if k != "Content-Disposition"})
+
+    # a Range with a stale If-Range validator gets the full, current file
+    if if_range and not etag_matches_strong(if_range, etag):
+        range_header = None
     try:
-        file_content = await FileStorageHelper.download_file(transcript.storage_file_path)
-        file_stream = io.BytesIO(file_content)
-        filename = transcript.original_filename or f"transcript_{transcript_id}.txt"
-        
-        return StreamingResponse(
-            io.BytesIO(file_content),
-            media_type="text/plain",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        byte_range = parse_range(range_header, transcript.file_size)
+    except RangeNotSatisfiable:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{transcript.file_size}"}
+        )
+
+    try:
+        body = await FileStorageHelper.open_file_stream(
+            transcript.storage_file_path,
+            byte_range,
+            transcript.file_size,
+            encoding=transcript.storage_encoding
         )
-        
     except Exception as e:
         logger.error(f"Error downloading file for transcript {transcript_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to download file"
         )
+
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{transcript.file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+    elif transcript.file_size is not None:
+        headers["Content-Length"] = str(transcript.file_size)
+
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type="text/plain",
+        headers=headers
+    )
@@ -0,0 +1,80 @@
+"""
+Size / CPU trade-off of the storage codecs on transcript text.
+
+    python -m scripts.bench_compression                 # synthetic meeting transcripts
+    python -m scripts.bench_compression a.txt b.txt     # your own transcripts
+
+Prints the compression ratio and compress / decompress throughput of each codec and level.
+"""
+import random
+import sys
+import time
+from typing import List, Tuple
+from routers.transcripts.codec import GZIP, ZSTD, get_codec, zstandard
+
+SPEAKERS = ["Alice", "Bob", "Priya", "Marco", "Chen", "Fatima"]
+PHRASES = [
+    "let's circle back on the launch timeline",
+    "I can take the action item for the pricing page",
+    "the API latency numbers from last week look better",
+    "we still need sign-off from finance on the budget",
+    "can someone from design review the onboarding flow",
+    "the sales team is asking for a demo environment",
+    "I'll follow up with the customer about the renewal",
+    "we should move the retro to Thursday",
+    "QA found two regressions in the release candidate",
+    "marketing wants the blog post out before the webinar",
+]
+
+
+def synthetic_transcripts(count: int = 20, lines: int = 400, seed: int = 7) -> List[bytes]:
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        body = []
+        for minute in range(lines):
+            phrase = rng.choice(PHRASES)
+            body.append(f"[{minute // 60:02d}:{minute % 60:02d}] {rng.choice(SPEAKERS)}: {phrase}, {rng.randint(1, 99)} items.")
+        samples.append("\n".join(body).encode("utf-8"))
+    return samples
+
+
+def _timed(fn, samples: List[bytes], repeat: int) -> Tuple[List[bytes], float]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = [fn(sample) for sample in samples]
+    return out, (time.perf_counter() - start) / repeat
+
+
+def run(samples: List[bytes], repeat: int = 5) -> None:
+    raw = sum(len(sample) for sample in samples)
+    configs = [(GZIP, level) for level in (1, 6, 9)]
+    if zstandard is not None:
+        configs += [(ZSTD, level) for level in (1, 3, 9, 19)]
+    else:
+        print("zstandard not installed, skipping zstd")
+
+    print(f"{len(samples)} transcripts, {raw / 1024:.0f} KiB uncompressed\n")
+    print(f"{'codec':<8}{'level':>6}{'ratio':>8}{'KiB':>10}{'comp MB/s':>12}{'decomp MB/s':>13}")
+    for name, level in configs:
+        codec = get_codec(name, level)
+        compressed, compress_seconds = _timed(codec.compress, samples, repeat)
+        restored, decompress_seconds = _timed(codec.decompress, compressed, repeat)
+        assert restored == samples
+        size = sum(len(blob) for blob in compressed)
+        print(
+            f"{name:<8}{level:>6}{raw / size:>8.2f}{size / 1024:>10.0f}"
+            f"{raw / compress_seconds / 1e6:>12.1f}{raw / decompress_seconds / 1e6:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:]
+    if paths:
+        samples = []
+        for path in paths:
+            with open(path, "rb") as f:
+                samples.append(f.read())
+    else:
+        samples = synthetic_transcripts()
+    run(samples)
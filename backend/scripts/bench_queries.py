@@ -0,0 +1,293 @@
+"""
+EXPLAIN ANALYZE timings of the task and transcript query shapes, without and with the query shape indexes.
+
+    BENCH_DATABASE_URL=postgresql://localhost/insight_bench python -m scripts.bench_queries
+    python -m scripts.bench_queries --tasks 1000000 --json after.json
+    python -m scripts.bench_queries --compare after.json   # exit code 1 when a query got slower
+
+Needs an empty scratch database: the schema is created from the models, seeded with synthetic users,
+transcripts and tasks, and dropped again at the end (unless --keep). Every query runs with the indexes of
+migration f8c2d4a6b913 dropped ("before") and created ("after"); the median execution time and the scans
+the plan used are printed per query.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+from typing import Any, Dict, List, Optional
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from models import Base, ProcessingStatus, TaskPriority, TaskStatus, Team
+
+QUERY_SHAPE_INDEXES = [
+    "ix_tasks_transcript_id_created_at",
+    "ix_tasks_status_created_at_id",
+    "ix_tasks_priority_created_at_id",
+    "ix_tasks_team_created_at_id",
+    "ix_tasks_team_status",
+    "ix_tasks_updated_at",
+    "ix_tasks_team_updated_at",
+    "ix_transcripts_created_by_id",
+]
+
+# what the ORM loads for a Task: search_vector is deferred
+TASK_COLUMNS = (
+    "id, title, description, status, priority, assigned_team, tags, transcript_id, created_at, updated_at, completed_at"
+)
+NEWEST_FIRST = "ORDER BY created_at DESC, id DESC LIMIT 101"
+
+# (name, SQL) mirroring the statements tasks.py, transcripts.py, listing.py and batch.py send
+QUERIES = [
+    ("tasks first page", f"SELECT {TASK_COLUMNS} FROM tasks {NEWEST_FIRST}"),
+    ("tasks by status", f"SELECT {TASK_COLUMNS} FROM tasks WHERE status = 'PENDING' {NEWEST_FIRST}"),
+    (
+        "tasks by status, deep page",
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE status = 'PENDING' "
+        f"AND (created_at, id) < (:cursor_created_at, :cursor_id) {NEWEST_FIRST}"
+    ),
+    ("tasks by priority", f"SELECT {TASK_COLUMNS} FROM tasks WHERE priority = 'HIGH' {NEWEST_FIRST}"),
+    ("tasks of my team", f"SELECT {TASK_COLUMNS} FROM tasks WHERE assigned_team = 'DEVS' {NEWEST_FIRST}"),
+    (
+        "transcript tasks",
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE transcript_id = :transcript_id ORDER BY created_at DESC"
+    ),
+    (
+        "transcript tasks, team + status",
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE transcript_id = :transcript_id "
+        "AND assigned_team = 'DEVS' AND status = 'COMPLETED' ORDER BY created_at DESC"
+    ),
+    # the lookup of DELETE FROM tasks WHERE transcript_id = ..., which EXPLAIN ANALYZE would really run
+    ("transcript delete lookup", "SELECT id FROM tasks WHERE transcript_id = :transcript_id"),
+    (
+        "list page task counts",
+        "SELECT transcript_id, count(id), count(id) FILTER (WHERE status = 'COMPLETED') FROM tasks "
+        "WHERE transcript_id = ANY(:page_ids) GROUP BY transcript_id"
+    ),
+    ("dashboard count by status", "SELECT count(id) FROM tasks WHERE status = 'COMPLETED'"),
+    ("dashboard count by priority", "SELECT count(id) FROM tasks WHERE priority = 'HIGH'"),
+    (
+        "dashboard team completed",
+        "SELECT count(id) FROM tasks WHERE assigned_team = 'DEVS' AND status = 'COMPLETED'"
+    ),
+    ("dashboard recent activity", f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY updated_at DESC LIMIT 10"),
+    (
+        "dashboard recent, my team",
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE assigned_team = 'DEVS' ORDER BY updated_at DESC LIMIT 10"
+    ),
+    (
+        "batch by creator",
+        "SELECT id FROM transcripts WHERE created_by_id = :created_by_id ORDER BY id LIMIT 5000"
+    ),
+]
+
+# a query counts as regressed when it is this much slower than in the --compare baseline
+REGRESSION_FACTOR = 1.5
+
+
+def seed(conn: Connection, users: int, transcripts: int, tasks: int) -> None:
+    """Synthetic rows with the value spread of a real workspace, reproducible through setseed()"""
+    conn.execute(text("SELECT setseed(0.42)"))
+    conn.execute(text("""
+        INSERT INTO users (email, hashed_password, first_name, last_name, team, role, is_active)
+        SELECT 'bench' || g || '@example.com', 'x', 'Bench', 'User ' || g,
+               (CAST(:teams AS text[]))[1 + g % cardinality(CAST(:teams AS text[]))]::team, 'USER', true
+        FROM generate_series(1, :users) g
+    """), {"teams": [team.name for team in Team], "users": users})
+    conn.execute(text("""
+        INSERT INTO transcripts (title, content, processing_status, processing_progress, storage_encoding,
+                                 created_by_id, created_at, updated_at)
+        SELECT 'Weekly sync ' || g, repeat('Alice: let''s circle back on the launch timeline. ', 20),
+               (CAST(:statuses AS text[]))[1 + floor(random() * 10)::int % 5]::processingstatus, 100, 'identity',
+               (SELECT min(id) FROM users) + g % :users, ts, ts
+        FROM (SELECT g, now() - random() * interval '365 days' AS ts FROM generate_series(1, :transcripts) g) s
+    """), {
+        # mostly completed, as in a workspace that has been running for a while
+        "statuses": [ProcessingStatus.COMPLETED.name] * 3 + [ProcessingStatus.FAILED.name, ProcessingStatus.QUEUED.name],
+        "users": users,
+        "transcripts": transcripts,
+    })
+    conn.execute(text("""
+        INSERT INTO tasks (title, description, status, priority, assigned_team, tags, transcript_id,
+                           created_at, updated_at)
+        SELECT 'Follow up on item ' || g, 'Action item ' || g || ' from the weekly sync',
+               (CAST(:statuses AS text[]))[1 + floor(random() * 3)::int]::taskstatus,
+               (CAST(:priorities AS text[]))[1 + floor(random() * 3)::int]::taskpriority,
+               (CAST(:teams AS text[]))[1 + floor(random() * cardinality(CAST(:teams AS text[])))::int]::team,
+               'launch,pricing', (SELECT min(id) FROM transcripts) + floor(random() * :transcripts)::int,
+               ts, ts + random() * interval '30 days'
+        FROM (SELECT g, now() - random() * interval '365 days' AS ts FROM generate_series(1, :tasks) g) s
+    """), {
+        "statuses": [status.name for status in TaskStatus],
+        "priorities": [priority.name for priority in TaskPriority],
+        "teams": [team.name for team in Team],
+        "transcripts": transcripts,
+        "tasks": tasks,
+    })
+
+
+def query_params(conn: Connection) -> Dict[str, Any]:
+    """A busy transcript, a list page of transcripts and a cursor three quarters down the PENDING tasks"""
+    transcript_id = conn.execute(text(
+        "SELECT transcript_id FROM tasks GROUP BY transcript_id ORDER BY count(*) DESC LIMIT 1"
+    )).scalar()
+    page_ids = list(conn.execute(text("SELECT id FROM transcripts ORDER BY created_at DESC, id DESC LIMIT 100")).scalars())
+    cursor = conn.execute(text(
+        "SELECT created_at, id FROM tasks WHERE status = 'PENDING' ORDER BY created_at DESC, id DESC "
+        "OFFSET (SELECT count(*) * 3 / 4 FROM tasks WHERE status = 'PENDING') LIMIT 1"
+    )).first()
+    created_by_id = conn.execute(text("SELECT min(id) FROM users")).scalar()
+    return {
+        "transcript_id": transcript_id,
+        "page_ids": page_ids,
+        "cursor_created_at": cursor.created_at,
+        "cursor_id": cursor.id,
+        "created_by_id": created_by_id,
+    }
+
+
+def _scans(plan: Dict[str, Any]) -> List[str]:
+    """Scan nodes of a JSON plan, depth first, e.g. 'Index Only Scan ix_tasks_team_status'"""
+    found = []
+    node_type = plan.get("Node Type", "")
+    if "Scan" in node_type:
+        found.append(f"{node_type} {plan.get('Index Name') or plan.get('Relation Name', '')}".strip())
+    for child in plan.get("Plans", []):
+        found.extend(_scans(child))
+    return found
+
+
+def explain(conn: Connection, sql: str, params: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Median planning and execution time over `repeat` runs, after one run to warm the cache"""
+    planning, execution = [], []
+    scans: List[str] = []
+    for run in range(repeat + 1):
+        output = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+        result = (json.loads(output) if isinstance(output, str) else output)[0]
+        if run == 0:
+            continue
+        planning.append(result["Planning Time"])
+        execution.append(result["Execution Time"])
+        scans = _scans(result["Plan"])
+    return {
+        "planning_ms": round(statistics.median(planning), 3),
+        "execution_ms": round(statistics.median(execution), 3),
+        "scans": scans,
+    }
+
+
+def run_queries(engine: Engine, params: Dict[str, Any], repeat: int) -> Dict[str, Dict[str, Any]]:
+    with engine.connect() as conn:
+        return {name: explain(conn, sql, params, repeat) for name, sql in QUERIES}
+
+
+def _vacuum_analyze(engine: Engine) -> None:
+    # fresh statistics, and a visibility map so counts can be answered by index-only scans
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE users, transcripts, tasks"))
+
+
+def set_query_shape_indexes(engine: Engine, present: bool) -> None:
+    indexes = [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.name in QUERY_SHAPE_INDEXES
+    ]
+    with engine.begin() as conn:
+        for index in indexes:
+            if present:
+                index.create(conn, checkfirst=True)
+            else:
+                index.drop(conn, checkfirst=True)
+    _vacuum_analyze(engine)
+
+
+def report(before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'query':<34}{'before ms':>11}{'after ms':>11}{'speedup':>9}  after plan")
+    for name, _ in QUERIES:
+        old, new = before[name], after[name]
+        speedup = old["execution_ms"] / new["execution_ms"] if new["execution_ms"] else float("inf")
+        print(
+            f"{name:<34}{old['execution_ms']:>11.2f}{new['execution_ms']:>11.2f}{speedup:>8.1f}x"
+            f"  {', '.join(new['scans'])}"
+        )
+
+
+def regressions(after: Dict[str, Dict[str, Any]], baseline_path: str) -> List[str]:
+    """Queries whose indexed execution time grew past REGRESSION_FACTOR times the baseline's"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["after"]
+    slower = []
+    for name, result in after.items():
+        previous = baseline.get(name)
+        if previous and result["execution_ms"] > previous["execution_ms"] * REGRESSION_FACTOR:
+            slower.append(
+                f"{name}: {previous['execution_ms']:.2f} ms -> {result['execution_ms']:.2f} ms "
+                f"({', '.join(previous['scans'])} -> {', '.join(result['scans'])})"
+            )
+    return slower
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--transcripts", type=int, default=20000)
+    parser.add_argument("--tasks", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="write the timings here, to --compare against later")
+    parser.add_argument("--compare", help="timings of an earlier run; exit code 1 when a query got slower")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded schema in place")
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        raise Exception("Set BENCH_DATABASE_URL or --database-url to an empty scratch database")
+    engine = create_engine(args.database_url.replace("postgresql+asyncpg://", "postgresql://"))
+    if inspect(engine).has_table("tasks"):
+        raise Exception("The benchmark database already has a tasks table, it needs an empty database")
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(engine)
+    try:
+        print(f"Seeding {args.users} users, {args.transcripts} transcripts, {args.tasks} tasks")
+        with engine.begin() as conn:
+            seed(conn, args.users, args.transcripts, args.tasks)
+        with engine.connect() as conn:
+            params = query_params(conn)
+
+        set_query_shape_indexes(engine, present=False)
+        before = run_queries(engine, params, args.repeat)
+        set_query_shape_indexes(engine, present=True)
+        after = run_queries(engine, params, args.repeat)
+    finally:
+        if not args.keep:
+            Base.metadata.drop_all(engine)
+        engine.dispose()
+
+    print()
+    report(before, after)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "rows": {"users": args.users, "transcripts": args.transcripts, "tasks": args.tasks},
+                "before": before,
+                "after": after,
+            }, f, indent=2)
+        print(f"\nTimings written to {args.json_path}")
+
+    if args.compare:
+        slower = regressions(after, args.compare)
+        if slower:
+            print(f"\n{len(slower)} queries slower than in {args.compare}:")
+            for line in slower:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo query slower than in {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Set the Postgres TOAST compression of the transcript text columns and recompress existing rows.
+
+    python -m scripts.compress_content_column          # DB_CONTENT_COMPRESSION
+    python -m scripts.compress_content_column lz4      # or pglz, or default to go back to the server default
+
+Needs Postgres 14+. A value keeps the method it was compressed with until it is rewritten, so every row is
+rewritten, one batch per transaction: each batch only locks its own rows for as long as it runs, and an
+interrupted run can simply be started again.
+"""
+import logging
+import sys
+from sqlalchemy import text
+from config import DB_CONTENT_COMPRESSION, get_sync_engine
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("lz4", "pglz", "default")
+COLUMNS = ("content", "summary")
+
+
+def compress_content_column(method: str, batch_size: int = 500) -> int:
+    """Returns the number of rewritten rows"""
+    method = method.lower()
+    if method not in METHODS:
+        raise Exception(f"Unsupported content compression: {method}, expected one of {', '.join(METHODS)}")
+
+    engine = get_sync_engine()
+    with engine.begin() as conn:
+        if int(conn.execute(text("SHOW server_version_num")).scalar()) < 140000:
+            raise Exception("Column compression needs Postgres 14+")
+        for column in COLUMNS:
+            conn.execute(text(f"ALTER TABLE transcripts ALTER COLUMN {column} SET COMPRESSION {method}"))
+
+    rewritten = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            ids = list(conn.execute(
+                text("SELECT id FROM transcripts WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size}
+            ).scalars())
+            if not ids:
+                break
+            # concatenating produces a new value, which is compressed with the column's current method
+            conn.execute(
+                text("UPDATE transcripts SET content = content || '', summary = summary || '' WHERE id = ANY(:ids)"),
+                {"ids": ids}
+            )
+        last_id = ids[-1]
+        rewritten += len(ids)
+        logger.info(f"Recompressed {rewritten} transcripts")
+    return rewritten
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    chosen = sys.argv[1] if len(sys.argv) > 1 else DB_CONTENT_COMPRESSION
+    if not chosen:
+        raise Exception("Pass lz4, pglz or default, or set DB_CONTENT_COMPRESSION")
+    compress_content_column(chosen)
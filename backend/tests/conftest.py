@@ -0,0 +1,39 @@
+import os
+
+# before config is imported: no Supabase, and nothing is read from a real database by accident
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("STORAGE_COMPRESSION", "gzip")
+os.environ.pop("DATABASE_URL", None)
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from models import Base, Task
+
+# an empty database the tests may create tables in, e.g. postgresql+asyncpg://localhost/insight_test
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+async def db(request):
+    """
+    Session on freshly created tables: the test module's TABLES, or all of them.
+    Skipped without TEST_DATABASE_URL, or without pg_trgm when the tasks table is needed.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    tables = getattr(request.module, "TABLES", None)
+    engine = create_async_engine(TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"))
+    async with engine.begin() as conn:
+        if await conn.scalar(text("SELECT count(*) FROM pg_available_extensions WHERE name = 'pg_trgm'")):
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        elif tables is None or Task.__table__ in tables:
+            await engine.dispose()
+            pytest.skip("pg_trgm not available")
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
@@ -0,0 +1,77 @@
+import hashlib
+from sqlalchemy import select
+from models import StoredObject
+from routers.transcripts.content_store import (
+    acquire_object,
+    collect_object,
+    content_path,
+    release_object,
+    store_content,
+)
+from routers.transcripts.storage_backends import storage_backend
+
+CONTENT = b"Alice: let's circle back on the launch timeline."
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+TABLES = [StoredObject.__table__]
+
+
+async def ref_count(db) -> int:
+    result = await db.execute(select(StoredObject.ref_count).where(StoredObject.sha256 == SHA256))
+    return result.scalar_one_or_none()
+
+
+async def test_references_are_counted(db):
+    first = await acquire_object(db, SHA256, len(CONTENT))
+    second = await acquire_object(db, SHA256, len(CONTENT))
+    await db.commit()
+
+    assert first.created and not second.created
+    assert first.path == second.path == content_path(SHA256)
+    assert await ref_count(db) == 2
+
+
+async def test_file_is_removed_after_the_last_release_is_committed(db):
+    await store_content(db, CONTENT, SHA256, uploaded=False)
+    await store_content(db, CONTENT, SHA256, uploaded=False)
+    await db.commit()
+    assert await storage_backend.exists(content_path(SHA256))
+
+    assert not await release_object(db, SHA256)
+    assert await release_object(db, SHA256)
+    # the release isn't committed yet, so the file has to stay
+    assert await storage_backend.exists(content_path(SHA256))
+    await db.commit()
+
+    assert await collect_object(db, SHA256)
+    assert await ref_count(db) is None
+    assert not await storage_backend.exists(content_path(SHA256))
+
+
+async def test_rolled_back_release_keeps_the_file(db):
+    await store_content(db, CONTENT, SHA256, uploaded=False)
+    await db.commit()
+
+    assert await release_object(db, SHA256)
+    await db.rollback()
+
+    assert not await collect_object(db, SHA256)
+    assert await ref_count(db) == 1
+    assert await storage_backend.exists(content_path(SHA256))
+
+
+async def test_unreferenced_object_is_written_again_when_reused(db):
+    await store_content(db, CONTENT, SHA256, uploaded=False)
+    await db.commit()
+    assert await release_object(db, SHA256)
+    await db.commit()
+    # collection failed or hasn't run yet, and the file is gone anyway
+    await storage_backend.delete(content_path(SHA256))
+
+    ref = await store_content(db, CONTENT, SHA256, uploaded=False)
+    await db.commit()
+
+    assert ref.created
+    assert await ref_count(db) == 1
+    assert await storage_backend.exists(content_path(SHA256))
+    assert not await collect_object(db, SHA256)
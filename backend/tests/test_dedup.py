@@ -0,0 +1,125 @@
+import random
+import pytest
+from models import Team
+from routers.transcripts.dedup import DedupIndex, compute_signature, deduplicate_tasks, signatures_similar
+from routers.transcripts.helpers import are_tasks_similar
+from routers.transcripts.schemas import AIGeneratedTask
+
+WORDS = [f"word{i}" for i in range(400)]
+COMMON = "the a for and of to with on in by from our team new".split()
+VERBS = "review update prepare send schedule draft fix migrate book order share follow".split()
+
+
+def task(title: str, description: str = "") -> AIGeneratedTask:
+    return AIGeneratedTask(title=title, description=description, assigned_team=Team.GENERAL)
+
+def sentence(rng: random.Random, count: int) -> str:
+    return " ".join(rng.sample(WORDS, count))
+
+def titles(tasks):
+    return [t.title for t in tasks]
+
+def realistic_tasks(count: int):
+    """Mostly distinct tasks that all share a few common words, topics from a vocabulary growing with the count"""
+    rng = random.Random(5)
+    topics = [f"topic{i}" for i in range(8 * count)]
+    tasks = []
+    for _ in range(count):
+        title = f"{rng.choice(VERBS)} the {' '.join(rng.sample(topics, 3))} for {rng.choice(COMMON)}"
+        words = rng.sample(topics, rng.randint(5, 12)) + rng.sample(COMMON, 3)
+        rng.shuffle(words)
+        tasks.append(task(title, " ".join(words)))
+    return tasks
+
+def comparisons(tasks, mode: str) -> int:
+    index = DedupIndex(mode)
+    for item in tasks:
+        signature = compute_signature(item.title, item.description)
+        if index.find_duplicate(signature) is None:
+            index.add(signature, item)
+    return index.comparisons
+
+
+@pytest.mark.parametrize("mode", ["minhash", "compat"])
+def test_contained_title_is_a_duplicate(mode):
+    tasks = [
+        task("Order new hardware", "Laptops for the new hires"),
+        task("Order new hardware for design team", "Monitors and tablets requested in the review"),
+    ]
+    assert titles(deduplicate_tasks(tasks, mode=mode)) == ["Order new hardware"]
+
+
+@pytest.mark.parametrize("mode", ["minhash", "compat"])
+def test_empty_fields_match_like_are_tasks_similar(mode):
+    tasks = [
+        task("Prepare quarterly report", "Collect numbers from every team"),
+        task("Book venue for offsite", ""),
+        task("", "Something entirely different"),
+    ]
+    # an empty description or title overlaps with anything under the legacy rules
+    assert titles(deduplicate_tasks(tasks, mode=mode)) == ["Prepare quarterly report"]
+
+
+def test_signatures_similar_matches_are_tasks_similar():
+    rng = random.Random(3)
+    for _ in range(300):
+        a_title, b_title = sentence(rng, rng.randint(0, 6)), sentence(rng, rng.randint(0, 6))
+        a_desc, b_desc = sentence(rng, rng.randint(0, 12)), sentence(rng, rng.randint(0, 12))
+        expected = are_tasks_similar(a_title, b_title, a_desc, b_desc)
+        assert signatures_similar(compute_signature(a_title, a_desc), compute_signature(b_title, b_desc)) == expected
+
+
+def test_title_only_duplicates_are_found_in_both_modes():
+    rng = random.Random(11)
+    for _ in range(500):
+        base = sentence(rng, rng.randint(3, 5))
+        longer = f"{base} {sentence(rng, rng.randint(1, 3))}"
+        # unrelated 30 word descriptions, only the titles make these duplicates
+        tasks = [task(base, sentence(rng, 30)), task(longer, sentence(rng, 30))]
+        expected = titles(deduplicate_tasks(tasks, mode="compat"))
+        assert expected == [base]
+        assert titles(deduplicate_tasks(tasks, mode="minhash")) == expected
+
+
+def test_description_only_duplicates_are_found_in_both_modes():
+    rng = random.Random(17)
+    for _ in range(500):
+        shared = rng.sample(WORDS, 15)
+        first = shared + rng.sample(WORDS, 15)
+        second = shared + rng.sample(WORDS, 15)
+        tasks = [
+            task("Alpha beta gamma", " ".join(first)),
+            task("Delta epsilon zeta", " ".join(second)),
+        ]
+        assert titles(deduplicate_tasks(tasks, mode="minhash")) == titles(deduplicate_tasks(tasks, mode="compat"))
+
+
+def test_modes_agree_on_mixed_lists():
+    rng = random.Random(23)
+    for _ in range(50):
+        tasks = []
+        for _ in range(30):
+            if tasks and rng.random() < 0.4:
+                source = rng.choice(tasks)
+                tasks.append(task(f"{source.title} {sentence(rng, 1)}", sentence(rng, rng.randint(0, 20))))
+            else:
+                tasks.append(task(sentence(rng, rng.randint(2, 6)), sentence(rng, rng.randint(0, 20))))
+        assert titles(deduplicate_tasks(tasks, mode="minhash")) == titles(deduplicate_tasks(tasks, mode="compat"))
+
+
+def test_title_and_description_bands_are_separate():
+    same_words = compute_signature("alpha beta", "alpha beta")
+    title_only = compute_signature("alpha beta", "")
+    description_only = compute_signature("", "alpha beta")
+    assert set(title_only.band_keys) | set(description_only.band_keys) == set(same_words.band_keys)
+    assert not set(title_only.band_keys) & set(description_only.band_keys)
+
+
+def test_common_words_dont_make_every_pair_a_candidate():
+    tasks = realistic_tasks(600)
+    assert titles(deduplicate_tasks(tasks, mode="minhash")) == titles(deduplicate_tasks(tasks, mode="compat"))
+
+    small, large = comparisons(realistic_tasks(300), "minhash"), comparisons(realistic_tasks(1200), "minhash")
+    # 4x the tasks, quadratic growth would be 16x
+    assert large < 6 * small
+    assert comparisons(tasks, "minhash") * 10 < comparisons(tasks, "compat")
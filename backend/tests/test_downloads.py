@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+import pytest
+from routers.transcripts.downloads import (
+    RangeNotSatisfiable,
+    etag_matches,
+    etag_matches_strong,
+    http_date,
+    iter_buffer,
+    make_etag,
+    not_modified,
+    parse_range,
+    slice_stream,
+)
+
+MODIFIED = datetime(2025, 8, 1, 12, 30, 15, tzinfo=timezone.utc)
+STRONG = make_etag(1, "ab" * 32, 10, MODIFIED)
+WEAK = make_etag(1, None, 10, MODIFIED)
+
+
+def test_etag_is_strong_only_with_a_content_hash():
+    assert STRONG == f'"{"ab" * 32}"'
+    assert WEAK.startswith('W/"')
+
+
+@pytest.mark.parametrize("header,size,expected", [
+    ("bytes=0-4", 10, (0, 4)),
+    ("bytes=5-", 10, (5, 9)),
+    ("bytes=-3", 10, (7, 9)),
+    ("bytes=-30", 10, (0, 9)),
+    ("bytes=8-100", 10, (8, 9)),
+    (None, 10, None),
+    ("bytes=0-4", None, None),
+    ("bytes=0-1,4-5", 10, None),
+    ("items=0-4", 10, None),
+    ("bytes=abc", 10, None),
+])
+def test_parse_range(header, size, expected):
+    assert parse_range(header, size) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=10-", "bytes=6-2", "bytes=-0"])
+def test_unsatisfiable_range(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 10)
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches(STRONG, STRONG)
+    assert etag_matches(f"W/{STRONG}", STRONG)
+    assert etag_matches(f'"other", {STRONG}', STRONG)
+    assert etag_matches("*", STRONG)
+    assert not etag_matches('"other"', STRONG)
+    assert not etag_matches(None, STRONG)
+
+
+def test_if_range_uses_strong_comparison():
+    assert etag_matches_strong(STRONG, STRONG)
+    assert etag_matches_strong(f" {STRONG} ", STRONG)
+    assert not etag_matches_strong(f"W/{STRONG}", STRONG)
+    assert not etag_matches_strong(WEAK, WEAK)
+    assert not etag_matches_strong('"other"', STRONG)
+    assert not etag_matches_strong(http_date(MODIFIED), STRONG)
+    assert not etag_matches_strong(None, STRONG)
+
+
+def test_not_modified():
+    assert not_modified(STRONG, None, STRONG, MODIFIED)
+    assert not not_modified('"other"', None, STRONG, MODIFIED)
+    assert not_modified(None, http_date(MODIFIED), STRONG, MODIFIED.replace(microsecond=500))
+    assert not not_modified(None, "Thu, 31 Jul 2025 00:00:00 GMT", STRONG, MODIFIED)
+    assert not not_modified(None, "not a date", STRONG, MODIFIED)
+    # If-None-Match takes precedence over If-Modified-Since
+    assert not not_modified('"other"', http_date(MODIFIED), STRONG, MODIFIED)
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def test_iter_buffer_serves_the_range_in_chunks():
+    data = b"0123456789"
+    assert await collect(iter_buffer(data, None, 3)) == data
+    assert await collect(iter_buffer(data, (2, 7), 4)) == b"234567"
+
+
+async def test_slice_stream_cuts_the_range_across_chunks():
+    async def chunks():
+        for piece in (b"0123", b"4567", b"89"):
+            yield piece
+
+    assert await collect(slice_stream(chunks(), 3, 8)) == b"345678"
+    assert await collect(slice_stream(chunks(), 0, 0)) == b"0"
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from sqlalchemy import select
+from models import JobStatus, ProcessingJob, ProcessingStatus, Transcript, User
+from routers.transcripts.jobs import _fail_job, _utcnow, claim_next_job
+
+TABLES = [User.__table__, Transcript.__table__, ProcessingJob.__table__]
+
+
+async def queue_job(db, **values) -> ProcessingJob:
+    user = User(email="owner@example.com", hashed_password="x", first_name="Ada", last_name="Lovelace")
+    db.add(user)
+    await db.flush()
+    transcript = Transcript(title="Weekly sync", content="Alice: ship it", created_by_id=user.id)
+    db.add(transcript)
+    await db.flush()
+    job = ProcessingJob(transcript_id=transcript.id, kind="extract_tasks", max_attempts=3, **{"status": JobStatus.QUEUED, **values})
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def reload(db, model, row_id):
+    db.expire_all()
+    return (await db.execute(select(model).where(model.id == row_id))).scalar_one()
+
+
+async def test_failed_attempt_is_requeued_after_rollback(db):
+    job = await queue_job(db)
+    claimed = await claim_next_job(db)
+    assert claimed.id == job.id
+
+    # whatever the job did is rolled back, which expires the loaded job
+    claimed.progress = 50
+    await _fail_job(db, claimed, Exception("LLM unavailable"))
+
+    job = await reload(db, ProcessingJob, job.id)
+    assert job.status == JobStatus.QUEUED and job.locked_at is None
+    assert job.run_after > _utcnow() and job.error == "LLM unavailable"
+    transcript = await reload(db, Transcript, job.transcript_id)
+    assert transcript.processing_status == ProcessingStatus.QUEUED
+
+
+async def test_last_failed_attempt_fails_the_job(db):
+    job = await queue_job(db, attempts=2)
+    await _fail_job(db, await claim_next_job(db), Exception("still broken"))
+
+    job = await reload(db, ProcessingJob, job.id)
+    assert job.status == JobStatus.FAILED and job.finished_at is not None
+    transcript = await reload(db, Transcript, job.transcript_id)
+    assert transcript.processing_status == ProcessingStatus.FAILED
+
+
+async def test_stale_job_with_attempts_left_is_claimed_again(db):
+    job = await queue_job(db, status=JobStatus.RUNNING, attempts=1, locked_at=_utcnow() - timedelta(days=1))
+
+    claimed = await claim_next_job(db)
+    assert claimed.id == job.id and claimed.attempts == 2
+
+
+async def test_stale_job_without_attempts_left_fails(db):
+    job = await queue_job(db, status=JobStatus.RUNNING, attempts=3, locked_at=_utcnow() - timedelta(days=1))
+
+    assert await claim_next_job(db) is None
+    job = await reload(db, ProcessingJob, job.id)
+    assert job.status == JobStatus.FAILED and job.attempts == 3 and job.locked_at is None
+    transcript = await reload(db, Transcript, job.transcript_id)
+    assert transcript.processing_status == ProcessingStatus.FAILED
+    assert await claim_next_job(db) is None
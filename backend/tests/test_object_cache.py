@@ -0,0 +1,67 @@
+import mmap
+import pytest
+from routers.transcripts import file_storage
+from routers.transcripts.object_cache import StorageObjectCache
+
+DATA = b"0123456789" * 10
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Memory for one small object only, so a second one spills to disk"""
+    cache = StorageObjectCache(memory_budget=len(DATA), disk_dir=str(tmp_path), disk_budget=10 * len(DATA), max_object_bytes=len(DATA))
+    monkeypatch.setattr(file_storage, "object_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def mappings(monkeypatch):
+    """Every mmap a disk hit opens"""
+    opened = []
+    original = StorageObjectCache._read_disk
+
+    def read_disk(self, key):
+        mapped = original(self, key)
+        if mapped is not None:
+            opened.append(mapped)
+        return mapped
+
+    monkeypatch.setattr(StorageObjectCache, "_read_disk", read_disk)
+    return opened
+
+
+async def test_spilled_objects_are_served_from_disk(cache):
+    await cache.put("a", DATA)
+    await cache.put("b", DATA[::-1])
+
+    hit = await cache.get("a")
+    assert isinstance(hit, mmap.mmap) and bytes(hit) == DATA
+    assert cache.stats()["disk_hits"] == 1
+
+
+async def test_stream_closes_the_disk_mapping(cache, mappings):
+    await cache.put("a", DATA)
+    await cache.put("b", DATA[::-1])
+
+    chunks = await file_storage.FileStorageHelper.open_file_stream("a", (10, 29), len(DATA), chunk_size=7)
+    assert b"".join([chunk async for chunk in chunks]) == DATA[10:30]
+    assert len(mappings) == 1 and mappings[0].closed
+
+
+async def test_abandoned_stream_closes_the_disk_mapping(cache, mappings):
+    await cache.put("a", DATA)
+    await cache.put("b", DATA[::-1])
+
+    chunks = await file_storage.FileStorageHelper.open_file_stream("a", None, len(DATA), chunk_size=7)
+    assert await chunks.__anext__() == DATA[:7]
+    # the client went away mid-body
+    await chunks.aclose()
+    assert mappings[0].closed
+
+
+async def test_download_closes_the_disk_mapping(cache, mappings):
+    await cache.put("a", DATA)
+    await cache.put("b", DATA[::-1])
+
+    assert await file_storage.FileStorageHelper.download_file("a") == DATA
+    assert mappings[0].closed
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from routers.pagination import InvalidCursor, decode_cursor, encode_cursor, split_page
+
+CREATED_AT = datetime(2025, 8, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def rows(count):
+    return [SimpleNamespace(created_at=CREATED_AT, id=100 - i) for i in range(count)]
+
+
+def test_cursor_round_trips():
+    cursor = encode_cursor(CREATED_AT, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (CREATED_AT, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "!!!!", encode_cursor(CREATED_AT, 1)[:-4], "MjAyNQ"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_split_page_drops_the_lookahead_row():
+    page, cursor = split_page(rows(4), 3)
+    assert [row.id for row in page] == [100, 99, 98]
+    assert decode_cursor(cursor) == (CREATED_AT, 98)
+
+
+@pytest.mark.parametrize("count", [0, 2, 3])
+def test_split_page_without_a_next_page(count):
+    page, cursor = split_page(rows(count), 3)
+    assert len(page) == count and cursor is None
+
+
+def test_split_page_takes_the_cursor_from_the_entity():
+    result = [(row, "extra column") for row in rows(3)]
+    page, cursor = split_page(result, 2, lambda row: row[0])
+    assert page == result[:2]
+    assert decode_cursor(cursor) == (CREATED_AT, 99)
@@ -0,0 +1,48 @@
+import json
+import pytest
+from routers.transcripts.streaming import IncrementalExtractionParser, format_sse
+
+TASKS = [
+    {"title": "Send the {draft} agenda", "description": "Quote: \"ship it\" [today]\\", "priority": "high"},
+    {"title": "Book the room", "description": "Needs a projector", "tags": ["ops", "}"]},
+]
+RESPONSE = "```json\n" + json.dumps({"tasks": TASKS, "summary": "Launch {sync}, \"v2\"", "sentiment": "positive"}, indent=2) + "\n```"
+EXPECTED = [("task", TASKS[0]), ("task", TASKS[1]), ("tasks_complete", None), ("summary", "Launch {sync}, \"v2\""), ("sentiment", "positive")]
+
+
+def feed_all(pieces):
+    parser = IncrementalExtractionParser()
+    return [event for piece in pieces for event in parser.feed(piece)]
+
+
+def test_whole_response():
+    assert feed_all([RESPONSE]) == EXPECTED
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_response_in_chunks(size):
+    assert feed_all([RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]) == EXPECTED
+
+
+def test_every_split_point():
+    for i in range(len(RESPONSE) + 1):
+        assert feed_all([RESPONSE[:i], RESPONSE[i:]]) == EXPECTED, i
+
+
+def test_task_is_emitted_as_soon_as_it_closes():
+    parser = IncrementalExtractionParser()
+    head = RESPONSE[:RESPONSE.index("Book the room")]
+    assert parser.feed(head) == [("task", TASKS[0])]
+
+
+def test_text_after_the_object_is_ignored():
+    assert feed_all(['{"summary": "done"} {"summary": "again"}']) == [("summary", "done")]
+
+
+def test_malformed_task_is_skipped():
+    events = feed_all(['{"tasks": [{"title": "a",, "b"}, {"title": "ok"}], "sentiment": "neutral"}'])
+    assert events == [("task", {"title": "ok"}), ("tasks_complete", None), ("sentiment", "neutral")]
+
+
+def test_format_sse():
+    assert format_sse("done", {"task_count": 2}) == 'event: done\ndata: {"task_count": 2}\n\n'
@@ -0,0 +1,23 @@
+import json
+import pytest
+from routers.transcripts.dedup import deduplicate_tasks
+from routers.transcripts.llm_providers import StubProvider
+from routers.transcripts.schemas import AIGeneratedTask
+
+EXTRACTION_PROMPT = 'Return JSON with "tasks", "summary" and "sentiment" for this meeting: Alice and Bob met.'
+
+
+@pytest.mark.parametrize("mode", ["minhash", "compat"])
+@pytest.mark.parametrize("task_count,description_chars", [(20, 200), (150, 200), (50, 10), (5, 2000)])
+def test_stub_tasks_survive_deduplication(mode, task_count, description_chars):
+    provider = StubProvider(latency_ms=0, task_count=task_count, description_chars=description_chars)
+    response = json.loads(provider.respond(EXTRACTION_PROMPT))
+    tasks = [AIGeneratedTask(**task) for task in response["tasks"]]
+
+    assert len(tasks) == task_count
+    assert len(deduplicate_tasks(tasks, mode=mode)) == task_count
+
+
+def test_stub_response_is_deterministic():
+    provider = StubProvider(latency_ms=0, task_count=5)
+    assert provider.respond(EXTRACTION_PROMPT) == provider.respond(EXTRACTION_PROMPT)
@@ -0,0 +1,89 @@
+from models import Task, TaskSignatureBand, Team, Transcript, User
+from routers.transcripts import task_index
+from routers.transcripts.dedup import compute_signature
+from routers.transcripts.task_index import SCOPE_GLOBAL, SCOPE_TRANSCRIPT, find_existing_matches, index_tasks
+
+TABLES = [User.__table__, Transcript.__table__, Task.__table__, TaskSignatureBand.__table__]
+
+
+async def add_transcript(db, user_id=None) -> int:
+    if user_id is None:
+        user = User(email="owner@example.com", hashed_password="x", first_name="Ada", last_name="Lovelace")
+        db.add(user)
+        await db.flush()
+        user_id = user.id
+    transcript = Transcript(title="Weekly sync", content="Alice: ship it", created_by_id=user_id)
+    db.add(transcript)
+    await db.flush()
+    return transcript.id
+
+
+async def add_tasks(db, transcript_id, pairs):
+    tasks = [Task(title=title, description=description, assigned_team=Team.GENERAL, transcript_id=transcript_id) for title, description in pairs]
+    db.add_all(tasks)
+    await db.flush()
+    await index_tasks(db, tasks)
+    await db.commit()
+    return tasks
+
+
+def filler(count):
+    """Distinct tasks that all share the common words of the ones below"""
+    return [(f"review the topic{i} plan{i} for team", f"notes{i} about the topic{i} and draft{i} for the team") for i in range(count)]
+
+
+async def test_finds_duplicates_in_either_direction(db):
+    transcript_id = await add_transcript(db)
+    tasks = await add_tasks(db, transcript_id, filler(40) + [
+        ("Order new hardware for design team", "Monitors and tablets requested in the review"),
+        ("Book venue", "Find a room for the offsite"),
+    ])
+
+    signatures = [
+        # contained in the stored title
+        compute_signature("Order new hardware", "Laptops for the new hires"),
+        # contains the stored title
+        compute_signature("Book venue for the quarterly offsite", "Ask finance about the budget"),
+        compute_signature("Write release notes", "Summarize every change on one page"),
+    ]
+    matches = await find_existing_matches(db, transcript_id, signatures, SCOPE_TRANSCRIPT)
+    assert [match and match.id for match in matches] == [tasks[-2].id, tasks[-1].id, None]
+
+
+async def test_common_words_are_not_looked_up(db, monkeypatch):
+    transcript_id = await add_transcript(db)
+    tasks = await add_tasks(db, transcript_id, filler(60) + [("Migrate the billing database", "Move billing to the new cluster")])
+    loaded = []
+    load_tasks = task_index._load_tasks
+
+    async def spy(db, task_ids):
+        loaded.extend(task_ids)
+        return await load_tasks(db, task_ids)
+
+    monkeypatch.setattr(task_index, "_load_tasks", spy)
+    monkeypatch.setattr(task_index, "DEDUP_MAX_KEY_TASKS", 10)
+
+    matches = await find_existing_matches(db, transcript_id, [compute_signature("Migrate billing database", "For the team")], SCOPE_GLOBAL)
+    assert matches[0].id == tasks[-1].id
+    # "the", "for" and "team" are shared by every filler task
+    assert len(loaded) < 10
+
+
+async def test_candidates_are_loaded_in_batches(db, monkeypatch):
+    transcript_id = await add_transcript(db)
+    tasks = await add_tasks(db, transcript_id, [(f"call vendor{i} today", f"ask vendor{i} about pricing") for i in range(20)])
+    monkeypatch.setattr(task_index, "_KEY_BATCH_SIZE", 3)
+
+    signatures = [compute_signature(f"call vendor{i}", f"vendor{i} pricing quote") for i in range(20)]
+    matches = await find_existing_matches(db, transcript_id, signatures, SCOPE_TRANSCRIPT)
+    assert [match.id for match in matches] == [task.id for task in tasks]
+
+
+async def test_transcript_scope_ignores_other_transcripts(db):
+    first = await add_transcript(db)
+    await add_tasks(db, first, [("Order new hardware", "Laptops for the new hires")])
+    second = await add_transcript(db, user_id=(await db.get(Transcript, first)).created_by_id)
+
+    signature = compute_signature("Order new hardware", "Laptops for the new hires")
+    assert await find_existing_matches(db, second, [signature], SCOPE_TRANSCRIPT) == [None]
+    assert (await find_existing_matches(db, second, [signature], SCOPE_GLOBAL))[0] is not None
@@ -0,0 +1,13 @@
+import asyncio
+import logging
+from routers.transcripts.jobs import job_worker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+#standalone worker for queued transcript processing jobs: python worker.py
+if __name__ == "__main__":
+    try:
+        asyncio.run(job_worker.run_forever())
+    except KeyboardInterrupt:
+        logger.info("Worker interrupted, shutting down")
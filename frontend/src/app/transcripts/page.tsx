@@ -11,11 +11,13 @@ import { Textarea } from "@/components/ui/textarea"
 import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, DialogTrigger } from "@/components/ui/dialog"
 import { toast } from "sonner"
 import { FileText, Upload, Download, Trash2, Loader2, Plus, Calendar, Brain, MessageSquare } from "lucide-react"
-import { transcriptsAPI, Transcript } from "@/lib/api"
+import { transcriptsAPI, TranscriptListItem } from "@/lib/api"
 
 export default function TranscriptsPage() {
   const [transcriptText, setTranscriptText] = useState("")
-  const [transcripts, setTranscripts] = useState<Transcript[]>([])
+  const [transcripts, setTranscripts] = useState<TranscriptListItem[]>([])
+  // full content is only fetched when a transcript is opened
+  const [contents, setContents] = useState<Record<number, string>>({})
   const [isGenerating, setIsGenerating] = useState(false)
   const [isUploading, setIsUploading] = useState(false)
   const [isLoading, setIsLoading] = useState(true)
@@ -23,7 +25,7 @@ export default function TranscriptsPage() {
   const loadTranscripts = async () => {
     try {
       setIsLoading(true)
-      const data = await transcriptsAPI.getAll()
+      const data = await transcriptsAPI.getAll(0, 100, ['summary', 'sentiment'])
       setTranscripts(data)
     } catch (error) {
       console.error('Failed to load transcripts:', error)
@@ -106,6 +108,17 @@ export default function TranscriptsPage() {
     }
   }
 
+  const loadContent = async (transcriptId: number) => {
+    if (contents[transcriptId] !== undefined) return
+    try {
+      const transcript = await transcriptsAPI.getById(transcriptId)
+      setContents(prev => ({ ...prev, [transcriptId]: transcript.content }))
+    } catch (error) {
+      console.error('Failed to load transcript content:', error)
+      toast.error("Failed to load transcript content")
+    }
+  }
+
   const handleDownload = async (transcriptId: number) => {
     try {
       await transcriptsAPI.download(transcriptId)
@@ -265,19 +278,21 @@ export default function TranscriptsPage() {
                             <h3 className="font-medium text-gray-900">{transcript.title}</h3>
                           </div>
                           <p className="text-sm text-gray-600 mb-3 line-clamp-2">
-                            {transcript.content.substring(0, 200)}
-                            {transcript.content.length > 200 && "..."}
+                            {transcript.summary_preview || "Summary not available yet."}
                           </p>
                           <div className="flex items-center gap-4 text-xs text-gray-500 mb-3">
                             <span className="flex items-center gap-1">
                               <Calendar className="h-3 w-3" />
                               {new Date(transcript.created_at).toLocaleDateString()}
                             </span>
+                            <span>
+                              {transcript.completed_task_count}/{transcript.task_count} tasks done
+                            </span>
                           </div>
                           
                           {/* Action Buttons Row */}
                           <div className="flex items-center gap-2 flex-wrap">
-                            <Dialog>
+                            <Dialog onOpenChange={(open) => open && loadContent(transcript.id)}>
                               <DialogTrigger>
                                 <Button variant="outline" size="sm">
                                   <FileText className="h-4 w-4 mr-1" />
@@ -293,7 +308,7 @@ export default function TranscriptsPage() {
                                 </DialogHeader>
                                 <div className="mt-4 max-h-[60vh] overflow-y-auto">
                                   <p className="text-sm text-gray-700 leading-relaxed whitespace-pre-wrap">
-                                    {transcript.content}
+                                    {contents[transcript.id] ?? "Loading..."}
                                   </p>
                                 </div>
                               </DialogContent>
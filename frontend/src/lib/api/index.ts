@@ -24,6 +24,7 @@ export type {
 // Transcript types from transcripts API
 export type {
   Transcript,
+  TranscriptListItem,
   CreateTranscriptRequest,
   UpdateTranscriptRequest
 } from '../../types/transcripts_types'
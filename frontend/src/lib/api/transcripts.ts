@@ -1,5 +1,5 @@
 // Transcript-related API functions
-import { Transcript, CreateTranscriptRequest, UpdateTranscriptRequest, AITasksResponse } from '../../types/transcripts_types'
+import { Transcript, TranscriptListItem, CreateTranscriptRequest, UpdateTranscriptRequest, AITasksResponse, TranscriptProcessingStatus } from '../../types/transcripts_types'
 // Base API configuration
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:8000'
 
@@ -97,8 +97,9 @@ class TranscriptApiClient {
     })
   }
 
-  async getTranscripts(skip = 0, limit = 100): Promise<Transcript[]> {
-    return this.request<Transcript[]>(`/transcripts/?skip=${skip}&limit=${limit}`)
+  async getTranscripts(skip = 0, limit = 100, fields: string[] = []): Promise<TranscriptListItem[]> {
+    const fieldsParam = fields.length ? `&fields=${fields.join(',')}` : ''
+    return this.request<TranscriptListItem[]>(`/transcripts/?skip=${skip}&limit=${limit}${fieldsParam}`)
   }
 
   async getTranscript(id: number): Promise<Transcript> {
@@ -124,6 +125,10 @@ class TranscriptApiClient {
     })
   }
 
+  async getProcessingStatus(transcriptId: number): Promise<TranscriptProcessingStatus> {
+    return this.request<TranscriptProcessingStatus>(`/transcripts/${transcriptId}/processing`)
+  }
+
   async downloadTranscript(id: number): Promise<Blob> {
     const url = `${this.baseURL}/transcripts/${id}/download`
     const token = localStorage.getItem('authToken')
@@ -174,10 +179,10 @@ export const transcriptsAPI = {
   },
 
   /**
-   * Get all transcripts with pagination
+   * Get transcripts with pagination, without their content (fields adds e.g. 'summary', 'sentiment')
    */
-  getAll: async (skip = 0, limit = 100): Promise<Transcript[]> => {
-    return await transcriptApiClient.getTranscripts(skip, limit)
+  getAll: async (skip = 0, limit = 100, fields: string[] = []): Promise<TranscriptListItem[]> => {
+    return await transcriptApiClient.getTranscripts(skip, limit, fields)
   },
 
   /**
@@ -208,6 +213,13 @@ export const transcriptsAPI = {
     return await transcriptApiClient.generateTasks(transcriptId)
   },
 
+  /**
+   * Get AI processing status of a transcript (create/upload return before processing finishes)
+   */
+  getProcessingStatus: async (transcriptId: number): Promise<TranscriptProcessingStatus> => {
+    return await transcriptApiClient.getProcessingStatus(transcriptId)
+  },
+
   /**
    * Download transcript file
    */
@@ -1,4 +1,6 @@
 
+export type ProcessingStatus = 'QUEUED' | 'PROCESSING' | 'COMPLETED' | 'FAILED'
+
 export interface Transcript {
   id: number
   title: string
@@ -8,11 +10,36 @@ export interface Transcript {
   original_filename?: string
   storage_file_path?: string
   file_size?: number
+  processing_status: ProcessingStatus
+  processing_progress: number
   created_by_id: number
   created_at: string
   updated_at: string
 }
 
+// A row of GET /transcripts/: no content, extra fields only when requested with fields=
+export interface TranscriptListItem {
+  id: number
+  title: string
+  summary_preview?: string
+  sentiment_label?: 'positive' | 'neutral' | 'negative' | 'mixed'
+  task_count: number
+  completed_task_count: number
+  file_size?: number
+  content_bytes: number
+  processing_status: ProcessingStatus
+  created_by_id: number
+  created_at: string
+  updated_at: string
+  content?: string
+  summary?: string
+  sentiment?: string
+  original_filename?: string
+  storage_file_path?: string
+  file_sha256?: string
+  processing_progress?: number
+}
+
 export interface CreateTranscriptRequest {
   title: string
   content: string
@@ -35,3 +62,15 @@ export interface AITasksResponse {
   tasks: AIGeneratedTask[]
   transcript_id: number
 }
+
+export interface TranscriptProcessingStatus {
+  transcript_id: number
+  status: ProcessingStatus
+  progress: number
+  error?: string
+  job_id?: number
+  job_status?: 'QUEUED' | 'RUNNING' | 'SUCCEEDED' | 'FAILED'
+  attempts: number
+  max_attempts: number
+  updated_at?: string
+}